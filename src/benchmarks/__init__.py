@@ -0,0 +1,12 @@
+"""
+Benchmarks Package
+
+This package provides scripts that measure the bot's performance. They are run
+from the repository root, with the src directory in the PYTHONPATH.
+
+Modules:
+- startup: Measures the import time of the bot's modules.
+- dataset: Generates synthetic data files at a chosen scale.
+- suite: Times the data loads, lookups, logs and reports on a synthetic dataset.
+
+"""
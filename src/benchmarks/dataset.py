@@ -0,0 +1,391 @@
+"""
+dataset
+=======
+
+This module generates synthetic data files, in the formats the data classes
+read, to benchmark the bot at a chosen scale.
+
+The dataset has coordinators, projects with their Discord servers, members with
+one participation each, the attendances of the members in the last months, as
+month files, and a logs file with the messages, edits, reactions and
+interactions of the members. The content is random, but the same seed and date
+always generate the same files.
+
+Each scale sets the size of the dataset. A scale can also be changed with the
+command line options:
+
+    PYTHONPATH=src python -m benchmarks.dataset --scale medium --output bench-data
+
+Classes:
+    - Scale: The size of a dataset.
+
+Functions:
+    - generate_dataset(root, scale, seed=0, today=None): Writes a dataset.
+    - load_manifest(root): Reads the description of a dataset.
+    - add_scale_arguments(parser): Adds the options that choose the scale to a parser.
+    - scale_from_arguments(args): The scale chosen by the command line options.
+    - main(): Generates a dataset from the command line.
+
+Variables:
+    - SCALES (dict[str, Scale]): The predefined scales, by name.
+    - MANIFEST_FILE_NAME (str): The name of the file that describes a dataset.
+"""
+
+import argparse
+import json
+import os
+import random
+import unicodedata
+import uuid
+from dataclasses import asdict, dataclass, fields, replace
+from datetime import date, datetime, timedelta
+from time import perf_counter
+
+MANIFEST_FILE_NAME = "manifest.json"
+
+# fmt: off
+_FIRST_NAMES = [
+    "Ana", "Beatriz", "Bruno", "Camila", "Carlos", "Daniel", "Eduarda", "Felipe",
+    "Gabriel", "Giovana", "Gustavo", "Isabela", "João", "Júlia", "Larissa", "Lucas",
+    "Mariana", "Mateus", "Pedro", "Rafaela", "Rodrigo", "Sofia", "Thiago", "Vitória",
+]
+_LAST_NAMES = [
+    "Almeida", "Barbosa", "Carvalho", "Costa", "Ferreira", "Gomes", "Lima",
+    "Martins", "Oliveira", "Pereira", "Ribeiro", "Rodrigues", "Santos", "Silva",
+    "Souza",
+]
+_TOPICS = [
+    "Visão Computacional", "Robótica Educacional", "Aprendizado de Máquina",
+    "Internet das Coisas", "Realidade Aumentada", "Processamento de Linguagem",
+    "Sistemas Embarcados", "Ciência de Dados", "Jogos Educacionais",
+]
+# fmt: on
+_CHANNELS = ["geral", "reunioes", "duvidas", "codigo", "artigos", "avisos"]
+_WORDS = (
+    "hoje terminei a revisão do código e subi as alterações no repositório "
+    "amanhã vamos testar o modelo com os novos dados da coleta da semana "
+    "alguém pode revisar o artigo antes da reunião com o coordenador"
+).split()
+_COMMANDS = ["adicionar-presenca", "relatorio-mensal", "relatorio-semestral", "log"]
+_EMOJIS = ["👍", "🎉", "✅", "👀"]
+
+
+@dataclass
+class Scale:
+    """
+    The size of a dataset
+
+    Attributes:
+        projects (int): The number of projects.
+        members_per_project (int): The number of members of each project.
+        projects_per_coordinator (int): The number of projects of each coordinator.
+        attendance_months (int): The number of months with attendances, up to the
+        current one.
+        attendance_days_per_week (int): The days a week each member attends.
+        logs (int): The number of rows of the logs file.
+    """
+
+    projects: int
+    members_per_project: int
+    projects_per_coordinator: int
+    attendance_months: int
+    attendance_days_per_week: int
+    logs: int
+
+
+SCALES = {
+    "small": Scale(10, 10, 2, 3, 3, 10**5),
+    "medium": Scale(50, 15, 2, 6, 3, 10**6),
+    "large": Scale(200, 20, 2, 12, 4, 10**7),
+}
+
+
+def _new_id(rng: random.Random) -> str:
+    """
+    A random uuid4, drawn from the seeded generator
+
+    :param rng: The random generator.
+    :type rng: random.Random
+    :return: The uuid, as a string.
+    :rtype: str
+    """
+    return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+
+def _person(rng: random.Random, registrations: set[str]) -> tuple[str, str, str]:
+    """
+    A random name, with a unique registration and an email
+
+    :param rng: The random generator.
+    :type rng: random.Random
+    :param registrations: The registrations already used.
+    :type registrations: set[str]
+    :return: The name, the registration and the email.
+    :rtype: tuple[str, str, str]
+    """
+    name = f"{rng.choice(_FIRST_NAMES)} {rng.choice(_LAST_NAMES)}"
+    registration = f"SP{rng.randrange(10**6, 10**7)}"
+    while registration in registrations:
+        registration = f"SP{rng.randrange(10**6, 10**7)}"
+    registrations.add(registration)
+    first_name = unicodedata.normalize("NFKD", name.split()[0].lower())
+    email = f"{first_name.encode('ascii', 'ignore').decode()}.{registration.lower()}@ifsp.edu.br"
+    return name, registration, email
+
+
+def _months(today: date, count: int) -> list[tuple[int, int]]:
+    """
+    The (year, month) of the last months, up to the current one
+
+    :param today: The current date.
+    :type today: date
+    :param count: How many months.
+    :type count: int
+    :return: The months, from the oldest.
+    :rtype: list[tuple[int, int]]
+    """
+    months = []
+    year, month = today.year, today.month
+    for _ in range(count):
+        months.append((year, month))
+        year, month = (year, month - 1) if month > 1 else (year - 1, 12)
+    return months[::-1]
+
+
+def _write_rows(file_path: str, rows) -> int:
+    """
+    Writes rows to a file, in chunks
+
+    :param file_path: The path of the file.
+    :type file_path: str
+    :param rows: The rows, without line endings.
+    :return: The number of rows written.
+    :rtype: int
+    """
+    written = 0
+    chunk = []
+    with open(file_path, "w", encoding="utf-8") as file:
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) == 10_000:
+                file.write("\n".join(chunk) + "\n")
+                written += len(chunk)
+                chunk = []
+        if chunk:
+            file.write("\n".join(chunk) + "\n")
+            written += len(chunk)
+    return written
+
+
+def _log_action(rng: random.Random, name: str) -> str:
+    """
+    A random action, like the ones the event handlers log
+
+    Actions have no commas, which the logs file doesn't quote.
+
+    :param rng: The random generator.
+    :type rng: random.Random
+    :param name: The Discord name of the member.
+    :type name: str
+    :return: The action.
+    :rtype: str
+    """
+    kind = rng.random()
+    channel = rng.choice(_CHANNELS)
+    text = " ".join(rng.choices(_WORDS, k=rng.randint(4, 20)))
+    if kind < 0.7:
+        return f"{name} - {channel} - {text}"
+    if kind < 0.8:
+        return f"{name} - {channel} - Before: {text} - After: {text} ok"
+    if kind < 0.9:
+        return f"{name} - Reaction: {rng.choice(_EMOJIS)} - Reacted: {text}"
+    return f"{name} - Interaction: {rng.choice(_COMMANDS)}"
+
+
+# pylint: disable-next=too-many-locals
+def generate_dataset(
+    root: str, scale: Scale, seed: int = 0, today: date | None = None
+) -> dict:
+    """
+    Writes a dataset and its manifest to a directory
+
+    :param root: The directory of the dataset, created if missing.
+    :type root: str
+    :param scale: The size of the dataset.
+    :type scale: Scale
+    :param seed: The seed of the random generator.
+    :type seed: int
+    :param today: The date the dataset ends on, today by default.
+    :type today: date | None
+    :return: The manifest, with the scale, the seed, the date and the row counts.
+    :rtype: dict
+    """
+    rng = random.Random(seed)
+    today = date.today() if today is None else today
+    os.makedirs(os.path.join(root, "attendances"), exist_ok=True)
+    registrations = set()
+    start = today.replace(year=today.year - 1, day=1)
+    end = date(today.year + 1, 12, 31)
+
+    coordinators = []
+    for _ in range(-(-scale.projects // scale.projects_per_coordinator)):
+        name, registration, email = _person(rng, registrations)
+        coordinators.append(
+            f"{_new_id(rng)},{registration},{rng.getrandbits(60)},{name},{email}"
+        )
+
+    projects = []
+    for index in range(scale.projects):
+        coordinator_id = coordinators[index // scale.projects_per_coordinator]
+        title = f"{rng.choice(_TOPICS)} {index + 1}"
+        projects.append(
+            (_new_id(rng), coordinator_id.split(",")[0], rng.getrandbits(60), title)
+        )
+
+    members = []
+    participations = []
+    for project_id, _, _, _ in projects:
+        for _ in range(scale.members_per_project):
+            name, registration, email = _person(rng, registrations)
+            member = (_new_id(rng), registration, rng.getrandbits(60), name, email)
+            members.append((project_id, member))
+            participations.append(
+                f"{_new_id(rng)},{registration},{project_id},"
+                + f"{start:%d/%m/%Y},{end:%d/%m/%Y}"
+            )
+
+    counts = {
+        "coordinators": _write_rows(
+            os.path.join(root, "coordinators.csv"), coordinators
+        ),
+        "projects": _write_rows(
+            os.path.join(root, "projects.csv"),
+            (
+                f"{project_id},{coordinator_id},{server_id},{title},"
+                + f"{start:%d/%m/%Y},{end:%d/%m/%Y}"
+                for project_id, coordinator_id, server_id, title in projects
+            ),
+        ),
+        "members": _write_rows(
+            os.path.join(root, "members.csv"),
+            (",".join(map(str, member)) for _, member in members),
+        ),
+        "participations": _write_rows(
+            os.path.join(root, "participations.csv"), participations
+        ),
+        "attendances": 0,
+    }
+
+    months = _months(today, scale.attendance_months)
+    for year, month in months:
+        rows = []
+        day = date(year, month, 1)
+        while day.month == month and day <= today:
+            if day.weekday() < 5:
+                for project_id, (member_id, *_) in members:
+                    if rng.random() < scale.attendance_days_per_week / 5:
+                        entry = rng.randint(8, 15)
+                        rows.append(
+                            f"{_new_id(rng)},{member_id},{project_id},{day:%d/%m/%Y},"
+                            + f"{entry:02d}:{rng.choice((0, 30)):02d},"
+                            + f"{entry + rng.randint(1, 4):02d}:00"
+                        )
+            day += timedelta(days=1)
+        counts["attendances"] += _write_rows(
+            os.path.join(root, "attendances", f"{year:04d}-{month:02d}.csv"), rows
+        )
+
+    first_log = datetime.combine(start, datetime.min.time())
+    span = int(
+        (datetime.combine(today, datetime.min.time()) - first_log).total_seconds()
+    )
+    step = max(span // scale.logs, 1)
+
+    def logs():
+        moment = first_log
+        for _ in range(scale.logs):
+            project_id, (_, registration, discord_id, name, _) = rng.choice(members)
+            moment += timedelta(seconds=rng.randint(0, 2 * step))
+            stamp = f"{moment:%d/%m/%Y %H:%M}"
+            action = _log_action(rng, name.replace(" ", "").lower())
+            yield f"{project_id},{registration},{discord_id},{stamp},{stamp} - {action}"
+
+    counts["logs"] = _write_rows(os.path.join(root, "logs.csv"), logs())
+
+    manifest = {
+        "scale": asdict(scale),
+        "seed": seed,
+        "today": today.isoformat(),
+        "months": months,
+        "rows": counts,
+    }
+    with open(os.path.join(root, MANIFEST_FILE_NAME), "w", encoding="utf-8") as file:
+        json.dump(manifest, file, indent=4)
+    return manifest
+
+
+def load_manifest(root: str) -> dict | None:
+    """
+    Reads the manifest of a dataset
+
+    :param root: The directory of the dataset.
+    :type root: str
+    :return: The manifest, or None if the directory has no dataset.
+    :rtype: dict | None
+    """
+    try:
+        with open(os.path.join(root, MANIFEST_FILE_NAME), encoding="utf-8") as file:
+            return json.load(file)
+    except FileNotFoundError:
+        return None
+
+
+def add_scale_arguments(parser: argparse.ArgumentParser) -> None:
+    """
+    Adds the options that choose the scale of a dataset to a parser
+
+    :param parser: The parser of the command line.
+    :type parser: argparse.ArgumentParser
+    """
+    parser.add_argument("--scale", choices=SCALES, default="small", help="the scale")
+    for field in fields(Scale):
+        parser.add_argument(
+            f"--{field.name.replace('_', '-')}", type=int, help="overrides the scale"
+        )
+    parser.add_argument("--seed", type=int, default=0, help="the random seed")
+
+
+def scale_from_arguments(args: argparse.Namespace) -> Scale:
+    """
+    The scale chosen by the command line options
+
+    :param args: The parsed command line.
+    :type args: argparse.Namespace
+    :return: The scale, with the overridden sizes.
+    :rtype: Scale
+    """
+    overrides = {
+        field.name: getattr(args, field.name)
+        for field in fields(Scale)
+        if getattr(args, field.name) is not None
+    }
+    return replace(SCALES[args.scale], **overrides)
+
+
+def main():
+    """
+    Generates a dataset from the command line
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    add_scale_arguments(parser)
+    parser.add_argument("--output", required=True, help="the dataset directory")
+    args = parser.parse_args()
+
+    start = perf_counter()
+    manifest = generate_dataset(args.output, scale_from_arguments(args), args.seed)
+    print(json.dumps(manifest["rows"], indent=4))
+    print(f"generated in {perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
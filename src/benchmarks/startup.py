@@ -0,0 +1,117 @@
+"""
+startup
+=======
+
+This module measures how long the bot takes to import its modules, the part of
+the startup that happens before the data is loaded and the bot connects to the
+gateway.
+
+Each target is imported in a new interpreter, so no module is already cached,
+and the result is the median of several runs. The last target measures the
+first access to a report class, which imports reportlab and sets up the reports
+module.
+
+Run it from the repository root:
+
+    PYTHONPATH=src python -m benchmarks.startup --runs 10
+
+Functions:
+    - measure(statement, runs): Measures the statement in new interpreters.
+    - main(): Runs the benchmark and prints the results.
+
+Variables:
+    - TARGETS (dict[str, str]): The statements measured, by name.
+
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+TARGETS = {
+    "import main": "import main",
+    "import bot": "import bot",
+    "import services": "import services",
+    "import reports": "import reports",
+    "first report access": "import reports; reports.MonthlyReport",
+}
+
+_TIMER = """
+import sys
+from time import perf_counter
+start = perf_counter()
+{statement}
+elapsed = perf_counter() - start
+print(elapsed, int("reportlab" in sys.modules))
+"""
+
+
+def measure(statement: str, runs: int) -> dict:
+    """
+    Measures the statement in new interpreters
+
+    :param statement: The Python statement to measure.
+    :type statement: str
+    :param runs: How many interpreters run the statement.
+    :type runs: int
+    :return: The median and minimum time in milliseconds, and whether reportlab
+        was imported by the statement.
+    :rtype: dict
+    """
+    src_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        path for path in (src_path, env.get("PYTHONPATH")) if path
+    )
+
+    times = []
+    imports_reportlab = False
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, "-c", _TIMER.format(statement=statement)],
+            capture_output=True,
+            check=True,
+            env=env,
+            text=True,
+        )
+        elapsed, reportlab_loaded = result.stdout.split()[-2:]
+        times.append(float(elapsed) * 1000)
+        imports_reportlab = reportlab_loaded == "1"
+
+    return {
+        "median_ms": round(statistics.median(times), 2),
+        "min_ms": round(min(times), 2),
+        "imports_reportlab": imports_reportlab,
+    }
+
+
+def main():
+    """
+    Runs the benchmark and prints the results, as a table or as JSON
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument("--runs", type=int, default=5, help="runs of each target")
+    parser.add_argument("--json", action="store_true", help="print the results as JSON")
+    args = parser.parse_args()
+
+    results = {
+        name: measure(statement, args.runs) for name, statement in TARGETS.items()
+    }
+
+    if args.json:
+        print(json.dumps(results, indent=4))
+        return
+
+    print(f"{'target':<22}{'median (ms)':>12}{'min (ms)':>10}  reportlab")
+    for name, result in results.items():
+        print(
+            f"{name:<22}{result['median_ms']:>12.2f}{result['min_ms']:>10.2f}"
+            f"  {'yes' if result['imports_reportlab'] else 'no'}"
+        )
+
+
+if __name__ == "__main__":
+    main()
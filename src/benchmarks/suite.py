@@ -0,0 +1,526 @@
+"""
+suite
+=====
+
+This module times the bot's data loads, service lookups, log generation and
+reports on a synthetic dataset, generated by the dataset module at the chosen
+scale.
+
+Every case runs several times and the result is the median and the minimum of
+the runs. The lookups and generate_log run in batches, and also report the time
+of a single call. The report cache is cleared before every report is generated,
+so each run renders the report.
+
+Run it from the repository root, where the report fonts are. The dataset is
+generated in the data directory if it doesn't have one at the chosen scale, and
+the results are written as JSON, so runs can be compared:
+
+    PYTHONPATH=src python -m benchmarks.suite --scale medium --output results.json
+
+Functions:
+    - open_dataset(root, manifest): Builds the data objects and services on a dataset.
+    - measure(func, runs, setup=None): Measures a function over several runs.
+    - run_suite(root, manifest, runs): Runs every case of the suite.
+    - main(): Runs the suite from the command line.
+
+Variables:
+    - LOOKUPS (int): The number of lookups of each batch.
+    - LOG_EVENTS (int): The number of generate_log calls of each batch.
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import random
+import statistics
+import tempfile
+from collections.abc import Callable
+from dataclasses import asdict, replace
+from datetime import datetime
+from time import perf_counter
+
+import reportlab
+
+import reports
+from data import (
+    AttendanceData,
+    CoordinatorData,
+    LogData,
+    MemberData,
+    ParticipationData,
+    ProjectData,
+)
+from services import (
+    AttendanceService,
+    CoordinatorService,
+    InvalidReportSize,
+    LogService,
+    MemberService,
+    ParticipationService,
+    ProjectService,
+)
+
+from .dataset import (
+    add_scale_arguments,
+    generate_dataset,
+    load_manifest,
+    scale_from_arguments,
+)
+
+LOOKUPS = 1000
+LOG_EVENTS = 1000
+
+_TEXT = (
+    "Durante o período foram estudados os trabalhos relacionados ao tema do "
+    "projeto, implementados os primeiros experimentos e documentados os "
+    "resultados obtidos, que foram apresentados ao coordenador nas reuniões. "
+)
+
+
+def _at(data_class: type, **paths: str):
+    """
+    An instance of a data class that reads and writes the given paths
+
+    :param data_class: The data class.
+    :type data_class: type
+    :param paths: The paths of its files, by attribute name.
+    :type paths: str
+    :return: The data object.
+    """
+
+    # the paths are class attributes, read by __init__ in AttendanceData
+    class DatasetData(data_class):  # pylint: disable=too-few-public-methods
+        """
+        The data class, on the dataset's files
+        """
+
+    for name, path in paths.items():
+        setattr(DatasetData, name, path)
+    return DatasetData()
+
+
+def open_dataset(root: str, manifest: dict) -> dict:
+    """
+    Builds the data objects and the services on a dataset
+
+    :param root: The directory of the dataset.
+    :type root: str
+    :param manifest: The manifest of the dataset.
+    :type manifest: dict
+    :return: The data objects and services, by name.
+    :rtype: dict
+    """
+    coordinator_data = _at(
+        CoordinatorData,
+        coordinators_file_path=os.path.join(root, "coordinators.csv"),
+    )
+    project_data = _at(
+        ProjectData, projects_file_path=os.path.join(root, "projects.csv")
+    )
+    member_data = _at(MemberData, members_file_path=os.path.join(root, "members.csv"))
+    participation_data = _at(
+        ParticipationData,
+        participations_file_path=os.path.join(root, "participations.csv"),
+    )
+    attendance_data = _at(
+        AttendanceData,
+        attendances_dir_path=os.path.join(root, "attendances"),
+        legacy_attendances_file_path=os.path.join(root, "attendances.csv"),
+    )
+    log_data = _at(LogData, logs_file_path=os.path.join(root, "logs.csv"))
+
+    coordinator_service = CoordinatorService(coordinator_data)
+    project_service = ProjectService(project_data, coordinator_service)
+    member_service = MemberService(member_data)
+    participation_service = ParticipationService(
+        participation_data, member_data, project_service, member_service
+    )
+    log_service = LogService(
+        log_data,
+        member_data,
+        participation_data,
+        project_service,
+        member_service,
+        participation_service,
+    )
+    attendance_service = AttendanceService(
+        attendance_data,
+        {
+            (year, month): attendance_data.load_month(year, month)
+            for year, month in manifest["months"]
+        },
+    )
+
+    return {
+        "member_data": member_data,
+        "log_data": log_data,
+        "participation_data": participation_data,
+        "coordinator_service": coordinator_service,
+        "project_service": project_service,
+        "member_service": member_service,
+        "participation_service": participation_service,
+        "log_service": log_service,
+        "attendance_service": attendance_service,
+    }
+
+
+def measure(
+    func: Callable[[], object], runs: int, setup: Callable[[], None] | None = None
+) -> tuple[dict, object]:
+    """
+    Measures a function over several runs
+
+    :param func: The function measured.
+    :type func: Callable[[], object]
+    :param runs: How many times it runs.
+    :type runs: int
+    :param setup: A function called before each run, outside of the measure.
+    :type setup: Callable[[], None] | None
+    :return: The median and minimum time in milliseconds, and the value returned
+        by the last run.
+    :rtype: tuple[dict, object]
+    """
+    times = []
+    value = None
+    for _ in range(runs):
+        if setup is not None:
+            setup()
+        start = perf_counter()
+        value = func()
+        times.append((perf_counter() - start) * 1000)
+
+    result = {
+        "median_ms": round(statistics.median(times), 3),
+        "min_ms": round(min(times), 3),
+        "runs": runs,
+    }
+    return result, value
+
+
+def _measure_batch(func: Callable[[object], object], args: list, runs: int) -> dict:
+    """
+    Measures a batch of calls, one for each argument
+
+    :param func: The function called.
+    :type func: Callable[[object], object]
+    :param args: The argument of each call.
+    :type args: list
+    :param runs: How many times the batch runs.
+    :type runs: int
+    :return: The times of the batch, and the median time of a call in microseconds.
+    :rtype: dict
+    """
+
+    def batch():
+        for arg in args:
+            func(arg)
+
+    result, _ = measure(batch, runs)
+    result["calls"] = len(args)
+    result["per_call_us"] = round(result["median_ms"] * 1000 / len(args), 3)
+    return result
+
+
+def _measure_report(new_report: Callable[[], object], runs: int) -> dict:
+    """
+    Measures the generate() of a new report in each run, with the report cache empty
+
+    :param new_report: The function that creates the report.
+    :type new_report: Callable[[], object]
+    :param runs: How many times the report is generated.
+    :type runs: int
+    :return: The times and the size of the report in bytes, or the error that
+        stopped it from being generated.
+    :rtype: dict
+    """
+    reports_made = []
+
+    def prepare():
+        reports.report_cache.clear()
+        reports_made.append(new_report())
+
+    def generate():
+        return reports_made[-1].generate()
+
+    try:
+        result, content = measure(generate, runs, prepare)
+    # pylint: disable-next=broad-exception-caught
+    except Exception as error:
+        return {"error": f"{type(error).__name__}: {error}"}
+    result["bytes"] = len(content)
+    return result
+
+
+def _measure_log_report(log_service: LogService, runs: int, *args) -> dict:
+    """
+    Measures LogService.generate_log_report followed by render_log_report, which
+    renders the report and checks its size, as the /log command does
+
+    :param log_service: The log service.
+    :type log_service: LogService
+    :param runs: How many times the report is generated.
+    :type runs: int
+    :return: The times and the size of the report in bytes, whether it was
+        rejected for its size, or the error that stopped it from being generated.
+    :rtype: dict
+    """
+
+    def generate():
+        try:
+            report = log_service.generate_log_report(*args)
+            return log_service.render_log_report(report)
+        except InvalidReportSize:
+            return None
+
+    try:
+        result, content = measure(generate, runs, reports.report_cache.clear)
+    # pylint: disable-next=broad-exception-caught
+    except Exception as error:
+        return {"error": f"{type(error).__name__}: {error}"}
+    if content is None:
+        result["rejected"] = True
+    else:
+        result["bytes"] = len(content)
+    return result
+
+
+# pylint: disable-next=too-many-locals
+def run_suite(root: str, manifest: dict, runs: int) -> dict[str, dict]:
+    """
+    Runs every case of the suite on a dataset
+
+    :param root: The directory of the dataset.
+    :type root: str
+    :param manifest: The manifest of the dataset.
+    :type manifest: dict
+    :param runs: How many times each case runs.
+    :type runs: int
+    :return: The result of each case, by name.
+    :rtype: dict[str, dict]
+    """
+    rng = random.Random(0)
+    results = {}
+    dataset = open_dataset(root, manifest)
+    member_service = dataset["member_service"]
+    project_service = dataset["project_service"]
+    participation_service = dataset["participation_service"]
+    log_service = dataset["log_service"]
+    attendance_service = dataset["attendance_service"]
+
+    results["MemberData.load_members"], members = measure(
+        dataset["member_data"].load_members, runs
+    )
+    results["MemberData.load_members"]["rows"] = len(members)
+    results["LogData.load_logs"], logs = measure(dataset["log_data"].load_logs, runs)
+    results["LogData.load_logs"]["rows"] = len(logs)
+    results["LogData.iter_logs"], _ = measure(
+        lambda: sum(1 for _ in dataset["log_data"].iter_logs()), runs
+    )
+
+    results["MemberService.find_member_by_type"] = _measure_batch(
+        lambda discord_id: member_service.find_member_by_type("discord_id", discord_id),
+        [rng.choice(members).discord_id for _ in range(LOOKUPS)],
+        runs,
+    )
+    results["ProjectService.find_project_by_type"] = _measure_batch(
+        lambda server_id: project_service.find_project_by_type(
+            "discord_server_id", server_id
+        ),
+        [
+            rng.choice(project_service.database).discord_server_id
+            for _ in range(LOOKUPS)
+        ],
+        runs,
+    )
+    results["ParticipationService.find_participations_by_type"] = _measure_batch(
+        lambda registration: participation_service.find_participations_by_type(
+            "registration", registration
+        ),
+        [rng.choice(members).registration for _ in range(LOOKUPS)],
+        runs,
+    )
+
+    # the logs of generate_log go to a scratch file, so the dataset stays the same
+    with tempfile.TemporaryDirectory() as scratch_dir:
+        scratch_service = LogService(
+            _at(LogData, logs_file_path=os.path.join(scratch_dir, "logs.csv")),
+            dataset["member_data"],
+            dataset["participation_data"],
+            project_service,
+            member_service,
+            participation_service,
+        )
+        project_ids = {
+            participation.registration: participation.project_id
+            for participation in participation_service.database
+        }
+        results["LogService.generate_log"] = _measure_batch(
+            lambda member: scratch_service.generate_log(
+                "benchmark - geral - mensagem de teste",
+                member.discord_id,
+                project_ids[member.registration],
+            ),
+            [rng.choice(members) for _ in range(LOG_EVENTS)],
+            runs,
+        )
+
+    project = project_service.database[0]
+    project_members = [
+        member_service.find_member_by_type("registration", participation.registration)
+        for participation in participation_service.database
+        if participation.project_id == project.project_id
+    ]
+    member = project_members[0]
+    year, month = (
+        manifest["months"][-2]
+        if len(manifest["months"]) > 1
+        else (manifest["months"][-1])
+    )
+    start_date = f"01/{month:02d}/{year}"
+    server_id = project.discord_server_id
+
+    log_cases = {
+        "pdf, member": (server_id, member.discord_id, None, None, "pdf"),
+        "pdf, member, dates": (server_id, member.discord_id, start_date, None, "pdf"),
+        "pdf, project": (server_id, None, None, None, "pdf"),
+        "pdf, project, dates": (server_id, None, start_date, None, "pdf"),
+        "csv, project": (server_id, None, None, None, "csv"),
+        "ndjson, project": (server_id, None, None, None, "ndjson"),
+    }
+    for name, args in log_cases.items():
+        results[f"LogService.generate_log_report ({name})"] = _measure_log_report(
+            log_service, runs, *args
+        )
+
+    pdf_data = log_service.generate_log_report(*log_cases["pdf, member"]).data
+    results["LogReport.generate"] = _measure_report(
+        lambda: reports.LogReport(pdf_data), runs
+    )
+    export_data = replace(
+        log_service.generate_log_report(*log_cases["csv, project"]).data, logs=logs
+    )
+    results["LogExport.generate"] = _measure_report(
+        lambda: reports.LogExport(export_data, "csv"), runs
+    )
+
+    coordinator = dataset["coordinator_service"].find_coordinator_by_type(
+        "coord_id", project.coordinator_id
+    )
+    texts = {
+        "planned_activities": _TEXT * 3,
+        "performed_activities": _TEXT * 3,
+        "results": _TEXT * 2,
+    }
+    results["MonthlyReport.generate"] = _measure_report(
+        lambda: reports.MonthlyReport(
+            reports.MonthlyReportData(
+                project.project_title, coordinator.name, member.name, **texts
+            )
+        ),
+        runs,
+    )
+    results["SemesterReport.generate"] = _measure_report(
+        lambda: reports.SemesterReport(
+            reports.SemesterReportData(
+                project.project_title, coordinator.name, member.name, **texts
+            )
+        ),
+        runs,
+    )
+    results["TerminationStatement.generate"] = _measure_report(
+        lambda: reports.TerminationStatement(
+            reports.TerminationStatementData(
+                member.name,
+                member.registration,
+                project.project_title,
+                coordinator.name,
+                datetime.now().strftime("%d/%m/%Y"),
+                _TEXT,
+            )
+        ),
+        runs,
+    )
+
+    attendances = attendance_service.find_attends_by_member_and_project(
+        member.member_id, project.project_id, year, month
+    )
+    results["AttendanceSheet.generate"] = _measure_report(
+        lambda: reports.AttendanceSheet(
+            attendance_service.create_sheet_data(
+                member.name,
+                member.registration,
+                project.project_title,
+                attendances,
+                year,
+                month,
+            )
+        ),
+        runs,
+    )
+    results["AttendanceService.create_project_bundle"], bundle = measure(
+        lambda: attendance_service.create_project_bundle(
+            project.project_id, project.project_title, project_members, year, month
+        ),
+        runs,
+    )
+    results["AttendanceBundle.generate"] = _measure_report(
+        lambda: reports.AttendanceBundle(bundle.data), runs
+    )
+    return results
+
+
+def main():
+    """
+    Runs the suite from the command line, generating the dataset if needed, and
+    prints the results as a table and writes them as JSON
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    add_scale_arguments(parser)
+    parser.add_argument("--runs", type=int, default=3, help="runs of each case")
+    parser.add_argument(
+        "--data",
+        help="the dataset directory, in the temporary directory by default",
+    )
+    parser.add_argument("--output", help="the JSON file the results are written to")
+    args = parser.parse_args()
+
+    # the services log every load and lookup
+    logging.getLogger().setLevel(logging.WARNING)
+
+    scale = scale_from_arguments(args)
+    root = args.data or os.path.join(
+        tempfile.gettempdir(), "ifsp-report-bot-benchmark", args.scale
+    )
+    manifest = load_manifest(root)
+    if (
+        manifest is None
+        or manifest["scale"] != asdict(scale)
+        or manifest["seed"] != args.seed
+    ):
+        print(f"generating the dataset in {root}")
+        manifest = generate_dataset(root, scale, args.seed)
+
+    results = {
+        "started_at": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "reportlab": reportlab.Version,
+        "dataset": manifest,
+        "results": run_suite(root, manifest, args.runs),
+    }
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=4)
+
+    print(f"{'case':<62}{'median (ms)':>14}{'min (ms)':>12}")
+    for name, result in results["results"].items():
+        if "error" in result:
+            print(f"{name:<62}  {result['error']}")
+        else:
+            print(f"{name:<62}{result['median_ms']:>14.3f}{result['min_ms']:>12.3f}")
+
+
+if __name__ == "__main__":
+    main()
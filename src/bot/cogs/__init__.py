@@ -15,5 +15,8 @@ from .attendance_cog import AttendanceCog
 from .events import Events
 from .log_command import LogCommand
 from .monthly_report_cog import MonthlyReportCog
+from .reload_cog import ReloadCog
+from .report_queue_cog import ReportQueueCog
 from .semester_report_cog import SemesterReportCog
+from .snapshot_cog import SnapshotCog
 from .termination_statement_cog import TerminationStatementCog
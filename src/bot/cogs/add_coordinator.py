@@ -25,6 +25,7 @@ from services import (
     EmailError,
     RegistrationError,
     is_admin,
+    service_executor,
 )
 
 logger = settings.logging.getLogger(__name__)
@@ -94,14 +95,15 @@ class AddCoordinatorModal(ui.Modal):
         """
 
         try:
-            self.coordinator_service.create(
+            await service_executor.write(
+                self.coordinator_service.create,
                 Coordinator(
                     str(uuid4()),
                     self.registration.value.upper(),
                     self.discord_id.value,
                     self.name.value,
                     self.email.value,
-                )
+                ),
             )
 
             logger.info(
@@ -21,7 +21,7 @@ from discord.interactions import Interaction
 
 import data
 import settings
-from services import CoordinatorService, MemberService
+from services import CoordinatorService, MemberService, service_executor
 
 logger = settings.logging.getLogger(__name__)
 
@@ -74,7 +74,7 @@ class ModalAddMember(ui.Modal, title="Adicionar Membro"):
             self.name.value,
             self.email.value,
         )
-        self.member_service.add_member(member)
+        await service_executor.write(self.member_service.add_member, member)
         await interaction.response.send_message("Membro cadastrado com sucesso!")
         logger.info(
             "Member %s added by %s",
@@ -28,6 +28,7 @@ from services import (
     ProjectError,
     ProjectService,
     RegistrationError,
+    service_executor,
 )
 
 logger = settings.logging.getLogger(__name__)
@@ -93,14 +94,15 @@ class AddParticipationModal(ui.Modal):
             )
 
             if project:
-                self.participation_service.create(
+                await service_executor.write(
+                    self.participation_service.create,
                     Participation(
                         str(uuid4()),
                         self.registration.value.upper(),
                         project.project_id,
                         datetime.strptime(self.date.value, "%d/%m/%Y").date(),
                         project.end_date,
-                    )
+                    ),
                 )
                 logger.info(
                     "Participation sucesssfully created by %s", interaction.user.name
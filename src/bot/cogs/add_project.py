@@ -30,6 +30,7 @@ from services import (
     ProjectAlreadyExists,
     ProjectService,
     is_admin,
+    service_executor,
 )
 from services.validation import RegistrationError, verify_registration_format
 
@@ -116,7 +117,8 @@ class AddProjectModal(ui.Modal, title="Adicionar Projeto"):
                 self.registration_coordinator_id.value
             )
 
-            self.project_service.create(
+            await service_executor.write(
+                self.project_service.create,
                 Project(
                     str(uuid4()),
                     coordinator_id,
@@ -124,7 +126,7 @@ class AddProjectModal(ui.Modal, title="Adicionar Projeto"):
                     self.project_title.value.upper(),
                     self.start_date.value,
                     self.end_date.value,
-                )
+                ),
             )
 
             await interaction.response.send_message("Projeto cadastrado com sucesso!")
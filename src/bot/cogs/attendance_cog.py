@@ -9,40 +9,61 @@ Classes:
     related to the bot
     - AttendanceSheetForm: A form that allows the user to send the needed data to create
     an attendance
+    - AttendanceBatchForm: A form that allows the user to send several attendances at once
 
 """
 
 
+import asyncio
 import calendar
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, time, timedelta, timezone
-from io import BytesIO
+from time import perf_counter
 
 import discord
-from discord import File, app_commands, ui
+from discord import app_commands, ui
 from discord.ext import commands, tasks
 
 import settings
-from data import MONTHS, Member
+from data import MONTHS, Member, Project
 from services import (
     AttendanceService,
+    CoordinatorService,
     MemberService,
     ParticipationService,
+    Priority,
     ProjectService,
+    service_executor,
 )
 from services.attendance_service import (
     DayOutOfRange,
     EntryTimeAfterExitTime,
+    InvalidAttendanceBatch,
     InvalidDate,
     InvalidTime,
+    NoAttendancesInMonth,
     TimeOutOfRange,
+    render_attendance_sheet,
 )
 
+from ..delivery_queue import Delivery, DeliveryQueue
+from ..interactions import defer, reply, send_rendered_file
+from ..month_end_job import MonthEndJob, MonthEndSheet
+
 logger = settings.logging.getLogger(__name__)
 
 
 # Brasília timezone
 current_timezone = timezone(offset=timedelta(hours=-3))
 
+# Maximum number of attendance sheets being sent at the same time
+SHEET_SENDING_CONCURRENCY = 5
+
+# Maximum number of worker processes rendering the attendance sheets
+SHEET_RENDER_WORKERS = min(4, os.cpu_count() or 1)
+
 
 class ServerNotFound(Exception):
     """
@@ -62,25 +83,33 @@ class AttendanceCog(commands.Cog):
 
     """
 
+    # pylint: disable-next=too-many-arguments
     def __init__(
         self,
         bot: commands.Bot,
         member_service: MemberService,
         participation_service: ParticipationService,
         project_service: ProjectService,
+        coordinator_service: CoordinatorService,
+        attendance_service: AttendanceService,
     ) -> None:
         """
         Loads instance with the needed services and the bot, then starts the sheet creation task
 
         """
         self.bot = bot
-        self.attendance_service = AttendanceService()
+        self.attendance_service = attendance_service
         self.member_service = member_service
         self.participation_service = participation_service
         self.project_service = project_service
+        self.coordinator_service = coordinator_service
+
+        self.month_end_lock = asyncio.Lock()
 
         # pylint: disable-next=no-member
         self.is_last_day.start()
+        # pylint: disable-next=no-member
+        self.catch_up_month_end.start()
 
     @app_commands.command(
         name="cadastrar-presenca",
@@ -113,6 +142,197 @@ class AttendanceCog(commands.Cog):
                 )
             )
 
+    @app_commands.command(
+        name="cadastrar-presencas",
+        description="cadastra várias presenças de uma vez na folha de frequência",
+    )
+    async def add_student_attendances(self, interaction: discord.Interaction) -> None:
+        """
+        Command that exibits a modal to insert several attendances at once, one per line.
+        Only exibits said modal if the user is allowed.
+        Calls attendance_service for data validation
+        """
+        student = self.member_service.find_member_by_type(
+            "discord_id", interaction.user.id
+        )
+
+        if student is None:
+            logger.warning(
+                "User %s without permission tried to add new data into attendance sheet",
+                interaction.user.name,
+            )
+            await interaction.response.send_message(
+                "Você não tem permissão para adicionar novas presenças."
+            )
+
+        else:
+            logger.info("Attendance sheet batch user %s", interaction.user.name)
+            await interaction.response.send_modal(
+                AttendanceBatchForm(
+                    self.attendance_service, self.member_service, self.project_service
+                )
+            )
+
+    @app_commands.command(
+        name="folhas-de-frequencia-projeto",
+        description="gera um PDF com as folhas de frequência de todos os membros do projeto",
+    )
+    @app_commands.describe(
+        mes="Mês das folhas, de 1 a 12. Padrão: mês atual",
+        ano="Ano das folhas. Padrão: ano atual",
+    )
+    async def project_attendance_bundle(
+        self,
+        interaction: discord.Interaction,
+        mes: app_commands.Range[int, 1, 12] = None,
+        ano: app_commands.Range[int, 2000, 2100] = None,
+    ) -> None:
+        """
+        Command that sends the project's coordinator a single PDF with the attendance
+        sheets of every member of the project in a month
+        """
+        project = await self._find_coordinated_project(
+            interaction, "generate the attendance bundle"
+        )
+        if project is None:
+            return
+
+        members = self._find_project_members(project)
+
+        # A bundle of a big project can take longer than discord waits for a response
+        await defer(interaction, ephemeral=True)
+        try:
+            # Gathering the bundle may load the month, and walks the attendance index,
+            # so it holds the write lock instead of running alongside the writes
+            bundle = await service_executor.write(
+                self.attendance_service.create_project_bundle,
+                project.project_id,
+                project.project_title,
+                members,
+                ano,
+                mes,
+            )
+        except NoAttendancesInMonth as exception:
+            await reply(interaction, exception, ephemeral=True)
+            return
+
+        await send_rendered_file(
+            interaction,
+            bundle.generate,
+            filename=bundle.filename,
+            ephemeral=True,
+            priority=Priority.LARGE,
+        )
+        logger.info(
+            "Attendance bundle of project %s created by %s",
+            project.project_title,
+            interaction.user.name,
+        )
+
+    @app_commands.command(
+        name="horas-do-mes",
+        description="mostra o total de horas de cada membro do projeto no mês",
+    )
+    @app_commands.describe(
+        mes="Mês, de 1 a 12. Padrão: mês atual",
+        ano="Ano. Padrão: ano atual",
+    )
+    async def project_monthly_hours(
+        self,
+        interaction: discord.Interaction,
+        mes: app_commands.Range[int, 1, 12] = None,
+        ano: app_commands.Range[int, 2000, 2100] = None,
+    ) -> None:
+        """
+        Command that shows the project's coordinator the total hours of each member of the
+        project in a month, from the totals the attendance service keeps up to date
+        """
+        project = await self._find_coordinated_project(
+            interaction, "see the monthly hours"
+        )
+        if project is None:
+            return
+
+        today = datetime.now()
+        year = today.year if ano is None else ano
+        month = today.month if mes is None else mes
+
+        # The month is loaded holding the write lock, and the totals are read holding
+        # it too, so a write running in the thread pool doesn't change them meanwhile
+        await service_executor.write(
+            self.attendance_service.ensure_month_loaded, year, month
+        )
+        lines = []
+        async with service_executor.writing():
+            for member in sorted(
+                self._find_project_members(project), key=lambda member: member.name
+            ):
+                minutes = self.attendance_service.get_monthly_minutes(
+                    member.member_id, project.project_id, year, month
+                )
+                lines.append(f"{member.name}: {minutes // 60}h {minutes % 60}m")
+
+        if not lines:
+            lines.append("O projeto não tem membros.")
+
+        await interaction.response.send_message(
+            f"Horas de {month:02d}/{year} no projeto {project.project_title}:\n"
+            + "\n".join(lines),
+            ephemeral=True,
+        )
+        logger.info(
+            "Monthly hours of project %s seen by %s",
+            project.project_title,
+            interaction.user.name,
+        )
+
+    async def _find_coordinated_project(
+        self, interaction: discord.Interaction, action: str
+    ) -> Project | None:
+        """
+        Finds the project of the interaction's server, if the user is its coordinator.
+        Otherwise, answers the interaction with the reason and returns None
+        """
+        coordinator = self.coordinator_service.find_coordinator_by_type(
+            "discord_id", interaction.user.id
+        )
+        project = self.project_service.find_project_by_type(
+            "discord_server_id", interaction.guild_id
+        )
+
+        if project is None:
+            await interaction.response.send_message(
+                "Este servidor não está cadastrado em um projeto"
+            )
+            return None
+
+        if coordinator is None or coordinator.coord_id != project.coordinator_id:
+            logger.warning(
+                "User %s without permission tried to %s", interaction.user.name, action
+            )
+            await interaction.response.send_message(
+                "Você não tem permissão para executar esse comando."
+            )
+            return None
+
+        return project
+
+    def _find_project_members(self, project: Project) -> list[Member]:
+        """
+        Finds the members with a participation in the project
+        """
+        members = []
+        participations = self.participation_service.find_participations_by_type(
+            "project_id", project.project_id
+        )
+        for participation in participations or []:
+            member = self.member_service.find_member_by_type(
+                "registration", participation.registration
+            )
+            if member is not None and member not in members:
+                members.append(member)
+        return members
+
     @tasks.loop(time=time(hour=12, minute=0, tzinfo=current_timezone))
     async def is_last_day(self):
         """
@@ -127,13 +347,126 @@ class AttendanceCog(commands.Cog):
             await self.create_all_attendance_sheets()
             logger.info("Attendance sheets task finished")
 
-    async def create_all_attendance_sheets(self) -> None:
+    @tasks.loop(count=1)
+    async def catch_up_month_end(self):
         """
-        Gets all the students inside the attendances database, creates all attendance sheets
-        and send them to each student
+        Runs once at startup and resumes or runs the month-end jobs that were
+        interrupted by a restart or missed while the bot was offline
         """
-        all_students_id = self.attendance_service.get_all_students_id()
-        for student_id in all_students_id:
+        if not MonthEndJob.has_history():
+            # Without a history, the months before this version are assumed sent,
+            # so they are marked complete and aren't sent again on the next start
+            MonthEndJob.start_history()
+            for year, month in self._month_end_months():
+                MonthEndJob(year, month).mark_complete()
+            return
+
+        for year, month in self._missed_months():
+            logger.info("Catching up the attendance sheets of %02d/%04d", month, year)
+            await self.create_all_attendance_sheets(year, month)
+
+    @catch_up_month_end.before_loop
+    async def before_catch_up_month_end(self):
+        """
+        Waits for the bot to be ready, so the students can be found
+        """
+        await self.bot.wait_until_ready()
+
+    def _month_end_months(self) -> list[tuple[int, int]]:
+        """
+        Gets the months whose month-end job should have run by now: the previous month,
+        and the current one if today is its last day and it is past 12:00
+        """
+        now = datetime.now(current_timezone)
+        if now.month == 1:
+            months = [(now.year - 1, 12)]
+        else:
+            months = [(now.year, now.month - 1)]
+
+        last_day = calendar.monthrange(year=now.year, month=now.month)[1]
+        if now.day == last_day and now.time() >= time(hour=12):
+            months.append((now.year, now.month))
+        return months
+
+    def _missed_months(self) -> list[tuple[int, int]]:
+        """
+        Gets the months whose month-end job should have run but isn't complete
+        """
+        return [
+            (year, month)
+            for year, month in self._month_end_months()
+            if not MonthEndJob(year, month).is_complete
+        ]
+
+    async def create_all_attendance_sheets(
+        self, year: int | None = None, month: int | None = None
+    ) -> None:
+        """
+        Gets all the students with attendances in a month, the current one by default,
+        creates all their attendance sheets and send them to each student
+
+        The job is checkpointed in a MonthEndJob: students already done are skipped,
+        sheets rendered before a restart are read from disk instead of rendered again,
+        and a complete month isn't sent twice. The sheets are rendered concurrently in a
+        pool of worker processes and sent through a DeliveryQueue. The time of each stage
+        is logged
+        """
+        today = datetime.now()
+        job = MonthEndJob(
+            today.year if year is None else year,
+            today.month if month is None else month,
+        )
+
+        async with self.month_end_lock:
+            if job.is_complete:
+                logger.info("Attendance sheets of %s were already sent", job.name)
+                return
+
+            job_start = perf_counter()
+            # The prepare stage loads the month and walks the attendance index, so it
+            # runs holding the write lock, without a student's write changing it
+            sheets = await service_executor.write(
+                self._prepare_all_attendance_sheets, job
+            )
+            prepare_end = perf_counter()
+            contents = await self._render_attendance_sheets(job, sheets)
+            render_end = perf_counter()
+            delivered, dead = await self._send_attendance_sheets(job, sheets, contents)
+            job_end = perf_counter()
+
+            failed = sum(
+                isinstance(content, BaseException) for content in contents.values()
+            )
+            if not failed:
+                job.mark_complete()
+
+            logger.info(
+                "Attendance sheets job %s: %d sheets in %.2fs"
+                " (prepare %.2fs, render %.2fs, send %.2fs);"
+                " delivered %d, dead-lettered %d, failed to render %d",
+                job.name,
+                len(sheets),
+                job_end - job_start,
+                prepare_end - job_start,
+                render_end - prepare_end,
+                job_end - render_end,
+                delivered,
+                dead,
+                failed,
+            )
+
+    def _prepare_all_attendance_sheets(self, job: MonthEndJob) -> list[MonthEndSheet]:
+        """
+        Gathers the data of the sheets of every student with attendances in the job's
+        month, except the students the job already handled
+        """
+        sheets = []
+        for student_id in self.attendance_service.get_all_students_id(
+            job.year, job.month
+        ):
+            if student_id in job.done_students:
+                continue
+
             student = self.member_service.find_member_by_type("member_id", student_id)
             if student is None:
                 log_msg = f"Student with id {student_id}"
@@ -149,30 +482,132 @@ class AttendanceCog(commands.Cog):
                 logger.warning(log_msg)
                 continue
 
-            files = self._create_attendance_sheet(student)
-            if not files:
+            student_sheets = self._create_attendance_sheets_data(
+                student, job.year, job.month
+            )
+            if not student_sheets:
                 log_msg = (
                     f"Student with id {student_id} had no attendance, proceeding..."
                 )
                 logger.info(log_msg)
                 continue
 
-            log_msg = f"Attendance sheets for the student with id {student_id}"
-            log_msg += " were successfuly created. Sending..."
-            logger.info(log_msg)
+            sheets.extend(student_sheets)
 
-            first_name = student.name.split()[0]
+        return sheets
 
-            for file in files:
-                await user.send(
+    async def _render_attendance_sheets(
+        self, job: MonthEndJob, sheets: list[MonthEndSheet]
+    ) -> dict[str, bytes | BaseException]:
+        """
+        Renders the sheets concurrently in a pool of worker processes, so the event loop
+        keeps running. Each sheet is saved in the job as soon as it is rendered, and sheets
+        saved before a restart are read instead of rendered again. A sheet that fails to
+        render is returned as its exception
+
+        :return: The content of each sheet, by sheet id
+        """
+        contents: dict[str, bytes | BaseException] = {}
+        to_render = []
+        for sheet in sheets:
+            content = job.load_sheet(sheet.sheet_id)
+            if content is None:
+                to_render.append(sheet)
+            else:
+                contents[sheet.sheet_id] = content
+
+        if not to_render:
+            return contents
+
+        loop = asyncio.get_running_loop()
+
+        async def render(pool: ProcessPoolExecutor, sheet: MonthEndSheet) -> None:
+            try:
+                content = await loop.run_in_executor(
+                    pool, render_attendance_sheet, sheet.data
+                )
+            # pylint: disable-next=broad-exception-caught
+            except Exception as exception:
+                contents[sheet.sheet_id] = exception
+                return
+            job.save_sheet(sheet.sheet_id, content)
+            contents[sheet.sheet_id] = content
+
+        # The workers are started by a fork server instead of forked from the bot, whose
+        # threads may hold the reports' locks, which would stay locked in the children
+        with ProcessPoolExecutor(
+            max_workers=SHEET_RENDER_WORKERS,
+            mp_context=multiprocessing.get_context("forkserver"),
+        ) as pool:
+            await asyncio.gather(*(render(pool, sheet) for sheet in to_render))
+
+        return contents
+
+    async def _send_attendance_sheets(
+        self,
+        job: MonthEndJob,
+        sheets: list[MonthEndSheet],
+        contents: dict[str, bytes | BaseException],
+    ) -> tuple[int, int]:
+        """
+        Sends the rendered sheets to their students through a DeliveryQueue, with at most
+        SHEET_SENDING_CONCURRENCY messages in flight. Sheets already sent before a restart
+        are not sent again. Once all sheets of a student are handled, the student is
+        checkpointed in the job
+
+        :return: The number of delivered and of dead-lettered sheets
+        """
+        sheet_ids_by_student: dict[str, list[str]] = {}
+        for sheet in sheets:
+            sheet_ids_by_student.setdefault(sheet.student.member_id, []).append(
+                sheet.sheet_id
+            )
+        remaining = {
+            student_id: set(sheet_ids)
+            for student_id, sheet_ids in sheet_ids_by_student.items()
+        }
+
+        def on_finished(delivery: Delivery) -> None:
+            student_id = delivery.delivery_id.split("_")[0]
+            remaining[student_id].discard(delivery.delivery_id)
+            if not remaining[student_id]:
+                job.mark_student_done(student_id, sheet_ids_by_student[student_id])
+
+        queue = DeliveryQueue(
+            self.bot,
+            f"attendance-sheets-{job.name}",
+            max_concurrency=SHEET_SENDING_CONCURRENCY,
+            on_finished=on_finished,
+        )
+
+        for sheet in sheets:
+            content = contents[sheet.sheet_id]
+            if isinstance(content, BaseException):
+                logger.error(
+                    "Attendance sheet %s couldn't be created: %r",
+                    sheet.sheet_name,
+                    content,
+                )
+                continue
+            first_name = sheet.student.name.split()[0]
+            queue.enqueue(
+                Delivery(
+                    delivery_id=sheet.sheet_id,
+                    user_id=sheet.user_id,
                     content=f"{first_name}, aqui está a sua folha de presença em formato PDF:",
-                    file=file,
+                    filename=sheet.sheet_name,
+                    data=content,
                 )
+            )
 
-    def _create_attendance_sheet(self, student: Member) -> list[File]:
+        return await queue.run()
+
+    def _create_attendance_sheets_data(
+        self, student: Member, year: int, month: int
+    ) -> list[MonthEndSheet]:
         """
-        Get all attendances for a student, dividing them for each project and then create each
-        sheet
+        Get all attendances of a month for a student, dividing them for each project and
+        then gather the data of each sheet, with the name of its file
         """
         all_participations = self.participation_service.find_participations_by_type(
             "registration", student.registration
@@ -180,14 +615,14 @@ class AttendanceCog(commands.Cog):
         if all_participations is None:
             return []
 
-        all_projects_id = set()
-        for participation in all_participations:
-            all_projects_id.add(participation.project_id)
+        all_projects_id = {
+            participation.project_id for participation in all_participations
+        }
 
         first_name = student.name.split()[0]
-        month_str = MONTHS[datetime.now().month - 1]
+        month_str = MONTHS[month - 1]
 
-        files = []
+        sheets = []
         for project_id in all_projects_id:
 
             project = self.project_service.find_project_by_type(
@@ -201,17 +636,19 @@ class AttendanceCog(commands.Cog):
                 continue
 
             proj_attends = self.attendance_service.find_attends_by_member_and_project(
-                student.member_id, project_id
+                student.member_id, project_id, year, month
             )
 
             if not proj_attends:
                 continue
 
-            file = self.attendance_service.create_sheet(
+            sheet_data = self.attendance_service.create_sheet_data(
                 student_registration=student.registration,
                 student_name=student.name,
                 project_name=project.project_title,
                 attendances=proj_attends,
+                year=year,
+                month=month,
             )
 
             # Breaking line to not exceed 100 characters
@@ -219,15 +656,17 @@ class AttendanceCog(commands.Cog):
             sheet_name += f"{month_str}-{first_name}-{student.registration}"
             sheet_name += f"-{project.project_title}.pdf"
 
-            files.append(
-                File(
-                    BytesIO(file),
-                    filename=sheet_name,
-                    spoiler=False,
+            sheets.append(
+                MonthEndSheet(
+                    sheet_id=f"{student.member_id}_{project_id}",
+                    student=student,
+                    user_id=student.discord_id,
+                    sheet_name=sheet_name,
+                    data=sheet_data,
                 )
             )
 
-        return files
+        return sheets
 
 
 class AttendanceSheetForm(ui.Modal):
@@ -280,7 +719,8 @@ class AttendanceSheetForm(ui.Modal):
             if member is None:
                 raise MemberNotFound("O seu usuário não está cadastrado")
 
-            self.attendance_service.create_attendance(
+            await service_executor.write(
+                self.attendance_service.create_attendance,
                 day=self.day_field.value,
                 entry_time=self.entry_time_field.value,
                 exit_time=self.exit_time_field.value,
@@ -348,3 +788,87 @@ class AttendanceSheetForm(ui.Modal):
             )
             logger.error(log_msg)
             await interaction.response.send_message(exception)
+
+
+class AttendanceBatchForm(ui.Modal):
+    """
+    A Class modal that represents a form for sending several attendances at once, one per line
+    """
+
+    entries_field = ui.TextInput(
+        label="Presenças (uma por linha)",
+        style=discord.TextStyle.paragraph,
+        placeholder="DIA ENTRADA SAÍDA, ex:\n5 08:00 12:00\n6 13:30 17:00",
+        max_length=1000,
+    )
+
+    def __init__(
+        self,
+        attendance_service: AttendanceService,
+        member_service: MemberService,
+        project_service: ProjectService,
+    ):
+        """
+        Initialize the AttendanceBatchForm instance with the needed services.
+        """
+        super().__init__(title="Folha de frequência - várias presenças")
+        self.attendance_service = attendance_service
+        self.member_service = member_service
+        self.project_service = project_service
+
+    async def on_submit(self, interaction: discord.Interaction, /) -> None:
+        """
+        Handle the submit event of the form.
+
+        Sends all lines to the service, which validates every attendance before saving
+        them in a single write. If any line is invalid, nothing is saved and the user
+        receives the error of each line
+        """
+        project = self.project_service.find_project_by_type(
+            "discord_server_id", interaction.guild_id
+        )
+        member = self.member_service.find_member_by_type(
+            "discord_id", interaction.user.id
+        )
+
+        if project is None:
+            logger.error(
+                "Error during attendance batch creation: The server where the request"
+                " was made isn't related to any project"
+            )
+            await interaction.response.send_message(
+                "Este servidor não está cadastrado em um projeto"
+            )
+            return
+        if member is None:
+            logger.error(
+                "Error during attendance batch creation: The user isn't in the members"
+                " database"
+            )
+            await interaction.response.send_message("O seu usuário não está cadastrado")
+            return
+
+        try:
+            saved = await service_executor.write(
+                self.attendance_service.create_attendances,
+                entries=self.entries_field.value,
+                user_id=member.member_id,
+                proj_id=project.project_id,
+            )
+        except InvalidAttendanceBatch as exception:
+            logger.error(
+                "Error during attendance batch creation by %s: %s",
+                interaction.user.name,
+                exception,
+            )
+            await interaction.response.send_message(
+                f"Nenhuma presença foi cadastrada:\n{exception}"
+            )
+            return
+
+        logger.info(
+            "Success: user %s created %d attendances", interaction.user.name, saved
+        )
+        await interaction.response.send_message(
+            f"{saved} presenças cadastradas com sucesso!"
+        )
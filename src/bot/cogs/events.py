@@ -5,7 +5,7 @@ import discord
 from discord.ext import commands
 from discord.ext.commands import Cog
 
-from services import LogService
+from services import LogService, service_executor
 
 
 class Events(commands.Cog):
@@ -29,7 +29,8 @@ class Events(commands.Cog):
 
             if len(message.attachments) > 0:
                 action = f"{message.author} - {message.channel} - {message.attachments[0].url}"
-                self.log_service.generate_log(
+                await service_executor.write(
+                    self.log_service.generate_log,
                     project_id=self.log_service.get_project_server_id(message.guild.id),
                     action=action,
                     student_id=message.author.id,
@@ -37,7 +38,8 @@ class Events(commands.Cog):
                 )
             else:
                 action = f"{message.author} - {message.channel} - {message.content}"
-                self.log_service.generate_log(
+                await service_executor.write(
+                    self.log_service.generate_log,
                     project_id=self.log_service.get_project_server_id(message.guild.id),
                     action=action,
                     student_id=message.author.id,
@@ -60,7 +62,8 @@ class Events(commands.Cog):
             action = (
                 f"{message.author} - {message.channel} - Deleted: {message.content}"
             )
-            self.log_service.generate_log(
+            await service_executor.write(
+                self.log_service.generate_log,
                 project_id=self.log_service.get_project_server_id(message.guild.id),
                 action=action,
                 student_id=message.author.id,
@@ -82,7 +85,8 @@ class Events(commands.Cog):
                 return
             # pylint: disable=line-too-long
             action = f"{before.author} - {before.channel} - Before: {before.content} - After: {after.content}"
-            self.log_service.generate_log(
+            await service_executor.write(
+                self.log_service.generate_log,
                 project_id=self.log_service.get_project_server_id(before.guild.id),
                 action=action,
                 student_id=before.author.id,
@@ -100,7 +104,8 @@ class Events(commands.Cog):
             if self.log_service.get_project_server_id(interaction.guild.id) is not None:
                 action = f"{interaction.user} - Interaction: {interaction.data['name']}"
 
-                self.log_service.generate_log(
+                await service_executor.write(
+                    self.log_service.generate_log,
                     project_id=self.log_service.get_project_server_id(
                         interaction.guild.id
                     ),
@@ -123,7 +128,8 @@ class Events(commands.Cog):
             is not None
         ):
             action = f"{user} - Reaction: {reaction.emoji} - Reacted: {reaction.message.content}"
-            self.log_service.generate_log(
+            await service_executor.write(
+                self.log_service.generate_log,
                 project_id=self.log_service.get_project_server_id(
                     reaction.message.guild.id
                 ),
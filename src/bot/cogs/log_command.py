@@ -1,7 +1,7 @@
 """
 Cog for handling log commands.
 """
-from io import BytesIO
+from functools import partial
 
 import discord
 from discord import Member, app_commands
@@ -12,12 +12,17 @@ from services import (
     CoordinatorService,
     IdDoesNotExist,
     IncorrectDateFilter,
+    InvalidExportFormat,
     InvalidReportSize,
     LogService,
     NoStartDate,
+    Priority,
+    service_executor,
 )
 from services.validation import DiscordIdError
 
+from ..interactions import defer, reply, send_rendered_file
+
 logger = settings.logging.getLogger(__name__)
 
 
@@ -38,13 +43,23 @@ class LogCommand(commands.Cog):
         start_date="Data inicial para a procura de registros. Ex:01/09/2023",
         end_date="Data final para a procura de registros. Ex:01/09/2023",
         member="Apenas registros do membro inserido",
+        export_format="Formato do arquivo. CSV e NDJSON são compactados com gzip",
+    )
+    @app_commands.choices(
+        export_format=[
+            app_commands.Choice(name="PDF", value="pdf"),
+            app_commands.Choice(name="CSV", value="csv"),
+            app_commands.Choice(name="NDJSON", value="ndjson"),
+        ]
     )
+    # pylint: disable=too-many-arguments
     async def log_file(
         self,
         interaction: discord.Interaction,
         start_date: str = None,
         end_date: str = None,
         member: Member = None,
+        export_format: str = "pdf",
     ):
         """
         Command for creating a log file.
@@ -54,6 +69,7 @@ class LogCommand(commands.Cog):
             - start_date: Optional start date for log filtering.
             - end_date: Optional end date for log filtering.
             - member_id: Optional member ID for log filtering.
+            - export_format: "pdf" (default), "csv" or "ndjson".
 
         Returns:
             None
@@ -61,20 +77,22 @@ class LogCommand(commands.Cog):
         if self.coordinator_service.find_coordinator_by_type(
             "discord_id", interaction.user.id
         ):
+            await defer(interaction, ephemeral=True)
             try:
-                if member is not None:
-                    log_report = self.log_service.generate_log_report(
-                        interaction.guild.id, member.id, start_date, end_date
-                    )
-                else:
-                    log_report = self.log_service.generate_log_report(
-                        interaction.guild.id, member, start_date, end_date
-                    )
-                await interaction.response.send_message(
-                    file=discord.File(
-                        BytesIO(log_report.generate()), filename="log.pdf"
-                    ),
+                log_report = await service_executor.run(
+                    self.log_service.generate_log_report,
+                    interaction.guild.id,
+                    None if member is None else member.id,
+                    start_date,
+                    end_date,
+                    export_format,
+                )
+                await send_rendered_file(
+                    interaction,
+                    partial(self.log_service.render_log_report, log_report),
+                    filename=log_report.filename,
                     ephemeral=True,
+                    priority=Priority.LARGE,
                 )
                 logger.info(
                     "Log File successfully created by '%s'",
@@ -85,9 +103,10 @@ class LogCommand(commands.Cog):
                 NoStartDate,
                 InvalidReportSize,
                 IncorrectDateFilter,
+                InvalidExportFormat,
                 DiscordIdError,
             ) as exception:
-                await interaction.response.send_message(exception)
+                await reply(interaction, exception, ephemeral=True)
 
         else:
             await interaction.response.send_message(
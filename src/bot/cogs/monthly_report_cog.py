@@ -7,7 +7,7 @@ Classes:
 - MonthyReportForm: Represents a monthly report form for generating monthly reports.
 
 """
-from io import BytesIO
+from functools import partial
 
 import discord
 from discord import app_commands, ui
@@ -31,6 +31,8 @@ from services.monthly_report_service import (
     ProjectDoesNotExist,
 )
 
+from ..interactions import defer, reply, send_rendered_file
+
 logger = settings.logging.getLogger(__name__)
 
 
@@ -220,42 +222,54 @@ class MonthlyReportForm(ui.Modal):
         Handle the submit event of the form.
 
         This method is called when the user submits the form.
-        It generates the monthly report based on the form data and sends it to the user.
+        It defers the interaction and generates the monthly report based on the form
+        data in the background, sending it to the user as a followup.
 
         :param interaction: The Discord interaction object.
         :type interaction: discord.Interaction
 
         """
 
-        valid_data_for_report = self.monthly_report_service.verifiy_member_validity(
-            self.member,
-            self.project,
-        )
+        await defer(interaction)
+
+        try:
+            valid_data_for_report = self.monthly_report_service.verifiy_member_validity(
+                self.member,
+                self.project,
+            )
+        except (
+            CoordinatorDoesNotExist,
+            ParticipationDoesNotExist,
+            ParticipationDoesNotExisInServer,
+        ) as exception:
+            await reply(interaction, exception)
+            return
 
         if valid_data_for_report:
 
             project_title, coordinator_name, student_name = valid_data_for_report
 
-            generated_report = self.monthly_report_service.generate_monthly_report(
-                project_title=project_title,
-                project_manager=coordinator_name,
-                student_name=student_name,
-                planned_activities=self.planned_activities.value.strip(),
-                performed_activities=self.performed_activities.value.strip(),
-                results=self.results.value.strip(),
-            )
-
-            report = generated_report
-
             name_of_report, content = self.monthly_report_service.generate_report_info(
                 student_name
             )
 
-            await interaction.response.send_message(
-                content=content,
-                file=discord.File(
-                    BytesIO(report),
-                    filename=name_of_report,
-                    spoiler=False,
+            await send_rendered_file(
+                interaction,
+                partial(
+                    self.monthly_report_service.generate_monthly_report,
+                    project_title=project_title,
+                    project_manager=coordinator_name,
+                    student_name=student_name,
+                    planned_activities=self.planned_activities.value.strip(),
+                    performed_activities=self.performed_activities.value.strip(),
+                    results=self.results.value.strip(),
                 ),
+                filename=name_of_report,
+                content=content,
+            )
+        else:
+            logger.warning(
+                "User %s could not be validated for the monthly report",
+                interaction.user.name,
             )
+            await reply(interaction, "Não foi possível gerar o relatório mensal.")
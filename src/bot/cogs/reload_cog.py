@@ -0,0 +1,117 @@
+"""
+reload_cog
+==========
+
+This module reloads the data files edited by hand without restarting the bot,
+when the administrator runs /recarregar-dados or the process receives SIGHUP.
+
+Classes:
+    - ReloadCog: Cog with the reload command and the SIGHUP handler.
+
+"""
+
+import asyncio
+import signal
+
+import discord
+from discord import app_commands
+from discord.ext import commands
+
+import settings
+from services import ReloadResult, ReloadService, is_admin
+
+logger = settings.logging.getLogger(__name__)
+
+
+class ReloadCog(commands.Cog):
+    """
+    Cog with the reload command and the SIGHUP handler
+
+    Methods:
+        - reload_data: Reloads the changed data files and reports the result.
+
+    Attributes:
+        - reload_service (ReloadService): The service that reloads the files.
+        - tasks (set[asyncio.Task]): The reloads started by a signal and still running.
+    """
+
+    def __init__(self, reload_service: ReloadService) -> None:
+        self.reload_service = reload_service
+        self.tasks: set[asyncio.Task] = set()
+
+    async def cog_load(self) -> None:
+        """
+        Reloads the data files when the process receives SIGHUP, where supported
+        """
+        try:
+            asyncio.get_running_loop().add_signal_handler(
+                signal.SIGHUP, self._reload_from_signal
+            )
+        except (AttributeError, NotImplementedError):
+            logger.info("SIGHUP isn't supported, use /recarregar-dados to reload")
+
+    async def cog_unload(self) -> None:
+        """
+        Removes the SIGHUP handler
+        """
+        try:
+            asyncio.get_running_loop().remove_signal_handler(signal.SIGHUP)
+        except (AttributeError, NotImplementedError):
+            pass
+
+    def _reload_from_signal(self) -> None:
+        """
+        Starts a reload in the background, keeping a reference to its task
+        """
+        logger.info("SIGHUP received, reloading the data files")
+        task = asyncio.create_task(self.reload_service.reload())
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+
+    @app_commands.command(
+        name="recarregar-dados",
+        description="Recarrega os arquivos de dados editados sem reiniciar o bot",
+    )
+    async def reload_data(self, interaction: discord.Interaction):
+        """
+        Reloads the changed data files and reports the result, for the administrator
+
+        :param interaction: The Discord interaction object.
+        :type interaction: discord.Interaction
+        """
+        if not is_admin(interaction.user.id):
+            await interaction.response.send_message(
+                "Você não tem permissão para recarregar os dados.", ephemeral=True
+            )
+            logger.error(
+                "User (discord_id: %s) tried to reload the data, "
+                + "but does not have permission.",
+                interaction.user.id,
+            )
+            return
+
+        await interaction.response.defer(ephemeral=True, thinking=True)
+        result = await self.reload_service.reload()
+        await interaction.followup.send(_describe(result), ephemeral=True)
+        logger.info("recarregar-dados command user %s", interaction.user.name)
+
+
+def _describe(result: ReloadResult) -> str:
+    """
+    Describes the result of a reload to the administrator
+
+    :param result: The result of the reload.
+    :type result: ReloadResult
+    :return: The message sent to the administrator.
+    :rtype: str
+    """
+    if not result.reloaded and not result.failed:
+        return "Nenhum arquivo de dados mudou."
+
+    lines = [f"{name}: {rows} linhas" for name, rows in result.reloaded.items()]
+    if result.reloaded:
+        lines.insert(0, "Arquivos recarregados:")
+    if result.failed:
+        lines.append("Não foi possível recarregar:")
+        lines += [f"{name}: {error}" for name, error in result.failed.items()]
+    return "\n".join(lines)
@@ -0,0 +1,73 @@
+"""
+report_queue_cog
+================
+
+This module shows the administrator the state of the report scheduler, to
+follow the queue during the semester report windows.
+
+Classes:
+    - ReportQueueCog: Cog with the command that shows the report queue.
+
+"""
+
+import discord
+from discord import app_commands
+from discord.ext import commands
+
+import settings
+from services import Priority, ReportScheduler, is_admin
+
+logger = settings.logging.getLogger(__name__)
+
+
+class ReportQueueCog(commands.Cog):
+    """
+    Cog with the command that shows the report queue
+
+    Methods:
+        - show_report_queue: Shows the queue length and the wait times of the reports.
+
+    Attributes:
+        - report_scheduler (ReportScheduler): The scheduler of the reports.
+    """
+
+    def __init__(self, report_scheduler: ReportScheduler) -> None:
+        self.report_scheduler = report_scheduler
+
+    @app_commands.command(
+        name="fila-relatorios",
+        description="Mostra a fila de geração de relatórios e os tempos de espera",
+    )
+    async def show_report_queue(self, interaction: discord.Interaction):
+        """
+        Shows the administrator the queue length and the wait times of the reports
+
+        :param interaction: The Discord interaction object.
+        :type interaction: discord.Interaction
+        """
+        if not is_admin(interaction.user.id):
+            await interaction.response.send_message(
+                "Você não tem permissão para ver a fila de relatórios.", ephemeral=True
+            )
+            logger.error(
+                "User (discord_id: %s) tried to see the report queue, "
+                + "but does not have permission.",
+                interaction.user.id,
+            )
+            return
+
+        scheduler = self.report_scheduler
+        lines = [
+            f"Gerando: {scheduler.running} de {scheduler.max_concurrency}",
+            f"Na fila: {scheduler.queue_length()}, "
+            + f"o mais antigo há {scheduler.oldest_wait():.1f}s",
+        ]
+        names = {Priority.SMALL: "Pequenos", Priority.LARGE: "Grandes"}
+        for priority, stats in scheduler.stats.items():
+            lines.append(
+                f"{names[priority]}: {scheduler.queue_length(priority)} na fila, "
+                + f"{stats.started} iniciados, espera média {stats.average_wait:.1f}s, "
+                + f"máxima {stats.max_wait:.1f}s"
+            )
+        await interaction.response.send_message("\n".join(lines), ephemeral=True)
+        logger.info("fila-relatorios command user %s", interaction.user.name)
@@ -0,0 +1,49 @@
+"""
+Cog that periodically saves a snapshot of the services' state, so the next
+startup restores it instead of parsing every data file.
+"""
+from time import perf_counter
+
+from discord.ext import commands, tasks
+
+import settings
+from services import SnapshotService, service_executor
+
+logger = settings.logging.getLogger(__name__)
+
+SNAPSHOT_INTERVAL_MINUTES = 10
+
+
+class SnapshotCog(commands.Cog):
+    """
+    Cog that saves a snapshot every SNAPSHOT_INTERVAL_MINUTES minutes.
+
+    The state is captured holding the services' write lock, so no write is half
+    done, and compressed and written in a worker thread.
+    """
+
+    def __init__(self, snapshot_service: SnapshotService) -> None:
+        self.snapshot_service = snapshot_service
+        # pylint: disable-next=no-member
+        self.take_snapshot.start()
+
+    async def cog_unload(self) -> None:
+        """
+        Stops the snapshot task when the cog is unloaded
+        """
+        # pylint: disable-next=no-member
+        self.take_snapshot.cancel()
+
+    @tasks.loop(minutes=SNAPSHOT_INTERVAL_MINUTES)
+    async def take_snapshot(self):
+        """
+        Captures the state of the services and saves it in the snapshot file
+        """
+        start = perf_counter()
+        payload = await service_executor.write(self.snapshot_service.capture)
+        try:
+            size = await service_executor.run(self.snapshot_service.write, payload)
+        except OSError as error:
+            logger.error("Could not save the snapshot: %s", error)
+            return
+        logger.info("Snapshot saved: %d bytes in %.3fs", size, perf_counter() - start)
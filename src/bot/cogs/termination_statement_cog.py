@@ -12,7 +12,7 @@ Classes:
 """
 
 import locale
-from io import BytesIO
+from functools import partial
 
 import discord
 from discord import app_commands, ui
@@ -28,8 +28,11 @@ from services import (
     ProjectNotFound,
     SlashAbsence,
     TerminationStatementService,
+    service_executor,
 )
 
+from ..interactions import defer, reply, send_rendered_file
+
 locale.setlocale(locale.LC_TIME, "pt_BR.UTF-8")
 
 logger = settings.logging.getLogger(__name__)
@@ -199,39 +202,39 @@ class TerminationStatementForm(ui.Modal):
                 self.termination_date.value,
             )
 
-            self.termination_service.write_termination_date_in_participations(
+            await defer(interaction)
+
+            await service_executor.write(
+                self.termination_service.write_termination_date_in_participations,
                 self.participations,
                 self.project.project_id,
                 self.termination_date.value,
             )
 
-            termination_statement = self.termination_service.generate_document(
-                self.member,
-                self.project,
-                self.coordinator,
-                self.termination_date.value,
-                self.termination_reason.value,
-            )
-
             document_name = f"""termo-encerramento-{self.member.name}-
                 {self.member.registration}-{self.project.project_title}.pdf"""
 
+            await send_rendered_file(
+                interaction,
+                partial(
+                    self.termination_service.generate_document,
+                    self.member,
+                    self.project,
+                    self.coordinator,
+                    self.termination_date.value,
+                    self.termination_reason.value,
+                ),
+                filename=document_name,
+                content="Termo de Encerramento gerado.",
+            )
+
             logger.info(
                 "Termination statement successfully created by user %s",
                 interaction.user.name,
             )
 
-            await interaction.response.send_message(
-                content="Termo de Encerramento gerado.",
-                file=discord.File(
-                    BytesIO(termination_statement),
-                    filename=document_name,
-                    spoiler=False,
-                ),
-            )
-
         except SlashAbsence as exception:
-            await interaction.response.send_message(exception)
+            await reply(interaction, exception)
 
         except ValueError as exception:
             logger.warning(
@@ -244,13 +247,15 @@ class TerminationStatementForm(ui.Modal):
                 )
             )
             if date_format_error is not None:
-                await interaction.response.send_message(date_format_error)
+                await reply(interaction, date_format_error)
             else:
                 logger.error(
                     "An unexpected error occurred in termination date input by user %s",
                     interaction.user.name,
                 )
-            await interaction.response.send_message(date_format_error)
+                await reply(
+                    interaction, "Não foi possível gerar o Termo de Encerramento."
+                )
 
         except OutofRangeTerminationDate as exception:
-            await interaction.response.send_message(exception)
+            await reply(interaction, exception)
@@ -0,0 +1,287 @@
+"""
+delivery_queue
+==============
+
+Queue for sending direct messages in bulk, such as the month-end attendance
+sheets.
+
+discord.py already waits for the rate limit buckets it knows about. When a
+rate limit still escapes it, the queue pauses every sending for the time in
+the Retry-After header before trying again. Other transient failures (server
+errors, timeouts, connection errors) are retried with exponential backoff.
+
+Permanent failures, such as users with closed DMs, are appended to a dead
+letter file. Delivered and dead-lettered messages are recorded in a progress
+file, so a batch enqueued again after a restart only sends what is left.
+
+Classes:
+    - Delivery: A direct message waiting to be sent.
+    - DeliveryQueue: Sends deliveries with bounded concurrency, retries and progress.
+
+Variables:
+    DELIVERIES_DIR_PATH: Directory of the progress and dead letter files.
+"""
+
+import asyncio
+import csv
+import os
+import random
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime
+from io import BytesIO
+
+import aiohttp
+import discord
+from discord.ext import commands
+
+import settings
+
+logger = settings.logging.getLogger(__name__)
+
+DELIVERIES_DIR_PATH = "assets/data/deliveries"
+
+
+@dataclass
+class Delivery:
+    """
+    A direct message waiting to be sent
+
+    Attributes:
+        delivery_id (str): Unique id of the message in its batch.
+        user_id (int): The discord id of the recipient.
+        content (str): The text of the message.
+        filename (str | None): The name of the attached file, if there is one.
+        data (bytes | None): The content of the attached file, if there is one.
+    """
+
+    delivery_id: str
+    user_id: int
+    content: str
+    filename: str | None = None
+    data: bytes | None = None
+
+
+# pylint: disable-next=too-many-instance-attributes
+class DeliveryQueue:
+    """
+    Sends direct messages with bounded concurrency, retrying transient failures
+    and recording the progress of the batch on disk
+
+    Attributes:
+        bot (commands.Bot): The bot that sends the messages.
+        batch_name (str): Name of the batch, used for the progress and dead letter files.
+        max_concurrency (int): Maximum number of messages being sent at the same time.
+        max_attempts (int): Maximum number of attempts of a message with transient failures.
+        base_delay (float): Delay before the first retry, doubled on each retry.
+        max_delay (float): Maximum delay between retries.
+        on_finished (Callable[[Delivery], None] | None): Called with each delivery once it
+        is delivered or dead-lettered, including deliveries finished before a restart.
+    """
+
+    # pylint: disable-next=too-many-arguments
+    def __init__(
+        self,
+        bot: commands.Bot,
+        batch_name: str,
+        max_concurrency: int = 5,
+        max_attempts: int = 5,
+        base_delay: float = 1.0,
+        max_delay: float = 60.0,
+        on_finished: Callable[[Delivery], None] | None = None,
+    ) -> None:
+        self.bot = bot
+        self.batch_name = batch_name
+        self.max_concurrency = max_concurrency
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.on_finished = on_finished
+
+        os.makedirs(DELIVERIES_DIR_PATH, exist_ok=True)
+        self.progress_file_path = os.path.join(
+            DELIVERIES_DIR_PATH, f"{batch_name}.progress"
+        )
+        self.dead_letter_file_path = os.path.join(
+            DELIVERIES_DIR_PATH, f"{batch_name}.dead-letter.csv"
+        )
+
+        self._pending: asyncio.Queue[Delivery] = asyncio.Queue()
+        self._paused_until = 0.0
+        self.finished = self._load_progress()
+
+    def _load_progress(self) -> set[str]:
+        """
+        Reads the ids of the deliveries already delivered or dead-lettered in the batch
+
+        :return: The ids of the finished deliveries
+        :rtype: set[str]
+        """
+        if not os.path.exists(self.progress_file_path):
+            return set()
+        with open(self.progress_file_path, "r", encoding="utf-8") as file:
+            return {row.strip() for row in file if row.strip()}
+
+    def _record_progress(self, delivery: Delivery) -> None:
+        """
+        Appends the id of a finished delivery to the progress file
+        """
+        with open(self.progress_file_path, "a", encoding="utf-8") as file:
+            file.write(f"{delivery.delivery_id}\n")
+            file.flush()
+            os.fsync(file.fileno())
+        self.finished.add(delivery.delivery_id)
+        if self.on_finished is not None:
+            self.on_finished(delivery)
+
+    def _record_dead_letter(self, delivery: Delivery, reason: str) -> None:
+        """
+        Appends a delivery that can't be sent to the dead letter file
+        """
+        with open(
+            self.dead_letter_file_path, "a", encoding="utf-8", newline=""
+        ) as file:
+            csv.writer(file).writerow(
+                [
+                    datetime.now().isoformat(timespec="seconds"),
+                    delivery.delivery_id,
+                    delivery.user_id,
+                    delivery.filename or "",
+                    reason,
+                ]
+            )
+        logger.error(
+            "Delivery %s to user %s dead-lettered: %s",
+            delivery.delivery_id,
+            delivery.user_id,
+            reason,
+        )
+        self._record_progress(delivery)
+
+    def enqueue(self, delivery: Delivery) -> bool:
+        """
+        Adds a delivery to the queue, unless it was already finished in this batch
+
+        :param delivery: The delivery to be sent
+        :type delivery: Delivery
+        :return: True if the delivery was enqueued, False if it was already finished
+        :rtype: bool
+        """
+        if delivery.delivery_id in self.finished:
+            if self.on_finished is not None:
+                self.on_finished(delivery)
+            return False
+        self._pending.put_nowait(delivery)
+        return True
+
+    async def run(self) -> tuple[int, int]:
+        """
+        Sends every enqueued delivery and waits until the queue is empty
+
+        :return: The number of delivered and of dead-lettered deliveries
+        :rtype: tuple[int, int]
+        """
+        results = await asyncio.gather(
+            *(self._worker() for _ in range(self.max_concurrency))
+        )
+        return (
+            sum(delivered for delivered, _ in results),
+            sum(dead for _, dead in results),
+        )
+
+    async def _worker(self) -> tuple[int, int]:
+        """
+        Sends deliveries from the queue until it is empty
+        """
+        delivered = dead = 0
+        while not self._pending.empty():
+            delivery = self._pending.get_nowait()
+            if await self._deliver(delivery):
+                delivered += 1
+            else:
+                dead += 1
+        return delivered, dead
+
+    async def _deliver(self, delivery: Delivery) -> bool:
+        """
+        Sends a delivery, retrying transient failures
+
+        :return: True if the delivery was sent, False if it was dead-lettered
+        :rtype: bool
+        """
+        loop = asyncio.get_running_loop()
+        for attempt in range(1, self.max_attempts + 1):
+            await asyncio.sleep(max(0.0, self._paused_until - loop.time()))
+            try:
+                await self._send(delivery)
+            except discord.RateLimited as exception:
+                self._pause(exception.retry_after)
+                reason = str(exception)
+            except discord.HTTPException as exception:
+                if exception.status == 429:
+                    self._pause(_retry_after(exception))
+                elif exception.status < 500:
+                    # Closed DMs, unknown users and other client errors won't change
+                    self._record_dead_letter(
+                        delivery, f"{exception.status} {exception.text}"
+                    )
+                    return False
+                reason = f"{exception.status} {exception.text}"
+            except (asyncio.TimeoutError, aiohttp.ClientError, OSError) as exception:
+                reason = repr(exception)
+            else:
+                self._record_progress(delivery)
+                return True
+
+            if attempt < self.max_attempts:
+                delay = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+                delay *= random.uniform(0.5, 1.0)
+                logger.warning(
+                    "Delivery %s failed (attempt %d of %d): %s. Retrying in %.1fs",
+                    delivery.delivery_id,
+                    attempt,
+                    self.max_attempts,
+                    reason,
+                    delay,
+                )
+                await asyncio.sleep(delay)
+
+        self._record_dead_letter(delivery, f"gave up after retries: {reason}")
+        return False
+
+    async def _send(self, delivery: Delivery) -> None:
+        """
+        Sends a delivery once. The attached file is rebuilt on each attempt,
+        since sending consumes it
+        """
+        user = self.bot.get_user(delivery.user_id)
+        if user is None:
+            user = await self.bot.fetch_user(delivery.user_id)
+
+        if delivery.data is None:
+            await user.send(content=delivery.content)
+        else:
+            await user.send(
+                content=delivery.content,
+                file=discord.File(
+                    BytesIO(delivery.data), filename=delivery.filename, spoiler=False
+                ),
+            )
+
+    def _pause(self, retry_after: float) -> None:
+        """
+        Pauses every sending of the queue for the given number of seconds
+        """
+        loop = asyncio.get_running_loop()
+        self._paused_until = max(self._paused_until, loop.time() + retry_after)
+        logger.warning("Rate limited, pausing deliveries for %.1fs", retry_after)
+
+
+def _retry_after(exception: discord.HTTPException) -> float:
+    """
+    Reads the Retry-After header of a rate limited response, in seconds
+    """
+    try:
+        return float(exception.response.headers.get("Retry-After", 1))
+    except (AttributeError, ValueError):
+        return 1.0
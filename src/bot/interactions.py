@@ -0,0 +1,153 @@
+"""
+interactions
+============
+
+Helpers for answering interactions whose answer takes a while, such as the
+reports rendered from the report forms.
+
+Discord drops an interaction that isn't answered in 3 seconds, so the
+interaction is deferred right away and the document is queued in the report
+scheduler, which renders it in the background. When the document isn't ready
+after PROGRESS_AFTER_SECONDS, the deferred answer is replaced by a progress
+message, updated every PROGRESS_INTERVAL_SECONDS, which tells whether the
+document is waiting in the queue or rendering. The document replaces it when it
+is ready.
+
+Functions:
+    - defer(interaction, ephemeral=False): Defers the interaction, if it wasn't answered.
+    - reply(interaction, content, ephemeral=False): Answers the interaction, or sends a
+    followup if it was already answered or deferred.
+    - send_rendered_file(interaction, render, filename, content=None, ephemeral=False,
+    priority=Priority.SMALL): Renders a document in the background and sends it as a
+    followup.
+
+Variables:
+    - PROGRESS_AFTER_SECONDS (float): How long a render runs before the progress message.
+    - PROGRESS_INTERVAL_SECONDS (float): How often the progress message is updated.
+"""
+
+import asyncio
+from collections.abc import Callable
+from io import BytesIO
+from time import perf_counter
+
+import discord
+
+import settings
+from services import Priority, ReportJob, report_scheduler
+
+logger = settings.logging.getLogger(__name__)
+
+PROGRESS_AFTER_SECONDS = 2.0
+PROGRESS_INTERVAL_SECONDS = 5.0
+
+
+async def defer(interaction: discord.Interaction, ephemeral: bool = False) -> None:
+    """
+    Defers the interaction, showing that the bot is thinking, if it wasn't answered
+
+    :param interaction: The Discord interaction object.
+    :type interaction: discord.Interaction
+    :param ephemeral: Whether only the user sees the answer.
+    :type ephemeral: bool
+    """
+    if not interaction.response.is_done():
+        await interaction.response.defer(ephemeral=ephemeral, thinking=True)
+
+
+async def reply(
+    interaction: discord.Interaction, content: object, ephemeral: bool = False
+) -> None:
+    """
+    Answers the interaction, or sends a followup if it was already answered or deferred
+
+    :param interaction: The Discord interaction object.
+    :type interaction: discord.Interaction
+    :param content: The message, usually an exception with the reason of a failure.
+    :type content: object
+    :param ephemeral: Whether only the user sees the message.
+    :type ephemeral: bool
+    """
+    if interaction.response.is_done():
+        await interaction.followup.send(str(content), ephemeral=ephemeral)
+    else:
+        await interaction.response.send_message(content, ephemeral=ephemeral)
+
+
+async def _show_progress(interaction: discord.Interaction, job: ReportJob) -> bool:
+    """
+    Shows a progress message with the elapsed time until the job finishes
+
+    :param interaction: The Discord interaction object.
+    :type interaction: discord.Interaction
+    :param job: The job rendering the document.
+    :type job: ReportJob
+    :return: Whether the progress message was shown.
+    :rtype: bool
+    """
+    start = perf_counter()
+    timeout = PROGRESS_AFTER_SECONDS
+    shown = False
+    while not job.future.done():
+        await asyncio.wait({job.future}, timeout=timeout)
+        if job.future.done():
+            break
+        elapsed = int(perf_counter() - start)
+        if job.started_at is None:
+            status = "Aguardando na fila para gerar o documento"
+        else:
+            status = "Gerando o documento, aguarde"
+        try:
+            await interaction.edit_original_response(
+                content=f"{status}... ({elapsed}s)"
+            )
+            shown = True
+        except discord.HTTPException as error:
+            logger.warning("Could not show the render progress: %s", error)
+        timeout = PROGRESS_INTERVAL_SECONDS
+    return shown
+
+
+# pylint: disable-next=too-many-arguments
+async def send_rendered_file(
+    interaction: discord.Interaction,
+    render: Callable[[], bytes],
+    filename: str,
+    content: str | None = None,
+    ephemeral: bool = False,
+    priority: Priority = Priority.SMALL,
+) -> None:
+    """
+    Defers the interaction, renders a document in the background and sends it as
+    a followup, showing a progress message if the render takes long
+
+    :param interaction: The Discord interaction object.
+    :type interaction: discord.Interaction
+    :param render: The function that renders the document.
+    :type render: Callable[[], bytes]
+    :param filename: The name of the file sent.
+    :type filename: str
+    :param content: The text sent with the file.
+    :type content: str | None
+    :param ephemeral: Whether only the user sees the file.
+    :type ephemeral: bool
+    :param priority: The priority of the document in the report scheduler.
+    :type priority: Priority
+    :raises Exception: Any exception raised by render.
+    """
+    await defer(interaction, ephemeral)
+
+    job = report_scheduler.submit(interaction.guild_id, render, priority=priority)
+    progress_shown = await _show_progress(interaction, job)
+    if job.future.exception() is not None and progress_shown:
+        await interaction.edit_original_response(
+            content="Não foi possível gerar o documento."
+        )
+    file = discord.File(BytesIO(job.future.result()), filename=filename, spoiler=False)
+
+    if progress_shown:
+        await interaction.edit_original_response(content=content, attachments=[file])
+    elif content is None:
+        await interaction.followup.send(file=file, ephemeral=ephemeral)
+    else:
+        await interaction.followup.send(content=content, file=file, ephemeral=ephemeral)
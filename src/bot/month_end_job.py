@@ -0,0 +1,168 @@
+"""
+month_end_job
+=============
+
+Persisted state of the month-end attendance sheets job, so a run interrupted
+by a restart, or missed entirely, can be resumed.
+
+Each month has a directory in assets/data/month_end with:
+    - sheets/: the sheets already rendered and not delivered yet, so they
+      aren't rendered again when the job resumes;
+    - students.done: one line per student whose sheets were all delivered
+      (or dead-lettered);
+    - complete: an empty file written when the whole month is done.
+
+Classes:
+    - MonthEndSheet: An attendance sheet of the month-end job.
+    - MonthEndJob: Checkpoints of the month-end job of a month.
+
+Variables:
+    MONTH_END_DIR_PATH: Directory of the month-end jobs.
+"""
+
+import os
+import shutil
+from dataclasses import dataclass
+
+import reports
+from data import Member
+
+MONTH_END_DIR_PATH = "assets/data/month_end"
+
+
+@dataclass
+class MonthEndSheet:
+    """
+    An attendance sheet of the month-end job
+
+    Attributes:
+        sheet_id (str): Stable id of the sheet, from the student and project ids.
+        student (Member): The student of the sheet.
+        user_id (int): The discord id of the student.
+        sheet_name (str): The name of the sheet's file.
+        data (AttendanceSheetData): The data of the sheet.
+    """
+
+    sheet_id: str
+    student: Member
+    user_id: int
+    sheet_name: str
+    data: "reports.AttendanceSheetData"
+
+
+# pylint: disable-next=too-many-instance-attributes
+class MonthEndJob:
+    """
+    Checkpoints of the month-end job of a month
+
+    Attributes:
+        year (int): The year of the job's month.
+        month (int): The job's month, from 1 to 12.
+        name (str): The name of the job, in YYYY-MM format.
+        done_students (set[str]): The member ids of the students already done.
+    """
+
+    def __init__(self, year: int, month: int) -> None:
+        self.year = year
+        self.month = month
+        self.name = f"{year:04d}-{month:02d}"
+
+        self.dir_path = os.path.join(MONTH_END_DIR_PATH, self.name)
+        self.sheets_dir_path = os.path.join(self.dir_path, "sheets")
+        self.checkpoint_file_path = os.path.join(self.dir_path, "students.done")
+        self.complete_file_path = os.path.join(self.dir_path, "complete")
+
+        self.done_students: set[str] = set()
+        if os.path.exists(self.checkpoint_file_path):
+            with open(self.checkpoint_file_path, "r", encoding="utf-8") as file:
+                self.done_students = {row.strip() for row in file if row.strip()}
+
+    @staticmethod
+    def has_history() -> bool:
+        """
+        Checks if any month-end job was recorded. Without a history there is
+        no way to know which months were already sent, so nothing is caught up
+
+        :return: True if the month-end directory exists
+        :rtype: bool
+        """
+        return os.path.isdir(MONTH_END_DIR_PATH)
+
+    @staticmethod
+    def start_history() -> None:
+        """
+        Creates the month-end directory, so the next missed runs are caught up.
+        The months already sent by the former job must be marked complete by the
+        caller, or they are sent again
+        """
+        os.makedirs(MONTH_END_DIR_PATH, exist_ok=True)
+
+    @property
+    def is_complete(self) -> bool:
+        """
+        Whether every sheet of the month was handled
+        """
+        return os.path.exists(self.complete_file_path)
+
+    def _sheet_file_path(self, sheet_id: str) -> str:
+        return os.path.join(self.sheets_dir_path, f"{sheet_id}.pdf")
+
+    def load_sheet(self, sheet_id: str) -> bytes | None:
+        """
+        Reads a sheet rendered before the job was interrupted
+
+        :param sheet_id: The id of the sheet
+        :type sheet_id: str
+        :return: The bytes of the sheet, or None if it wasn't rendered yet
+        :rtype: bytes | None
+        """
+        sheet_file_path = self._sheet_file_path(sheet_id)
+        if not os.path.exists(sheet_file_path):
+            return None
+        with open(sheet_file_path, "rb") as file:
+            return file.read()
+
+    def save_sheet(self, sheet_id: str, content: bytes) -> None:
+        """
+        Saves a rendered sheet until it is delivered. The file is written
+        under a temporary name and then renamed, so it is never read half written
+
+        :param sheet_id: The id of the sheet
+        :type sheet_id: str
+        :param content: The bytes of the sheet
+        :type content: bytes
+        """
+        os.makedirs(self.sheets_dir_path, exist_ok=True)
+        sheet_file_path = self._sheet_file_path(sheet_id)
+        with open(sheet_file_path + ".tmp", "wb") as file:
+            file.write(content)
+        os.replace(sheet_file_path + ".tmp", sheet_file_path)
+
+    def mark_student_done(self, student_id: str, sheet_ids: list[str]) -> None:
+        """
+        Records that all sheets of a student were handled and removes them from disk
+
+        :param student_id: The member id of the student
+        :type student_id: str
+        :param sheet_ids: The ids of the student's sheets
+        :type sheet_ids: list[str]
+        """
+        os.makedirs(self.dir_path, exist_ok=True)
+        with open(self.checkpoint_file_path, "a", encoding="utf-8") as file:
+            file.write(f"{student_id}\n")
+            file.flush()
+            os.fsync(file.fileno())
+        self.done_students.add(student_id)
+
+        for sheet_id in sheet_ids:
+            if os.path.exists(self._sheet_file_path(sheet_id)):
+                os.remove(self._sheet_file_path(sheet_id))
+
+    def mark_complete(self) -> None:
+        """
+        Records that the whole month was handled and removes the remaining sheets
+        """
+        os.makedirs(self.dir_path, exist_ok=True)
+        with open(self.complete_file_path, "w", encoding="utf-8"):
+            pass
+        shutil.rmtree(self.sheets_dir_path, ignore_errors=True)
@@ -8,20 +8,27 @@ Functions:
 
 """
 
+from time import perf_counter
+
 import discord
 from discord.ext import commands
 
 import settings
 from services import (
+    AttendanceService,
     CoordinatorService,
     LogService,
     MemberService,
     MonthlyReportService,
     ParticipationService,
     ProjectService,
+    ReloadService,
     ReportService,
+    SnapshotService,
     TerminationStatementService,
+    report_scheduler,
 )
+from utils import timed
 
 from .cogs import (
     AttendanceCog,
@@ -32,13 +39,17 @@ from .cogs import (
     MonthlyReportCog,
     ParticipationCog,
     ProjectCog,
+    ReloadCog,
+    ReportQueueCog,
     SemesterReportCog,
+    SnapshotCog,
     TerminationStatementCog,
 )
+from .tree_sync import sync_tree
 
 logger = settings.logging.getLogger(__name__)
 
-# pylint: disable=too-many-arguments
+# pylint: disable=too-many-arguments, too-many-locals
 def start_bot(
     monthly_report_service: MonthlyReportService,
     member_service: MemberService,
@@ -48,77 +59,116 @@ def start_bot(
     report_service: ReportService,
     termination_service: TerminationStatementService,
     log_service: LogService,
+    attendance_service: AttendanceService,
+    snapshot_service: SnapshotService,
 ):
     """
     Start bot.
 
     This function initializes and starts the Discord bot with the provided StudentService.
+    The cogs are registered and the command tree is synced once, in setup_hook.
 
     :param student_service: An instance of the StudentService class.
     :type student_service: StudentService
+    :param attendance_service: An instance of the AttendanceService class.
+    :type attendance_service: AttendanceService
+    :param snapshot_service: An instance of the SnapshotService class.
+    :type snapshot_service: SnapshotService
 
     """
     intents = discord.Intents.all()
     intents.message_content = True
     bot = commands.Bot(intents=intents, command_prefix="!")
+    startup_start = perf_counter()
 
     @bot.event
-    async def on_ready():
+    async def setup_hook():
         """
-        Event handler for when the bot is ready.
+        Runs once, after the bot logs in and before it connects to the gateway.
 
-         This function is called when the bot has successfully connected to Discord
-         and is ready to start processing events.
-         It performs the synchronization of the command tree, ensuring that the bot has
-         the latest information about all available commands and their respective settings.
+        It registers every cog and synchronizes the command tree, ensuring that the bot
+        has the latest information about all available commands and their respective
+        settings. Unlike on_ready, it doesn't run again when the bot reconnects.
 
         """
-        await bot.add_cog(
-            TerminationStatementCog(
-                termination_service,
+        with timed("cog registration"):
+            await bot.add_cog(
+                TerminationStatementCog(
+                    termination_service,
+                )
             )
-        )
-        await bot.add_cog(
-            ParticipationCog(
-                participation_service, coordinator_service, project_service
+            await bot.add_cog(
+                ParticipationCog(
+                    participation_service, coordinator_service, project_service
+                )
             )
-        )
-        await bot.add_cog(MemberCog(member_service, coordinator_service))
-        await bot.add_cog(CoordinatorCog(coordinator_service))
-        await bot.add_cog(ProjectCog(project_service))
-
-        await bot.add_cog(
-            AttendanceCog(
-                bot,
-                member_service,
-                participation_service,
-                project_service,
+            await bot.add_cog(MemberCog(member_service, coordinator_service))
+            await bot.add_cog(CoordinatorCog(coordinator_service))
+            await bot.add_cog(ProjectCog(project_service))
+
+            await bot.add_cog(
+                AttendanceCog(
+                    bot,
+                    member_service,
+                    participation_service,
+                    project_service,
+                    coordinator_service,
+                    attendance_service,
+                )
             )
-        )
 
-        # updates the bot's command representation
-        await bot.add_cog(Events(log_service))
-        await bot.add_cog(LogCommand(log_service, coordinator_service))
-        await bot.add_cog(
-            SemesterReportCog(
-                member_service,
-                project_service,
-                report_service,
-                coordinator_service,
-                participation_service,
+            await bot.add_cog(Events(log_service))
+            await bot.add_cog(LogCommand(log_service, coordinator_service))
+            await bot.add_cog(
+                SemesterReportCog(
+                    member_service,
+                    project_service,
+                    report_service,
+                    coordinator_service,
+                    participation_service,
+                )
             )
-        )
-        await bot.add_cog(
-            MonthlyReportCog(
-                member_service,
-                project_service,
-                monthly_report_service,
-                coordinator_service,
-                participation_service,
+            await bot.add_cog(
+                MonthlyReportCog(
+                    member_service,
+                    project_service,
+                    monthly_report_service,
+                    coordinator_service,
+                    participation_service,
+                )
             )
+            await bot.add_cog(SnapshotCog(snapshot_service))
+            await bot.add_cog(
+                ReloadCog(
+                    ReloadService(
+                        coordinator_service,
+                        project_service,
+                        member_service,
+                        participation_service,
+                        attendance_service,
+                    )
+                )
+            )
+            await bot.add_cog(ReportQueueCog(report_scheduler))
+
+        # updates the bot's command representation if the commands changed
+        with timed("command tree sync"):
+            await sync_tree(bot.tree)
+
+    @bot.event
+    async def on_ready():
+        """
+        Event handler for when the bot is ready.
+
+         This function is called when the bot has successfully connected to Discord
+         and is ready to start processing events. It runs again on every reconnect.
+
+        """
+        logger.info(
+            "Bot %s is ready, %.3fs after start_bot",
+            bot.user,
+            perf_counter() - startup_start,
         )
-        await bot.tree.sync()
-        logger.info("Bot %s is ready", bot.user)
 
     @bot.tree.command(name="ping", description="Verifica se o bot está no ar")
     async def ping(interaction: discord.Interaction):
@@ -129,7 +179,7 @@ def start_bot(
         :type interaction: discord.Interaction
 
         """
-        await bot.tree.sync(guild=interaction.guild)
+        await sync_tree(bot.tree, guild=interaction.guild)
         logger.info("Ping command user %s", interaction.user.name)
         await interaction.response.send_message(f":ping_pong: {interaction.user.name}")
 
@@ -0,0 +1,104 @@
+"""
+tree_sync
+=========
+
+This module syncs the bot's command tree with Discord only when the app command
+definitions have changed since the last sync.
+
+A hash of the commands' payload is saved for each application and guild after
+every successful sync. Deleting the hash file forces the next sync.
+
+Functions:
+    - sync_tree(tree, guild=None): Syncs the command tree if its commands changed.
+
+Variables:
+    - TREE_HASHES_FILE_PATH (str): The path of the file that keeps the synced hashes.
+
+"""
+
+import hashlib
+import json
+import os
+
+import discord
+from discord import app_commands
+
+import settings
+
+logger = settings.logging.getLogger(__name__)
+
+TREE_HASHES_FILE_PATH = "assets/data/command_tree_hashes.json"
+
+
+def _load_hashes() -> dict[str, str]:
+    """
+    Loads the hashes of the last synced command trees
+
+    :return: The hashes by application and guild, empty if none were saved.
+    :rtype: dict[str, str]
+    """
+    try:
+        with open(TREE_HASHES_FILE_PATH, "r", encoding="utf-8") as file:
+            return json.load(file)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def _save_hashes(hashes: dict[str, str]) -> None:
+    """
+    Saves the hashes of the synced command trees, replacing the file atomically
+
+    :param hashes: The hashes by application and guild.
+    :type hashes: dict[str, str]
+    """
+    os.makedirs(os.path.dirname(TREE_HASHES_FILE_PATH), exist_ok=True)
+    temp_path = f"{TREE_HASHES_FILE_PATH}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as file:
+        json.dump(hashes, file, indent=4, sort_keys=True)
+    os.replace(temp_path, TREE_HASHES_FILE_PATH)
+
+
+def _tree_hash(tree: app_commands.CommandTree, guild: discord.abc.Snowflake) -> str:
+    """
+    Hashes the payload that a sync would send for the given scope
+
+    :param tree: The bot's command tree.
+    :type tree: app_commands.CommandTree
+    :param guild: The guild of the commands, or None for the global commands.
+    :type guild: discord.abc.Snowflake | None
+    :return: The hex digest of the commands' payload.
+    :rtype: str
+    """
+    payload = [command.to_dict() for command in tree.get_commands(guild=guild)]
+    payload.sort(key=lambda command: (command["name"], command["type"]))
+    encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False).encode()
+    return hashlib.sha256(encoded).hexdigest()
+
+
+async def sync_tree(
+    tree: app_commands.CommandTree, guild: discord.abc.Snowflake | None = None
+) -> bool:
+    """
+    Syncs the command tree with Discord if its commands changed since the last sync
+
+    :param tree: The bot's command tree.
+    :type tree: app_commands.CommandTree
+    :param guild: The guild to sync, or None to sync the global commands.
+    :type guild: discord.abc.Snowflake | None
+    :return: True if the tree was synced, False if the sync was skipped.
+    :rtype: bool
+    """
+    scope = "global" if guild is None else str(guild.id)
+    key = f"{tree.client.application_id}:{scope}"
+    tree_hash = _tree_hash(tree, guild)
+
+    hashes = _load_hashes()
+    if hashes.get(key) == tree_hash:
+        logger.info("Command tree %s unchanged, skipping sync", scope)
+        return False
+
+    await tree.sync(guild=guild)
+    hashes[key] = tree_hash
+    _save_hashes(hashes)
+    logger.info("Command tree %s synced", scope)
+    return True
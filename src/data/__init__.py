@@ -7,11 +7,13 @@ Package Structure
 - ``coordinator_data``: Module for managing coordinator data.
 - ``project_data``: Module for managing project data.
 - ``student_data``: Module for managing student data.
+- ``loader``: Module for loading several data files concurrently.
 """
 
 
 from .attendances_data import MONTHS, Attendance, AttendanceData
 from .coordinator_data import Coordinator, CoordinatorData
+from .loader import load_data_files
 from .log_data import Log, LogData
 from .member_data import Member, MemberData
 from .participation_data import Participation, ParticipationData
@@ -4,6 +4,11 @@ data_attendances
 
 Module for accessing and manipulating attendance data from csv files
 
+Attendances are stored in one file per month, named after the month of the
+attendance day (assets/data/attendances/2026-10.csv), so loading or saving a
+month never touches the others. The former single attendances.csv file is
+split into month files the first time it is found.
+
 Classes:
     - Attendances
 
@@ -13,11 +18,15 @@ Functions:
     - _row_to_attend(row: str) -> Attendance: Create a Attendance from a row string.
     - _attend_to_row(self, attend: Attendance) -> str: Transforms an attendance into a
     string separated by commas
-    - _load_attend() -> list[Attendance]: Read the saved Attendances.
+    - month_file_path(year: int, month: int) -> str: Returns the path of a month's file.
+    - list_months() -> list[tuple[int, int]]: Returns the (year, month) of every month file.
+    - load_month(year: int, month: int) -> list[Attendance]: Returns the attendances of a month.
     - load_attend() -> list[Attendance]: Returns all saved Attendences.
-    - save_attend(new_attend: Attendance) -> None: Saves new attendances to the csv file,
+    - save_attend(new_attend: Attendance) -> None: Saves new attendances to its month file,
     overwriting the saved attendance with the new one if it is from the same
-    user and date
+    user, project and date
+    - save_attends(new_attends: list[Attendance]) -> None: Saves several attendances,
+    writing each month file only once
 
 Variables:
     MONTHS: List with the names of the months in portuguese
@@ -57,13 +66,32 @@ class Attendance:
     entry_time: time
     exit_time: time
 
+    @property
+    def minutes(self) -> int:
+        """
+        The time of the attendance, in minutes. Attendances are saved with minute
+        precision, so seconds are ignored
+        """
+        return (self.exit_time.hour * 60 + self.exit_time.minute) - (
+            self.entry_time.hour * 60 + self.entry_time.minute
+        )
+
 
 class AttendanceData:
     """
     Class for unifying all functions that work with .csv files
     """
 
-    attendances_file_path = "assets/data/attendances.csv"
+    attendances_dir_path = "assets/data/attendances"
+    legacy_attendances_file_path = "assets/data/attendances.csv"
+
+    def __init__(self) -> None:
+        """
+        Creates the attendances directory and migrates the former single
+        attendances file, if there is one
+        """
+        os.makedirs(self.attendances_dir_path, exist_ok=True)
+        self._migrate_legacy_file()
 
     def _strtime_to_time(self, strtime: str) -> time:
         """
@@ -127,55 +155,156 @@ class AttendanceData:
         row += f",{attend.exit_time.strftime('%H:%M')}\n"
         return row
 
-    def load_attend(self) -> list[Attendance]:
+    def month_file_path(self, year: int, month: int) -> str:
         """
-        Read the assets/data/attendances.csv file and create a list of all saved Attendances
+        Returns the path of the file that stores the attendances of a month
 
-        :return: The list of all saved Attendences
-        :rtype: list[Attendance]
+        :param year: The year of the month
+        :type year: int
+        :param month: The month, from 1 to 12
+        :type month: int
+        :return: The path of the month file
+        :rtype: str
+        """
+        return os.path.join(self.attendances_dir_path, f"{year:04d}-{month:02d}.csv")
+
+    def _migrate_legacy_file(self) -> None:
+        """
+        Splits the former attendances.csv file into month files and renames it
+        to attendances.csv.migrated, so the migration only happens once
+
+        Each month file is rewritten whole and replaced at once, skipping the
+        rows it already has, so a migration interrupted before the rename is
+        simply done again on the next start, without duplicating rows.
         """
+        if not os.path.exists(self.legacy_attendances_file_path):
+            return
 
-        if not os.path.exists(self.attendances_file_path):
-            # pylint: disable=unused-variable
-            with open(self.attendances_file_path, "w", encoding="utf-8") as new_file:
-                pass
+        rows_by_month: dict[tuple[int, int], list[str]] = {}
+        with open(self.legacy_attendances_file_path, "r", encoding="utf-8") as file:
+            for row in file:
+                if not row.strip():
+                    continue
+                day = self._strdate_to_date(row.split(",")[3].strip())
+                rows_by_month.setdefault((day.year, day.month), []).append(
+                    row if row.endswith("\n") else row + "\n"
+                )
+
+        for (year, month), rows in rows_by_month.items():
+            month_file_path = self.month_file_path(year, month)
+            buffer = []
+            if os.path.exists(month_file_path):
+                with open(month_file_path, "r", encoding="utf-8") as file:
+                    buffer = [
+                        row if row.endswith("\n") else row + "\n"
+                        for row in file
+                        if row.strip()
+                    ]
+            saved = {row.strip() for row in buffer}
+            buffer.extend(row for row in rows if row.strip() not in saved)
+
+            with open(month_file_path + ".tmp", "w", encoding="utf-8") as file:
+                file.writelines(buffer)
+            os.replace(month_file_path + ".tmp", month_file_path)
+
+        os.replace(
+            self.legacy_attendances_file_path,
+            self.legacy_attendances_file_path + ".migrated",
+        )
 
-        with open(self.attendances_file_path, "r", encoding="utf-8") as file:
+    def list_months(self) -> list[tuple[int, int]]:
+        """
+        Lists the months that have an attendance file
+
+        :return: The (year, month) of every month file, in chronological order
+        :rtype: list[tuple[int, int]]
+        """
+        months = []
+        for file_name in os.listdir(self.attendances_dir_path):
+            name, extension = os.path.splitext(file_name)
+            if extension != ".csv":
+                continue
+            year, month = name.split("-")
+            months.append((int(year), int(month)))
+        return sorted(months)
+
+    def load_month(self, year: int, month: int) -> list[Attendance]:
+        """
+        Read the file of a month and create a list of its saved Attendances
+
+        :param year: The year of the month
+        :type year: int
+        :param month: The month, from 1 to 12
+        :type month: int
+        :return: The list of the month's saved Attendences, empty if there are none
+        :rtype: list[Attendance]
+        """
+        month_file_path = self.month_file_path(year, month)
+        if not os.path.exists(month_file_path):
+            return []
+
+        with open(month_file_path, "r", encoding="utf-8") as file:
             attendances = []
             for row in file:
                 attendances.append(self._row_to_attend(row))
             return attendances
 
+    def load_attend(self) -> list[Attendance]:
+        """
+        Read every month file and create a list of all saved Attendances
+
+        :return: The list of all saved Attendences
+        :rtype: list[Attendance]
+        """
+        attendances = []
+        for year, month in self.list_months():
+            attendances += self.load_month(year, month)
+        return attendances
+
     def save_attend(self, new_attend: Attendance) -> None:
         """
-        Saves the data sent by the student in attendances.csv
-        If the new data have the same date and student as another registered date, it will
-        erase the older one
+        Saves the data sent by the student in the file of the attendance's month
+        If the new data have the same date, student and project as another registered date,
+        it will erase the older one
 
         :param new_attend: The new Attendance to be saved
         :type new_attend: Attendance
         :return: Nothing
         """
+        self.save_attends([new_attend])
 
-        buffer = []
-        is_new = True
-
-        with open(self.attendances_file_path, "r", encoding="utf8") as file:
-            for row in file:
-                data = row.split(",")
-                student_id = data[1]
-                day = data[3]
-
-                if student_id == new_attend.member_id:
-                    if day == new_attend.day.strftime("%d/%m/%Y"):
-                        is_new = False
-                        buffer.append(self._attend_to_row(new_attend))
-                        continue
-
-                buffer.append(row)
-
-        if is_new:
-            buffer.append(self._attend_to_row(new_attend))
+    def save_attends(self, new_attends: list[Attendance]) -> None:
+        """
+        Saves several attendances, writing each month file involved only once
+        Saved attendances with the same date, student and project as a new one are replaced
 
-        with open(self.attendances_file_path, "w", encoding="utf8") as file:
-            file.writelines(buffer)
+        :param new_attends: The new Attendances to be saved
+        :type new_attends: list[Attendance]
+        :return: Nothing
+        """
+        attends_by_month: dict[tuple[int, int], dict[tuple[str, str, str], str]] = {}
+        for new_attend in new_attends:
+            key = (
+                new_attend.member_id,
+                new_attend.project_id,
+                new_attend.day.strftime("%d/%m/%Y"),
+            )
+            attends_by_month.setdefault(
+                (new_attend.day.year, new_attend.day.month), {}
+            )[key] = self._attend_to_row(new_attend)
+
+        for (year, month), new_rows in attends_by_month.items():
+            month_file_path = self.month_file_path(year, month)
+            buffer = []
+
+            if os.path.exists(month_file_path):
+                with open(month_file_path, "r", encoding="utf8") as file:
+                    for row in file:
+                        data = row.split(",")
+                        key = (data[1], data[2], data[3])
+                        buffer.append(new_rows.pop(key, row))
+
+            buffer.extend(new_rows.values())
+
+            with open(month_file_path, "w", encoding="utf8") as file:
+                file.writelines(buffer)
@@ -11,6 +11,8 @@ Classes:
 import os
 from dataclasses import dataclass
 
+from .loader import read_rows
+
 
 @dataclass
 class Coordinator:
@@ -66,10 +68,12 @@ class CoordinatorData:
         )
         return coordinator
 
-    def load_coordinators(self) -> list[Coordinator]:
+    def load_coordinators(self, offset: int = 0) -> list[Coordinator]:
         """
         Load coordinator from the CSV file and return a list of dictionaries.
 
+        :param offset: The position, in bytes, of the first row to load.
+        :type offset: int
         :return: A list of dictionaries, where each dictionary represents a coordinator.
         :rtype: list[dict]
         """
@@ -79,11 +83,10 @@ class CoordinatorData:
             with open(self.coordinators_file_path, "w", encoding="utf-8") as new_file:
                 pass
 
-        with open(self.coordinators_file_path, "r", encoding="utf-8") as file:
-            coordinators = []
-            for row in file:
-                coordinators.append(self._row_to_coordinator(row))
-            return coordinators
+        coordinators = []
+        for row in read_rows(self.coordinators_file_path, offset):
+            coordinators.append(self._row_to_coordinator(row))
+        return coordinators
 
     def add_coordinator(self, coord: Coordinator) -> None:
         """
@@ -0,0 +1,81 @@
+"""
+:mod: loader
+============
+
+Module for loading several data files concurrently at startup.
+
+Each file is read and parsed by its own load function in a thread pool, so the
+reads of the files overlap instead of happening one after another. The parsed
+rows are handed to the services, which then don't read the files themselves.
+
+Functions:
+    - :func:`load_data_files`: Runs the load functions in a thread pool.
+    - :func:`read_rows`: Reads the rows of a file from a byte offset on.
+
+"""
+
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter
+
+import settings
+
+logger = settings.logging.getLogger(__name__)
+
+
+def read_rows(file_path: str, offset: int = 0) -> list[str]:
+    """
+    Reads the rows of a file, starting at a position in bytes.
+
+    :param file_path: The path of the file.
+    :type file_path: str
+    :param offset: The position, in bytes, where the first row starts.
+    :type offset: int
+    :return: The rows of the file, without line endings.
+    :rtype: list[str]
+    """
+    with open(file_path, "rb") as file:
+        file.seek(offset)
+        return file.read().decode("utf-8").splitlines()
+
+
+def _timed_load(name: str, load: Callable[[], list]) -> list:
+    """
+    Runs a load function and logs how long it took and how many rows it returned.
+
+    :param name: The name of the data file, used in the log message.
+    :type name: str
+    :param load: The function that reads and parses the file.
+    :type load: Callable[[], list]
+    :return: The parsed rows.
+    :rtype: list
+    """
+    start = perf_counter()
+    rows = load()
+    logger.info("Loaded %s: %d rows in %.3fs", name, len(rows), perf_counter() - start)
+    return rows
+
+
+def load_data_files(
+    loaders: dict[str, Callable[[], list]], max_workers: int | None = None
+) -> dict[str, list]:
+    """
+    Loads the data files concurrently in a thread pool.
+
+    :param loaders: The function that loads each file, by the file's name.
+    :type loaders: dict[str, Callable[[], list]]
+    :param max_workers: The number of threads, one per file by default.
+    :type max_workers: int | None
+    :return: The parsed rows of each file, by the file's name.
+    :rtype: dict[str, list]
+    :raises Exception: Any exception raised by a load function.
+    """
+    with ThreadPoolExecutor(
+        max_workers=max_workers or len(loaders) or 1,
+        thread_name_prefix="data-loader",
+    ) as executor:
+        futures = {
+            name: executor.submit(_timed_load, name, load)
+            for name, load in loaders.items()
+        }
+        return {name: future.result() for name, future in futures.items()}
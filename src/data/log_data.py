@@ -7,6 +7,7 @@ Class:
 
 import csv
 import os
+from collections.abc import Iterator
 from dataclasses import dataclass
 
 
@@ -59,6 +60,18 @@ class LogData:
         Returns:
             list[Log]: A list of Log objects representing the log entries.
         """
+        return list(self.iter_logs())
+
+    def iter_logs(self) -> Iterator[Log]:
+        """
+        Lazily read log entries from the logs.csv file, one row at a time.
+
+        Used by the log exports, which stream the rows without keeping the
+        whole file in memory.
+
+        Yields:
+            Log: The log entries, in file order.
+        """
 
         if not os.path.exists(self.logs_file_path):
             # pylint: disable=unused-variable
@@ -66,10 +79,8 @@ class LogData:
                 pass
 
         with open(self.logs_file_path, "r", encoding="utf-8") as file:
-            logs = []
             for row in file:
-                logs.append(self._row_to_log(row))
-            return logs
+                yield self._row_to_log(row)
 
     def add_log(self, log: Log) -> None:
         """
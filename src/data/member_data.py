@@ -15,6 +15,8 @@ Classes:
 import os
 from dataclasses import dataclass
 
+from .loader import read_rows
+
 
 @dataclass
 class Member:
@@ -85,12 +87,14 @@ class MemberData:
                 + f"{member.discord_id},{member.name},{member.email}\n"
             )
 
-    def load_members(self) -> list[Member]:
+    def load_members(self, offset: int = 0) -> list[Member]:
         """
         .. method:: load_members() -> list[dict]
 
         Load members from the CSV file.
 
+        :param offset: The position, in bytes, of the first row to load.
+        :type offset: int
         :return: A list of member dictionaries.
         :rtype: list[dict]
 
@@ -101,8 +105,7 @@ class MemberData:
             with open(self.members_file_path, "w", encoding="utf-8") as new_file:
                 pass
 
-        with open(self.members_file_path, "r", encoding="utf-8") as file:
-            members = []
-            for row in file:
-                members.append(self._row_to_member(row))
-            return members
+        members = []
+        for row in read_rows(self.members_file_path, offset):
+            members.append(self._row_to_member(row))
+        return members
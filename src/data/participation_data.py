@@ -6,6 +6,8 @@ import os
 from dataclasses import dataclass
 from datetime import date, datetime
 
+from .loader import read_rows
+
 
 @dataclass
 class Participation:
@@ -50,10 +52,12 @@ class ParticipationData:
 
         return data
 
-    def load_participations(self) -> list[Participation]:
+    def load_participations(self, offset: int = 0) -> list[Participation]:
         """
         Load the participations from the database.
 
+        :param offset: The position, in bytes, of the first row to load.
+        :type offset: int
         :return: A list of participations dataclasses.
         :rtype: list.
         """
@@ -64,9 +68,8 @@ class ParticipationData:
                 pass
 
         participations = []
-        with open(self.participations_file_path, "r", encoding="utf-8") as file:
-            for row in file:
-                participations.append(self.row_to_participation(row))
+        for row in read_rows(self.participations_file_path, offset):
+            participations.append(self.row_to_participation(row))
         return participations
 
     def add_participation(self, participation: Participation):
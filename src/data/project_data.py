@@ -13,6 +13,8 @@ import os
 from dataclasses import dataclass
 from datetime import date, datetime
 
+from .loader import read_rows
+
 
 @dataclass
 class Project:
@@ -76,10 +78,12 @@ class ProjectData:
         )
         return project
 
-    def load_projects(self) -> list[Project]:
+    def load_projects(self, offset: int = 0) -> list[Project]:
         """
         Load projects from the CSV file and return a list of dictionaries.
 
+        :param offset: The position, in bytes, of the first row to load.
+        :type offset: int
         :return: A list of project dictionaries, where each dictionary represents a project.
         :rtype: list[dict]
         """
@@ -89,11 +93,10 @@ class ProjectData:
             with open(self.projects_file_path, "w", encoding="utf-8") as new_file:
                 pass
 
-        with open(self.projects_file_path, "r", encoding="utf-8") as file:
-            projects = []
-            for row in file:
-                projects.append(self._row_to_project(row))
-            return projects
+        projects = []
+        for row in read_rows(self.projects_file_path, offset):
+            projects.append(self._row_to_project(row))
+        return projects
 
     def add_project(self, project: Project) -> None:
         """
@@ -4,9 +4,20 @@ IFSP Report Bot
 This module contains the main function to start the IFSP Report Bot.
 """
 
+from functools import partial
+
 from bot import start_bot
-from data import CoordinatorData, LogData, MemberData, ParticipationData, ProjectData
+from data import (
+    AttendanceData,
+    CoordinatorData,
+    LogData,
+    MemberData,
+    ParticipationData,
+    ProjectData,
+    load_data_files,
+)
 from services import (
+    AttendanceService,
     CoordinatorService,
     LogService,
     MemberService,
@@ -14,64 +25,126 @@ from services import (
     ParticipationService,
     ProjectService,
     ReportService,
+    SnapshotService,
     TerminationStatementService,
+    load_snapshot,
+    restore_attendance_state,
+    restore_rows,
 )
+from utils import timed
 
 
+# pylint: disable-next=too-many-locals
 def main():
     """
     Main function to start the IFSP Report Bot.
 
-    It initializes the StudentService,
-    MemberService, ProjectService, ReportService, CoordinatorService
-    and ParticipationService and starts the bot by
-    calling the start_bot function.
+    It restores the snapshot of the last run, if there is one, and loads every
+    data file concurrently, replaying only the rows appended after the snapshot.
+    Then it initializes the StudentService,
+    MemberService, ProjectService, ReportService, CoordinatorService,
+    ParticipationService and AttendanceService with the loaded data and starts
+    the bot by calling the start_bot function. The time of each phase, and of
+    each data file, is logged.
     """
 
-    coordinator_data = CoordinatorData()
-    coordinator_service = CoordinatorService(coordinator_data)
-
-    project_data = ProjectData()
-    project_service = ProjectService(project_data, coordinator_service)
-
-    member_data = MemberData()
-    member_service = MemberService(member_data)
-
-    participation_data = ParticipationData()
-    participation_service = ParticipationService(
-        participation_data, member_data, project_service, member_service
-    )
-
-    report_service = ReportService(
-        participation_data,
-        participation_service,
-        coordinator_service,
-        coordinator_data,
-    )
-
-    monthly_report_service = MonthlyReportService(
-        participation_data,
-        participation_service,
-        coordinator_service,
-        coordinator_data,
-    )
-
-    termination_service = TerminationStatementService(
-        member_service,
-        project_service,
-        participation_service,
-        coordinator_service,
-    )
-
-    log_data = LogData()
-    log_service = LogService(
-        log_data,
-        member_data,
-        participation_data,
-        project_service,
-        member_service,
-        participation_service,
-    )
+    with timed("snapshot restore"):
+        snapshot = load_snapshot()
+
+    with timed("data loads"):
+        coordinator_data = CoordinatorData()
+        project_data = ProjectData()
+        member_data = MemberData()
+        participation_data = ParticipationData()
+        attendance_data = AttendanceData()
+        log_data = LogData()
+
+        # the rows saved in the snapshot are only replayed from the files
+        csv_files = {
+            "coordinators": (
+                coordinator_data.coordinators_file_path,
+                coordinator_data.load_coordinators,
+            ),
+            "projects": (project_data.projects_file_path, project_data.load_projects),
+            "members": (member_data.members_file_path, member_data.load_members),
+            "participations": (
+                participation_data.participations_file_path,
+                participation_data.load_participations,
+            ),
+        }
+        loaders = {
+            name: partial(restore_rows, snapshot, name, file_path, load)
+            for name, (file_path, load) in csv_files.items()
+        }
+
+        attendance_state = restore_attendance_state(snapshot, attendance_data)
+        recent_months = []
+        if attendance_state is None:
+            recent_months = AttendanceService.recent_months()
+        for year, month in recent_months:
+            loaders[f"attendances {year}-{month:02d}"] = partial(
+                attendance_data.load_month, year, month
+            )
+
+        loaded = load_data_files(loaders)
+
+    with timed("service construction"):
+        coordinator_service = CoordinatorService(
+            coordinator_data, loaded["coordinators"]
+        )
+        project_service = ProjectService(
+            project_data, coordinator_service, loaded["projects"]
+        )
+        member_service = MemberService(member_data, loaded["members"])
+        participation_service = ParticipationService(
+            participation_data,
+            member_data,
+            project_service,
+            member_service,
+            loaded["participations"],
+        )
+
+        report_service = ReportService(
+            participation_data,
+            participation_service,
+            coordinator_service,
+            coordinator_data,
+        )
+        monthly_report_service = MonthlyReportService(
+            participation_data,
+            participation_service,
+            coordinator_service,
+            coordinator_data,
+        )
+        termination_service = TerminationStatementService(
+            member_service,
+            project_service,
+            participation_service,
+            coordinator_service,
+        )
+        log_service = LogService(
+            log_data,
+            member_data,
+            participation_data,
+            project_service,
+            member_service,
+            participation_service,
+        )
+        attendance_service = AttendanceService(
+            attendance_data,
+            {
+                (year, month): loaded[f"attendances {year}-{month:02d}"]
+                for year, month in recent_months
+            },
+            attendance_state,
+        )
+        snapshot_service = SnapshotService(
+            coordinator_service,
+            project_service,
+            member_service,
+            participation_service,
+            attendance_service,
+        )
 
     start_bot(
         # student_service,
@@ -83,6 +156,8 @@ def main():
         report_service,
         termination_service,
         log_service,
+        attendance_service,
+        snapshot_service,
     )
 
 
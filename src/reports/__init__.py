@@ -3,10 +3,16 @@ Reports Package
 
 This package provides functionality for generating and managing reports.
 
+The report modules, and reportlab with them, are only imported the first time
+one of their classes is accessed, e.g. ``reports.MonthlyReport``. The module
+setup (fonts and locale) runs at that moment too, so importing the package
+doesn't slow down the bot's startup.
+
 Modules:
 - setup: Contains setup functions for the reports package.
 - styles: Contains styles and formatting settings for the reports.
 - monthly_report: Provides the MonthlyReport class for generating monthly reports.
+- cache: Provides the cache of rendered reports.
 
 Functions:
 - setup_reports_module: Sets up the reports module.
@@ -16,15 +22,63 @@ Classes:
 - MonthlyReport: Generates monthly reports.
 - SemesterReportData: Represents the data for a semester report.
 - SemesterReport: Generates semester reports.
+- LogExport: Streams log entries as compressed CSV or NDJSON.
+- AttendanceBundleData: Represents the data for a project's attendance bundle.
+- AttendanceBundle: Generates every attendance sheet of a project in one PDF.
 
 """
 
-from . import styles
-from .attendance_sheet import AttendanceSheet, AttendanceSheetData
-from .log_report import LogReport, LogReportData
-from .monthly_report import MonthlyReport, MonthlyReportData
-from .semester_report import SemesterReport, SemesterReportData
-from .setup import setup_reports_module
-from .termination_statement import TerminationStatement, TerminationStatementData
+import importlib
+
+from .cache import report_cache
+
+_LAZY_ATTRIBUTES = {
+    "styles": None,
+    "AttendanceBundle": "attendance_bundle",
+    "AttendanceBundleData": "attendance_bundle",
+    "AttendanceSheet": "attendance_sheet",
+    "AttendanceSheetData": "attendance_sheet",
+    "EXPORT_FORMATS": "log_export",
+    "LogExport": "log_export",
+    "LogReport": "log_report",
+    "LogReportData": "log_report",
+    "MonthlyReport": "monthly_report",
+    "MonthlyReportData": "monthly_report",
+    "SemesterReport": "semester_report",
+    "SemesterReportData": "semester_report",
+    "setup_reports_module": "setup",
+    "TerminationStatement": "termination_statement",
+    "TerminationStatementData": "termination_statement",
+}
+
+__all__ = ["report_cache", *_LAZY_ATTRIBUTES]
+
+
+def __getattr__(name):
+    """
+    Imports the module of a report class the first time it is accessed.
+
+    :param name: The name of the accessed attribute.
+    :type name: str
+    :return: The attribute, taken from its module.
+    :raises AttributeError: If the package has no such attribute.
+    """
+    if name not in _LAZY_ATTRIBUTES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    setup = importlib.import_module(".setup", __name__)
+    setup.setup_reports_module()
+
+    module_name = _LAZY_ATTRIBUTES[name]
+    if module_name is None:
+        value = importlib.import_module(f".{name}", __name__)
+    else:
+        value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+
+    # later accesses find the attribute without calling __getattr__
+    globals()[name] = value
+    return value
+
 
-setup_reports_module()
+def __dir__():
+    return __all__
@@ -0,0 +1,94 @@
+"""
+attendance_bundle
+=================
+
+This module provides classes for generating a project's attendance bundle: the
+attendance sheets of every member of a project in a month, in a single PDF.
+
+All sheets are built in one document, so the fixed header is drawn from a
+single form XObject and the table styles are shared by every page.
+
+Classes:
+    - AttendanceBundleData: Defines the data of the attendance bundle
+    - AttendanceBundle: Generates the attendance bundle from the data sent
+
+"""
+
+from dataclasses import dataclass
+from io import BytesIO
+
+from reportlab.platypus import PageBreak
+
+from data import MONTHS
+
+from .attendance_sheet import AttendanceSheet, AttendanceSheetData, sheet_doc_template
+from .cache import cached_render
+from .setup import register_fonts
+
+
+@dataclass
+class AttendanceBundleData:
+    """
+    Defines the data of the attendance bundle
+
+    Attributes:
+        project_name (str): The name of the project.
+        year (int): The year of the sheets' month.
+        month (int): The sheets' month, from 1 to 12.
+        sheets (list[AttendanceSheetData]): The data of each member's sheet.
+    """
+
+    project_name: str
+    year: int
+    month: int
+    sheets: list[AttendanceSheetData]
+
+
+class AttendanceBundle:
+    """
+    Generates the attendance bundle from the data sent
+
+    Attributes:
+        - data (AttendanceBundleData): The data for the attendance bundle.
+        - content (list): List to store the content of the bundle.
+    """
+
+    def __init__(self, data: AttendanceBundleData) -> None:
+        self.content = []
+        self.data = data
+
+    @property
+    def filename(self) -> str:
+        """
+        The name of the bundle's file
+        """
+        month = MONTHS[self.data.month - 1]
+        return (
+            f"folhas-de-frequencia-{month}-{self.data.year}"
+            f"-{self.data.project_name}.pdf"
+        )
+
+    @cached_render
+    def generate(self) -> bytes:
+        """
+        Generates the attendance bundle, with each sheet starting on a new page.
+
+        :return: The pdf bytes created by the function
+        :rtype: bytes
+        """
+        register_fonts("Calibri-Bold")
+
+        month = MONTHS[self.data.month - 1]
+        subject = "Este documento reúne as folhas de frequência do mês "
+        subject += f"{month} do projeto {self.data.project_name}"
+
+        buffer = BytesIO()
+        doc = sheet_doc_template(buffer, subject, self.filename[:-4])
+
+        for index, sheet_data in enumerate(self.data.sheets):
+            if index:
+                self.content.append(PageBreak())
+            self.content += AttendanceSheet(sheet_data).build_content()
+
+        doc.build(self.content)
+        return buffer.getvalue()
@@ -9,23 +9,137 @@ Classes:
     attendance sheet
     - AttendanceSheet: Generates the attendance sheet from the data sent
 
+Functions:
+    - month_calendar: The cached day numbers and weekday names of a month
+    - sheet_doc_template: Creates the document template shared by the attendance sheets
+
+Variables:
+    - WEEKDAYS: The weekdays in portuguese, from monday
+    - UPPER_TABLE_STYLE, MID_TABLE_STYLE, LOWER_TABLE_STYLE: The styles of the sheet's tables
+
 """
 
 
 import calendar
 from dataclasses import dataclass
-from datetime import datetime, time, timedelta
+from datetime import datetime
+from functools import lru_cache
 from io import BytesIO
 
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.units import cm
-from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+from reportlab.platypus import Paragraph, SimpleDocTemplate, Table, TableStyle
 
 from data import MONTHS, Attendance
 
 from . import styles
-from .commons import setup_header
+from .cache import cached_render
+from .commons import setup_static_header
+from .setup import register_fonts
+
+# Used to convert datetime.weekday() to the correct weekday in portuguese
+WEEKDAYS = [
+    "Segunda-feira",
+    "Terça-feira",
+    "Quarta-feira",
+    "Quinta-feira",
+    "Sexta-feira",
+    "Sábado",
+    "Domingo",
+]
+
+# The table styles are the same in every sheet, so they are built once and
+# shared by every sheet and every page of an attendance bundle
+UPPER_TABLE_STYLE = TableStyle(
+    [
+        ("SPAN", (0, 0), (-1, 0)),
+        ("SPAN", (0, 2), (-1, 2)),
+        ("SPAN", (0, 3), (-1, 3)),
+        ("BOTTOMPADDING", (0, 0), (-1, -1), 1),
+        ("TOPPADDING", (0, 0), (-1, -1), 1),
+        ("GRID", (0, 0), (-1, 0), 0.5, colors.black),
+        ("GRID", (0, 2), (-1, 2), 0.5, colors.black),
+        ("GRID", (0, 3), (-1, 3), 0.5, colors.black),
+        ("BOX", (0, 1), (2, 1), 0.5, colors.black),
+        ("BOX", (-2, 1), (-1, 1), 0.5, colors.black),
+        ("LINEBELOW", (0, 1), (-1, 1), 1.5, colors.black),
+        ("ALIGN", (0, 0), (-1, 0), "CENTER"),
+    ]
+)
+
+MID_TABLE_STYLE = TableStyle(
+    [
+        ("LEFTPADDING", (0, 0), (0, -1), 1),
+        ("RIGHTPADDING", (0, 0), (0, -1), 1),
+        ("TOPPADDING", (0, 0), (-1, 0), 0),
+        ("TOPPADDING", (0, 1), (-1, -1), 1),
+        ("BOTTOMPADDING", (0, 0), (-1, 0), 0),
+        ("BOTTOMPADDING", (0, 1), (-1, -1), 1),
+        ("GRID", (0, 0), (-1, -1), 0.5, colors.black),
+        ("ALIGN", (0, 0), (-1, -1), "CENTER"),
+        ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
+    ]
+)
+
+LOWER_TABLE_STYLE = TableStyle(
+    [
+        ("TOPPADDING", (0, 0), (-1, -1), 1),
+        ("BOTTOMPADDING", (0, 0), (-1, -1), 1),
+        ("SPAN", (2, 0), (3, 0)),
+        ("SPAN", (0, -1), (2, -1)),
+        ("SPAN", (3, -1), (4, -1)),
+        ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
+        ("BOX", (4, 0), (4, 0), 0.5, colors.black),
+        ("LINEABOVE", (0, 0), (-1, 0), 0.5, colors.black),
+        ("LINEBELOW", (3, -1), (4, -1), 0.5, colors.black),
+        ("ALIGN", (0, 0), (-1, -1), "CENTER"),
+        ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
+    ]
+)
+
+
+@lru_cache(maxsize=None)
+def month_calendar(year: int, month: int) -> tuple[tuple[str, str], ...]:
+    """
+    Builds the skeleton of a month's attendance table once per month: the number and
+    the weekday name of each day
+
+    :param year: The year of the month
+    :param month: The month, from 1 to 12
+    :return: A (day, weekday name) pair for each day of the month
+    :rtype: tuple[tuple[str, str], ...]
+    """
+    first_weekday, days_in_month = calendar.monthrange(year, month)
+    return tuple(
+        (str(day), WEEKDAYS[(first_weekday + day - 1) % 7])
+        for day in range(1, days_in_month + 1)
+    )
+
+
+def sheet_doc_template(buffer: BytesIO, subject: str, title: str) -> SimpleDocTemplate:
+    """
+    Creates the document template of the attendance sheets, with their page size and
+    margins
+
+    :param buffer: The buffer the PDF is written to
+    :param subject: The subject of the PDF
+    :param title: The title of the PDF
+    :return: The document template
+    :rtype: SimpleDocTemplate
+    """
+    return SimpleDocTemplate(
+        buffer,
+        pagesize=A4,
+        leftMargin=cm * 2,
+        rightMargin=cm * 2,
+        topMargin=cm * 1.5,
+        bottomMargin=cm * 2,
+        pageCompression=True,
+        invariant=True,
+        subject=subject,
+        title=title,
+    )
 
 
 @dataclass
@@ -39,6 +153,8 @@ class AttendanceSheetData:
         current_date (datetime): The creation date of the document.
         project_name (str): The name of the project.
         attendances (list[Attendance]): All Attendances of the current month
+        total_minutes (int | None): The total time of the attendances, in minutes, when it
+        is already known. If None, it is summed while the table is built
     """
 
     student_name: str
@@ -46,6 +162,7 @@ class AttendanceSheetData:
     current_date: datetime
     project_name: str
     attendances: list[Attendance]
+    total_minutes: int | None = None
 
 
 class AttendanceSheet:
@@ -55,18 +172,17 @@ class AttendanceSheet:
     Attributes:
         - data (AttendanceSheetData): The data for the attendance sheet.
         - content (list): List to store the content of the sheet.
-        - total_hours (timedelta): The total hours of the attendances
+        - total_minutes (int): The total time of the attendances, in minutes
 
     Methods:
         - generate(): Generates the attendance sheet.
+        - build_content(): Creates the flowables of the sheet, without building a document.
         - generate_header(): Sets up the header section of the sheet.
         - generate_upper_table(): Create the table with the student name, project name, etc.
         - generate_mid_table(): Create the attendances section.
         - generate_lower_table(): Create the total hours and signature section.
-        - _seconds_to_hours_minutes(seconds: float) -> tuple[int, int]:
-        Transforms the time in seconds to a tuple with (hours, minutes)
-        - _calc_time_difference(self, entry_time: time, exit_time: time):
-        Calculates the time difference between two moments
+        - _format_minutes(minutes: int) -> str:
+        Formats a number of minutes as "Hh Mm"
 
 
     """
@@ -81,26 +197,16 @@ class AttendanceSheet:
         """
         self.content = []
         self.data = data
-        self.total_hours = timedelta()
-
-    def _seconds_to_hours_minutes(self, seconds: float) -> tuple[int, int]:
-        """
-        Transforms the time in seconds to a tuple with (hours, minutes)
-        """
-        total_seconds = seconds
-        hours = int(total_seconds / 3600)
-        minutes = int((total_seconds % 3600) / 60)
-        return (hours, minutes)
+        self.total_minutes = 0
 
-    def _calc_time_difference(self, entry_time: time, exit_time: time) -> timedelta:
+    def _format_minutes(self, minutes: int) -> str:
         """
-        Calculates the time difference between two moments.
+        Formats a number of minutes as "Hh Mm"
         """
-        # Converting the time into datetime to calculate the difference
-        converted_entry_time = datetime.strptime(entry_time.isoformat(), "%H:%M:%S")
-        converted_exit_time = datetime.strptime(exit_time.isoformat(), "%H:%M:%S")
-        return converted_exit_time - converted_entry_time
+        hours, minutes = divmod(minutes, 60)
+        return f"{hours}h {minutes}m"
 
+    @cached_render
     def generate(self) -> bytes:
         """
         Generates the attendance sheet.
@@ -108,6 +214,7 @@ class AttendanceSheet:
         :return: The pdf bytes created by the function
         :rtype: bytes
         """
+        register_fonts("Calibri-Bold")
 
         month = MONTHS[self.data.current_date.month - 1]
         student_name = self.data.student_name
@@ -121,25 +228,23 @@ class AttendanceSheet:
         title += f"-{proj_name}"
 
         buffer = BytesIO()
-        doc = SimpleDocTemplate(
-            buffer,
-            pagesize=A4,
-            leftMargin=cm * 2,
-            rightMargin=cm * 2,
-            topMargin=cm * 1.5,
-            bottomMargin=cm * 2,
-            pageCompression=True,
-            subject=subject,
-            title=title,
-        )
+        doc = sheet_doc_template(buffer, subject, title)
+        doc.build(self.build_content())
+        return buffer.getvalue()
+
+    def build_content(self) -> list:
+        """
+        Creates the flowables of the sheet, without building a document, so several
+        sheets can be built in a single document
 
+        :return: The flowables of the sheet
+        :rtype: list
+        """
         self.content += self.generate_header()
         self.content.append(self.generate_upper_table())
         self.content.append(self.generate_mid_table())
         self.content.append(self.generate_lower_table())
-
-        doc.build(self.content)
-        return buffer.getvalue()
+        return self.content
 
     def generate_header(self) -> list:
         """
@@ -148,19 +253,11 @@ class AttendanceSheet:
         :return: List of all header contents
         :rtype: list
         """
-        header_content = []
-        header_content += setup_header()
-
-        header_content.append(Spacer(1, 12))
-
-        report_title = Paragraph(
-            "ANEXO VI  - FOLHA DE FREQUÊNCIA", style=styles.header_text_style
-        )
-
-        header_content.append(report_title)
-        header_content.append(Spacer(1, 12))
-
-        return header_content
+        return [
+            setup_static_header(
+                "attendance-sheet-header", "ANEXO VI  - FOLHA DE FREQUÊNCIA", 12, 12
+            )
+        ]
 
     def generate_upper_table(self) -> Table:
         """
@@ -184,26 +281,9 @@ class AttendanceSheet:
             ],
         ]
 
-        upper_table_style = TableStyle(
-            [
-                ("SPAN", (0, 0), (-1, 0)),
-                ("SPAN", (0, 2), (-1, 2)),
-                ("SPAN", (0, 3), (-1, 3)),
-                ("BOTTOMPADDING", (0, 0), (-1, -1), 1),
-                ("TOPPADDING", (0, 0), (-1, -1), 1),
-                ("GRID", (0, 0), (-1, 0), 0.5, colors.black),
-                ("GRID", (0, 2), (-1, 2), 0.5, colors.black),
-                ("GRID", (0, 3), (-1, 3), 0.5, colors.black),
-                ("BOX", (0, 1), (2, 1), 0.5, colors.black),
-                ("BOX", (-2, 1), (-1, 1), 0.5, colors.black),
-                ("LINEBELOW", (0, 1), (-1, 1), 1.5, colors.black),
-                ("ALIGN", (0, 0), (-1, 0), "CENTER"),
-            ]
-        )
-
         upper_table = Table(
             data=upper_table_data,
-            style=upper_table_style,
+            style=UPPER_TABLE_STYLE,
             colWidths=["60%", "20%", "20%"],
         )
 
@@ -217,17 +297,6 @@ class AttendanceSheet:
         :rtype: Table
         """
 
-        # Used later to convert datetime.weekday() to the correct weekday in portuguese
-        weekdays = [
-            "Segunda-feira",
-            "Terça-feira",
-            "Quarta-feira",
-            "Quinta-feira",
-            "Sexta-feira",
-            "Sábado",
-            "Domingo",
-        ]
-
         content = [
             [
                 # "Dia" is not a Paragraph just so pylint don't red my code
@@ -240,61 +309,40 @@ class AttendanceSheet:
             ]
         ]
 
-        # Gets the day of all the attendances
-        attendances_dates = [attendance.day.day for attendance in self.data.attendances]
+        # The attendance of each day. Each day has at most one attendance per
+        # project; if there are more, the first one is kept
+        attendances_by_day = {}
+        for attendance in reversed(self.data.attendances):
+            attendances_by_day[attendance.day.day] = attendance
 
-        # Recieves a tuple with the last weekday[0] and the last day[1] of the month
-        last_day = calendar.monthrange(
-            year=self.data.current_date.year, month=self.data.current_date.month
-        )
         # For each day in the month, verifies if there is an attendance
         # If yes, add the attendance's data into the table
-        for i in range(1, last_day[1] + 1):
-            line = [
-                f"{i}",
-                f"{weekdays[self.data.current_date.replace(day=i).weekday()]}",
-            ]
-
-            if i in attendances_dates:
-                index = attendances_dates.index(i)
-                entry_time = self.data.attendances[index].entry_time
-                exit_time = self.data.attendances[index].exit_time
-                # The program calculates the difference between the entry time and exit time
-                # to find the attendance time
-
-                difference = self._calc_time_difference(
-                    entry_time=entry_time, exit_time=exit_time
-                )
-                self.total_hours += difference
-                hours, minutes = self._seconds_to_hours_minutes(
-                    difference.total_seconds()
-                )
-
-                line += [
-                    f"{entry_time.strftime('%H:%M')}",
-                    f"{exit_time.strftime('%H:%M')}",
-                    f"{hours}h {minutes}m",
+        for day, weekday in month_calendar(
+            self.data.current_date.year, self.data.current_date.month
+        ):
+            attendance = attendances_by_day.get(int(day))
+            if attendance is None:
+                content.append([day, weekday])
+                continue
+
+            entry_time = attendance.entry_time
+            exit_time = attendance.exit_time
+            difference = attendance.minutes
+            self.total_minutes += difference
+
+            content.append(
+                [
+                    day,
+                    weekday,
+                    f"{entry_time.hour:02d}:{entry_time.minute:02d}",
+                    f"{exit_time.hour:02d}:{exit_time.minute:02d}",
+                    self._format_minutes(difference),
                 ]
-
-            content.append(line)
-
-        mid_table_style = TableStyle(
-            [
-                ("LEFTPADDING", (0, 0), (0, -1), 1),
-                ("RIGHTPADDING", (0, 0), (0, -1), 1),
-                ("TOPPADDING", (0, 0), (-1, 0), 0),
-                ("TOPPADDING", (0, 1), (-1, -1), 1),
-                ("BOTTOMPADDING", (0, 0), (-1, 0), 0),
-                ("BOTTOMPADDING", (0, 1), (-1, -1), 1),
-                ("GRID", (0, 0), (-1, -1), 0.5, colors.black),
-                ("ALIGN", (0, 0), (-1, -1), "CENTER"),
-                ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
-            ]
-        )
+            )
 
         mid_table = Table(
             data=content,
-            style=mid_table_style,
+            style=MID_TABLE_STYLE,
             colWidths=["5%", "25%", "15%", "15%", "15%", "30%"],
         )
 
@@ -307,34 +355,26 @@ class AttendanceSheet:
         :return: The footer of the table, with the signature and the total hours
         :rtype: Table
         """
-        hours, minutes = self._seconds_to_hours_minutes(
-            self.total_hours.total_seconds()
-        )
         content = [
-            ["", "", "Total de horas trabalhadas:", "", f"{hours}h {minutes}m", ""],
+            [
+                "",
+                "",
+                "Total de horas trabalhadas:",
+                "",
+                self._format_minutes(
+                    self.total_minutes
+                    if self.data.total_minutes is None
+                    else self.data.total_minutes
+                ),
+                "",
+            ],
             [],
             ["Assinatura do professor responsável", "", "", "", "", "Data: __/__/____"],
         ]
 
-        lower_table_style = TableStyle(
-            [
-                ("TOPPADDING", (0, 0), (-1, -1), 1),
-                ("BOTTOMPADDING", (0, 0), (-1, -1), 1),
-                ("SPAN", (2, 0), (3, 0)),
-                ("SPAN", (0, -1), (2, -1)),
-                ("SPAN", (3, -1), (4, -1)),
-                ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
-                ("BOX", (4, 0), (4, 0), 0.5, colors.black),
-                ("LINEABOVE", (0, 0), (-1, 0), 0.5, colors.black),
-                ("LINEBELOW", (3, -1), (4, -1), 0.5, colors.black),
-                ("ALIGN", (0, 0), (-1, -1), "CENTER"),
-                ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
-            ]
-        )
-
         lower_table = Table(
             data=content,
-            style=lower_table_style,
+            style=LOWER_TABLE_STYLE,
             colWidths=["5%", "25%", "15%", "15%", "15%", "30%"],
         )
 
@@ -0,0 +1,114 @@
+"""
+cache
+=====
+
+This module provides an in-memory cache of rendered reports.
+
+Reports are rendered in reportlab's invariant mode, so the same data always
+produces the same bytes. The cache is keyed by a hash of the report's data
+class and of the current date, since some reports print dates derived from
+the day they are generated.
+
+Classes:
+    - ReportCache: Least recently used cache of rendered reports.
+
+Functions:
+    - cached_render: Decorator that serves a report's generate() from the cache.
+
+Variables:
+    report_cache: The cache shared by all reports of the process.
+"""
+
+import functools
+import hashlib
+import threading
+from collections import OrderedDict
+from datetime import date
+
+import settings
+
+logger = settings.logging.getLogger(__name__)
+
+
+class ReportCache:
+    """
+    Least recently used cache of rendered reports, bounded by total size.
+
+    Attributes:
+        max_bytes (int): The maximum total size of the cached reports.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024) -> None:
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[str, bytes] = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(data) -> str:
+        """
+        Computes the cache key of a report's data.
+
+        :param data: The report's data class instance
+        :return: A SHA-256 hex digest of the data, its type and today's date
+        :rtype: str
+        """
+        content = f"{type(data).__qualname__}|{date.today().isoformat()}|{data!r}"
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> bytes | None:
+        """
+        Returns the cached report for the key, or None.
+        """
+        with self._lock:
+            content = self._entries.get(key)
+            if content is not None:
+                self._entries.move_to_end(key)
+            return content
+
+    def put(self, key: str, content: bytes) -> None:
+        """
+        Caches a rendered report, evicting the least recently used ones when
+        the cache is over its size limit.
+        """
+        if len(content) > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                return
+            self._entries[key] = content
+            self._size += len(content)
+            while self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+
+    def clear(self) -> None:
+        """
+        Removes every cached report.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+
+report_cache = ReportCache()
+
+
+def cached_render(generate):
+    """
+    Decorator for a report's generate() method. The report is rendered only
+    if no report with the same data was rendered today.
+    """
+
+    @functools.wraps(generate)
+    def wrapper(self) -> bytes:
+        key = report_cache.key(self.data)
+        content = report_cache.get(key)
+        if content is not None:
+            logger.info("%s served from cache", type(self).__name__)
+            return content
+        content = generate(self)
+        report_cache.put(key, content)
+        return content
+
+    return wrapper
@@ -3,14 +3,155 @@ commons.py
 
 Unifies functions used by different reports in a single place
 
+The logo and the header and signature paragraphs are the same in every
+report, so they are loaded and built once per process and copied on each
+render.
+
+The fixed parts of a report are wrapped in a StaticBlock: they are laid out
+once per process and drawn from a PDF form XObject, so each render only lays
+out the per-student content.
+
+Classes:
+ - StaticBlock: Flowable that draws a fixed group of flowables from a form XObject
+
 Functions:
+ - load_logo: Read the logo file once and return its bytes
  - setup_header: Create the header of the report and return it to the caller
+ - setup_static_header: Create a report type's header, with its title, as a StaticBlock
+ - setup_signature_section: Create the signature table of the report
 """
 
-from reportlab.platypus import Image, Paragraph, Spacer, Table
+import threading
+from collections.abc import Callable
+from copy import copy
+from functools import lru_cache
+from io import BytesIO
+
+from reportlab.platypus import Flowable, Image, Paragraph, Spacer, Table
 
 from . import styles
 
+LOGO_PATH = "./assets/img/logo_federal.jpg"
+
+
+class StaticBlock(Flowable):
+    """
+    Flowable for the fixed parts of a report, such as the header.
+
+    The flowables returned by ``build`` are laid out once per block name and
+    available width, and the cached layout is shared by every render in the
+    process. In each document they are drawn once into a form XObject, which
+    the page then references. The space before the first flowable is
+    ignored, as a frame does at the top of a page.
+
+    Attributes:
+        name (str): Unique name of the block, also used for the form name.
+        build (Callable[[], list]): Builds the flowables of the block.
+    """
+
+    _layouts = {}
+    _lock = threading.Lock()
+
+    def __init__(self, name: str, build: Callable[[], list]) -> None:
+        super().__init__()
+        self.name = name
+        self.build = build
+        self._layout = None
+
+    def _get_layout(self, avail_width: float) -> tuple[float, float, list]:
+        """
+        Lays out the block's flowables like a frame would, stacking them and
+        collapsing the space between them. Returns the height, the space
+        after the block and the position of each flowable.
+        """
+        key = (self.name, avail_width)
+        with self._lock:
+            layout = self._layouts.get(key)
+            if layout is None:
+                flowables = self.build()
+                placements = []
+                height = 0
+                space_after = 0
+                for index, flowable in enumerate(flowables):
+                    width, flowable_height = flowable.wrap(avail_width, 1e6)
+                    if index:
+                        height += max(space_after, flowable.getSpaceBefore())
+                    height += flowable_height
+                    placements.append((flowable, height, avail_width - width))
+                    space_after = flowable.getSpaceAfter()
+                layout = (height, space_after, placements)
+                self._layouts[key] = layout
+        return layout
+
+    def wrap(self, availWidth, availHeight):
+        self._layout = self._get_layout(availWidth)
+        self.width = availWidth
+        self.height = self._layout[0]
+        return self.width, self.height
+
+    def getSpaceAfter(self):
+        return self._layout[1] if self._layout else 0
+
+    def draw(self):
+        """
+        Draws the block from its form XObject, defining the form the first
+        time the block is drawn in the document.
+        """
+        form_name = f"{self.name}-{self.width:g}"
+        with self._lock:
+            if not self.canv.hasForm(form_name):
+                self.canv.beginForm(form_name, 0, 0, self.width, self.height)
+                for flowable, bottom, free_width in self._layout[2]:
+                    flowable.drawOn(self.canv, 0, self.height - bottom, _sW=free_width)
+                self.canv.endForm()
+        self.canv.doForm(form_name)
+
+
+@lru_cache(maxsize=None)
+def load_logo() -> bytes:
+    """
+    Reads the logo file. The bytes are cached for the lifetime of the process.
+
+    :returns: The JPEG bytes of the logo
+    :rtype: bytes
+    """
+    with open(LOGO_PATH, "rb") as file:
+        return file.read()
+
+
+@lru_cache(maxsize=None)
+def _header_paragraphs() -> tuple[Paragraph, Paragraph, Paragraph]:
+    """
+    Builds the header paragraphs once. Callers must copy them before use.
+    """
+    return (
+        Paragraph("MINISTÉRIO DA EDUCAÇÃO", styles.header_text_style),
+        Paragraph(
+            "INSTITUTO FEDERAL DE EDUCAÇÃO, CIÊNCIA E TECNOLOGIA DE SÃO PAULO",
+            styles.header_text_style,
+        ),
+        Paragraph(
+            "EDITAL Nº SPO.009, DE 1º DE FEVEREIRO DE 2023", styles.header_text_style
+        ),
+    )
+
+
+@lru_cache(maxsize=None)
+def _signature_paragraphs() -> tuple[tuple[Paragraph, Paragraph], ...]:
+    """
+    Builds the signature paragraphs once. Callers must copy them before use.
+    """
+    return (
+        (
+            Paragraph("__________________________", styles.signature_content_style),
+            Paragraph("__________________________", styles.signature_content_style),
+        ),
+        (
+            Paragraph("Voluntário(a)", styles.signature_content_style),
+            Paragraph("Professor(a) Responsável", styles.signature_content_style),
+        ),
+    )
+
 
 def setup_header() -> list:
     """
@@ -22,46 +163,55 @@ def setup_header() -> list:
 
     content = []
 
-    logo = Image("./assets/img/logo_federal.jpg", width=75, height=75)
+    logo = Image(BytesIO(load_logo()), width=75, height=75)
     logo.hAlign = "CENTER"
     content.append(logo)
 
-    header_title = Paragraph("MINISTÉRIO DA EDUCAÇÃO", styles.header_text_style)
-    content.append(header_title)
-
-    sub_header_title = Paragraph(
-        "INSTITUTO FEDERAL DE EDUCAÇÃO, CIÊNCIA E TECNOLOGIA DE SÃO PAULO",
-        styles.header_text_style,
-    )
-    content.append(sub_header_title)
+    header_title, sub_header_title, notice_title = _header_paragraphs()
+    content.append(copy(header_title))
+    content.append(copy(sub_header_title))
     content.append(Spacer(1, 8))
-
-    notice_title = Paragraph(
-        "EDITAL Nº SPO.009, DE 1º DE FEVEREIRO DE 2023", styles.header_text_style
-    )
-    content.append(notice_title)
+    content.append(copy(notice_title))
 
     return content
 
 
-def setup_signature_section():
+def setup_static_header(
+    name: str, title: str, space_before: float, space_after: float
+) -> StaticBlock:
     """
-    Sets up the signature section of the report.
+    Sets up the header of a report type, with its title, as a StaticBlock.
+
+    :param name: Unique name of the report type's header
+    :param title: The report title, below the institutional header
+    :param space_before: Space between the institutional header and the title
+    :param space_after: Space between the title and the report content
+    :returns: The report header
+    :rtype: StaticBlock
     """
-    content = []
 
+    def build() -> list:
+        return setup_header() + [
+            Spacer(1, space_before),
+            Paragraph(title, styles.header_text_style),
+            Spacer(1, space_after),
+        ]
+
+    return StaticBlock(name, build)
+
+
+def _build_signature_table() -> list:
+    """
+    Builds the signature table from copies of the cached paragraphs.
+    """
     signature_data = [
-        [
-            Paragraph("__________________________", styles.signature_content_style),
-            Paragraph("__________________________", styles.signature_content_style),
-        ],
-        [
-            Paragraph("Voluntário(a)", styles.signature_content_style),
-            Paragraph("Professor(a) Responsável", styles.signature_content_style),
-        ],
+        [copy(paragraph) for paragraph in row] for row in _signature_paragraphs()
     ]
+    return [Table(signature_data, colWidths=["50%", "50%"])]
 
-    signature_table = Table(signature_data, colWidths=["50%", "50%"])
-    content.append(signature_table)
 
-    return content
+def setup_signature_section():
+    """
+    Sets up the signature section of the report.
+    """
+    return [StaticBlock("signature", _build_signature_table)]
@@ -0,0 +1,89 @@
+"""
+    Log Export
+
+Streams the log entries selected by a LogReportData as gzip-compressed CSV or
+NDJSON, for coordinators who analyze the logs in a spreadsheet instead of
+reading the PDF.
+"""
+
+import csv
+import gzip
+import io
+import json
+from collections.abc import Iterator
+from io import BytesIO
+
+from .log_report import LogReportData
+
+EXPORT_FORMATS = ("csv", "ndjson")
+
+
+class LogExport:
+    """
+    Class to export log entries as a compressed CSV or NDJSON file.
+
+    Attributes:
+    - data: An instance of LogReportData containing the report data.
+    - export_format: Either "csv" or "ndjson".
+    - filename: The name of the file sent to Discord.
+    """
+
+    fieldnames = ["project_id", "registration", "discord_id", "name", "date", "action"]
+
+    def __init__(self, data: LogReportData, export_format: str) -> None:
+        self.data = data
+        self.export_format = export_format
+        self.filename = f"log.{export_format}.gz"
+        self._content = None
+
+    def rows(self) -> Iterator[dict]:
+        """
+        Yields the selected log entries, in file order, as dictionaries.
+
+        The logs are consumed in a single pass, so ``data.logs`` may be a
+        generator reading the logs file.
+        """
+        registrations = {
+            participation.registration
+            for participation in self.data.participations
+            if participation.project_id == str(self.data.project_id)
+        }
+        names = {
+            member.registration: member.name
+            for member in self.data.members
+            if member.registration in registrations
+        }
+
+        for log in self.data.logs:
+            if log.registration in registrations and self.data.log_matches(log):
+                yield {
+                    "project_id": log.project_id,
+                    "registration": log.registration,
+                    "discord_id": log.discord_id,
+                    "name": names.get(log.registration, ""),
+                    "date": log.date,
+                    "action": log.action,
+                }
+
+    def generate(self) -> bytes:
+        """
+        Writes the selected rows straight into a gzip stream.
+        Returns the compressed file as bytes.
+        """
+        if self._content is not None:
+            return self._content
+
+        buffer = BytesIO()
+        with gzip.GzipFile(fileobj=buffer, mode="wb", mtime=0) as gzip_file:
+            with io.TextIOWrapper(gzip_file, encoding="utf-8", newline="") as text:
+                if self.export_format == "csv":
+                    writer = csv.DictWriter(text, fieldnames=self.fieldnames)
+                    writer.writeheader()
+                    writer.writerows(self.rows())
+                else:
+                    for row in self.rows():
+                        text.write(json.dumps(row, ensure_ascii=False))
+                        text.write("\n")
+
+        self._content = buffer.getvalue()
+        return self._content
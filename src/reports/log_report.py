@@ -2,6 +2,7 @@
     Log Report
 """
 
+from collections.abc import Iterable
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from io import BytesIO
@@ -11,8 +12,21 @@ from reportlab.platypus import Paragraph, SimpleDocTemplate
 
 from data import Log, Member, Participation
 
+from .setup import register_fonts
 from .styles import events_header_style, events_text_style
 
+# Fitted against real renders of synthetic reports from 200 to 10000 rows of 60
+# to 1000 characters each (50 KB to 1 MB), as a lower bound: the base is mostly
+# the embedded font subsets, and the per row and per character costs are the
+# ones of the rows that compress best, a single message repeated on every row.
+# On those the estimate is within 16% below the rendered size; chat-like text
+# renders up to 2.7 times larger and random strings up to 3.6 times larger. The
+# estimate is only used to reject requests, never to accept them without
+# rendering, so it must not overshoot.
+ESTIMATE_BASE_BYTES = 45_000
+ESTIMATE_BYTES_PER_ROW = 2.0
+ESTIMATE_BYTES_PER_CHARACTER = 0.165
+
 
 @dataclass
 # pylint: disable=too-many-instance-attributes
@@ -22,7 +36,8 @@ class LogReportData:
 
     Attributes:
     - students: A list of dictionaries representing student data.
-    - logs: A list of dictionaries representing log data.
+    - logs: The log entries. The PDF report walks them once per participation,
+      so it needs a list; the exports accept any iterable.
     - project_id: The project ID for filtering students.
     - value: An integer indicating the type of report to generate.
     - start_date: The start date for filtering log entries.
@@ -32,13 +47,33 @@ class LogReportData:
 
     members: list[Member]
     participations: list[Participation]
-    logs: list[Log]
+    logs: Iterable[Log]
     project_id: str
     value: int
     start_date: datetime
     end_date: datetime
     discord_id: int
 
+    def log_matches(self, log: Log) -> bool:
+        """
+        Checks if a log entry passes the project, student and date filters
+        selected by ``value``.
+
+        Args:
+        - log: The log entry to check.
+
+        Returns:
+        - True if the entry belongs to the report, False otherwise.
+        """
+        if log.project_id != self.project_id:
+            return False
+        if self.value in (3, 4) and log.discord_id != self.discord_id:
+            return False
+        if self.value in (2, 4):
+            log_date = datetime.strptime(log.date, "%d/%m/%Y %H:%M")
+            return self.start_date <= log_date <= self.end_date + timedelta(days=1)
+        return True
+
 
 class LogReport:
     """
@@ -47,182 +82,100 @@ class LogReport:
     Attributes:
     - content: A list to store the content of the generated report.
     - data: An instance of LogReportData containing the report data.
+    - filename: The name of the file sent to Discord.
     """
 
+    filename = "log.pdf"
+
     def __init__(self, data: LogReportData) -> None:
         self.content = []
         self.data = data
+        self._entries = None
+        self._pdf = None
 
     def generate(self) -> bytes:
         """
         Generates the log report based on the provided data.
         Returns the generated report as bytes.
+
+        The document is built only once; later calls return the same bytes.
         """
+        if self._pdf is not None:
+            return self._pdf
+
+        register_fonts("Calibri-Bold", "Segoe")
+
         buffer = BytesIO()
         doc = SimpleDocTemplate(buffer, pagesize=A4)
 
-        if self.data.value == 1:
-            self.generate_default_report()
-        elif self.data.value == 2:
-            self.generate_date_report()
-        elif self.data.value == 3:
-            self.generate_id_report()
-        else:
-            self.generate_id_and_date_report()
+        self.content = [Paragraph("Log File", events_header_style)]
+        for names, logs in self.select_entries():
+            self.content.extend(
+                [Paragraph(name, events_header_style) for name in names]
+            )
+            self.content.extend(
+                [Paragraph(log.action, events_text_style) for log in logs]
+            )
 
         doc.build(self.content)
-        return buffer.getvalue()
-
-    def generate_default_report(self):
-        """
-        Generates a default report for all students and logs.
+        self._pdf = buffer.getvalue()
+        return self._pdf
 
-        This method adds a title to the report and iterates over
-        the student and log data to include relevant information
-        in the report content.
+    def select_entries(self) -> list[tuple[list[str], list[Log]]]:
         """
+        Selects what goes into the report, without building any flowable.
 
-        title_report = Paragraph("Log File", events_header_style)
-        self.content.append(title_report)
+        For each participation in the project, in file order, returns the
+        names of the matching members and their log entries. When the report
+        is filtered by student (``value`` 3 or 4), only that student's
+        members and entries are kept.
 
-        for participation in self.data.participations:
-            if participation.project_id == str(self.data.project_id):
-                members = [
-                    member
-                    for member in self.data.members
-                    if (participation.registration == member.registration)
-                ]
-                self.content.extend(
-                    [Paragraph(member.name, events_header_style) for member in members]
-                )
-
-                logs = [
-                    log
-                    for log in self.data.logs
-                    if (
-                        log.registration == participation.registration
-                        and log.project_id == self.data.project_id
-                    )
-                ]
-                self.content.extend(
-                    [Paragraph(log.action, events_text_style) for log in logs]
-                )
-
-    def generate_date_report(self):
-        """
-        Generates a report for a specific date range.
-
-        This method adds a titled based on the specified date range,
-        filters the student and log data based on the project ID,
-        and includes relevant log entries in the report content.
+        Returns:
+        - A list of (member names, logs) pairs.
         """
+        if self._entries is not None:
+            return self._entries
 
-        title_report = Paragraph("Log File", events_header_style)
-        self.content.append(title_report)
+        logs_by_registration = {}
+        for log in self.data.logs:
+            if self.data.log_matches(log):
+                logs_by_registration.setdefault(log.registration, []).append(log)
 
+        by_student = self.data.value in (3, 4)
+        self._entries = []
         for participation in self.data.participations:
-            if participation.project_id == str(self.data.project_id):
-                members = [
-                    member
-                    for member in self.data.members
-                    if (participation.registration == member.registration)
-                ]
-                self.content.extend(
-                    [Paragraph(member.name, events_header_style) for member in members]
-                )
-
-                logs = [
-                    log
-                    for log in self.data.logs
-                    if (
-                        log.registration == participation.registration
-                        and log.project_id == self.data.project_id
-                        and self.data.start_date
-                        <= datetime.strptime(log.date, "%d/%m/%Y %H:%M")
-                        <= self.data.end_date + timedelta(days=1)
-                    )
-                ]
-                self.content.extend(
-                    [Paragraph(log.action, events_text_style) for log in logs]
-                )
-
-    def generate_id_report(self):
+            if participation.project_id != str(self.data.project_id):
+                continue
+            names = [
+                member.name
+                for member in self.data.members
+                if participation.registration == member.registration
+                and (not by_student or member.discord_id == self.data.discord_id)
+            ]
+            logs = logs_by_registration.get(participation.registration, [])
+            self._entries.append((names, logs))
+        return self._entries
+
+    def estimate_size(self) -> int:
         """
-        Generates a report for a specific student ID.
+        Estimates the size in bytes of the final PDF from the number and the
+        total length of the selected rows, before any rendering.
 
-        This method adds a title to the report, filters the student
-        data based on the project ID and student ID, and includes
-        relevant log entries in the report content.
-        """
-
-        title_report = Paragraph("Log File", events_header_style)
-        self.content.append(title_report)
+        The coefficients were fitted against real renders of synthetic logs as a
+        lower bound of the size (see the ``ESTIMATE_*`` constants).
 
-        for participation in self.data.participations:
-            if participation.project_id == self.data.project_id:
-                members = [
-                    member
-                    for member in self.data.members
-                    if (
-                        participation.registration == member.registration
-                        and member.discord_id == self.data.discord_id
-                    )
-                ]
-                self.content.extend(
-                    [Paragraph(member.name, events_header_style) for member in members]
-                )
-
-                logs = [
-                    log
-                    for log in self.data.logs
-                    if (
-                        log.registration == participation.registration
-                        and log.project_id == self.data.project_id
-                        and log.discord_id == self.data.discord_id
-                    )
-                ]
-                self.content.extend(
-                    [Paragraph(log.action, events_text_style) for log in logs]
-                )
-
-    def generate_id_and_date_report(self):
+        Returns:
+        - The estimated size of the PDF in bytes.
         """
-        Generates a report for a specific student ID and date range.
-
-        This method adds a title based on the specified date range,
-        filters the student data based on the project ID and student ID,
-        and includes relevant log entries in the report content.
-        """
-
-        title_report = Paragraph("Log File", events_header_style)
-        self.content.append(title_report)
-
-        for participation in self.data.participations:
-            if participation.project_id == self.data.project_id:
-                members = [
-                    member
-                    for member in self.data.members
-                    if (
-                        participation.registration == member.registration
-                        and member.discord_id == self.data.discord_id
-                    )
-                ]
-                self.content.extend(
-                    [Paragraph(member.name, events_header_style) for member in members]
-                )
-
-                logs = [
-                    log
-                    for log in self.data.logs
-                    if (
-                        log.registration == participation.registration
-                        and log.project_id == self.data.project_id
-                        and log.discord_id == self.data.discord_id
-                        and self.data.start_date
-                        <= datetime.strptime(log.date, "%d/%m/%Y %H:%M")
-                        <= self.data.end_date + timedelta(days=1)
-                    )
-                ]
-                self.content.extend(
-                    [Paragraph(log.action, events_text_style) for log in logs]
-                )
+        rows = 1
+        characters = len("Log File")
+        for names, logs in self.select_entries():
+            rows += len(names) + len(logs)
+            characters += sum(len(name) for name in names)
+            characters += sum(len(log.action) for log in logs)
+
+        return int(
+            ESTIMATE_BASE_BYTES
+            + ESTIMATE_BYTES_PER_ROW * rows
+            + ESTIMATE_BYTES_PER_CHARACTER * characters
+        )
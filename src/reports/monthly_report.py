@@ -10,25 +10,18 @@ Classes:
 
 """
 
-import locale
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from io import BytesIO
 
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import A4
-from reportlab.platypus import (
-    Image,
-    Paragraph,
-    SimpleDocTemplate,
-    Spacer,
-    Table,
-    TableStyle,
-)
+from reportlab.platypus import Paragraph, SimpleDocTemplate, Table, TableStyle
 
 from . import styles
-
-locale.setlocale(locale.LC_TIME, "pt_BR.UTF-8")
+from .cache import cached_render
+from .commons import setup_signature_section, setup_static_header
+from .setup import register_fonts
 
 
 @dataclass
@@ -93,6 +86,7 @@ class MonthlyReport:
         self.data = data
         self.content = []
 
+    @cached_render
     def generate(self):
         """
         Generates the monthly report.
@@ -101,6 +95,7 @@ class MonthlyReport:
             bytes: The generated report in bytes format.
 
         """
+        register_fonts("Calibri", "Calibri-Bold")
 
         buffer = BytesIO()
         doc = SimpleDocTemplate(
@@ -111,6 +106,7 @@ class MonthlyReport:
             topMargin=57,
             bottomMargin=57,
             pageCompression=True,
+            invariant=True,
         )
         self.setup_header()
         self.setup_report_table()
@@ -124,32 +120,14 @@ class MonthlyReport:
         Sets up the header section of the report.
 
         """
-        logo = Image("./assets/img/logo_federal.jpg", width=75, height=75)
-        logo.hAlign = "CENTER"
-        self.content.append(logo)
-
-        header_title = Paragraph("MINISTÉRIO DA EDUCAÇÃO", styles.header_text_style)
-        self.content.append(header_title)
-
-        sub_header_title = Paragraph(
-            "INSTITUTO FEDERAL DE EDUCAÇÃO, CIÊNCIA E TECNOLOGIA DE SÃO PAULO",
-            styles.header_text_style,
-        )
-        self.content.append(sub_header_title)
-        self.content.append(Spacer(1, 8))
-
-        notice_title = Paragraph(
-            "EDITAL Nº SPO.009, DE 1º DE FEVEREIRO DE 2023", styles.header_text_style
-        )
-        self.content.append(notice_title)
-        self.content.append(Spacer(1, 8))
-
-        report_title = Paragraph(
-            "ANEXO IV- RELATÓRIO MENSAL DE FREQUÊNCIA E AVALIAÇÃO – 2023",
-            styles.header_text_style,
+        self.content.append(
+            setup_static_header(
+                "monthly-report-header",
+                "ANEXO IV- RELATÓRIO MENSAL DE FREQUÊNCIA E AVALIAÇÃO – 2023",
+                8,
+                18,
+            )
         )
-        self.content.append(report_title)
-        self.content.append(Spacer(1, 18))
 
     def setup_report_table(self):
         """
@@ -259,16 +237,4 @@ class MonthlyReport:
         Sets up the signature section of the report.
 
         """
-        signature_data = [
-            [
-                Paragraph("__________________________", styles.signature_content_style),
-                Paragraph("__________________________", styles.signature_content_style),
-            ],
-            [
-                Paragraph("Voluntário(a)", styles.signature_content_style),
-                Paragraph("Professor(a) Responsável", styles.signature_content_style),
-            ],
-        ]
-
-        signature_table = Table(signature_data, colWidths=["50%", "50%"])
-        self.content.append(signature_table)
+        self.content += setup_signature_section()
@@ -9,19 +9,18 @@ Classes:
     - SemesterReport: Class for generating a semester report.
 
 """
-import locale
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from io import BytesIO
 
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import A4
-from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+from reportlab.platypus import Paragraph, SimpleDocTemplate, Table, TableStyle
 
 from . import styles
-from .commons import setup_header
-
-locale.setlocale(locale.LC_TIME, "pt_BR.UTF-8")
+from .cache import cached_render
+from .commons import setup_signature_section, setup_static_header
+from .setup import register_fonts
 
 
 @dataclass
@@ -100,6 +99,7 @@ class SemesterReport:
         if current_month == 12:
             return "2º"
 
+    @cached_render
     def generate(self):
         """
         Generates the semester report.
@@ -108,6 +108,7 @@ class SemesterReport:
             bytes: The generated report in bytes format.
 
         """
+        register_fonts("Calibri", "Calibri-Bold")
 
         semester = self.current_semester()
         student_name = self.data.student_name
@@ -128,6 +129,7 @@ class SemesterReport:
             topMargin=57,
             bottomMargin=57,
             pageCompression=True,
+            invariant=True,
             title=title,
             subject=subject,
         )
@@ -146,20 +148,14 @@ class SemesterReport:
         :return: List of all header contents
         :rtype: list
         """
-        header_content = []
-        header_content += setup_header()
-
-        header_content.append(Spacer(1, 12))
-
-        report_title = Paragraph(
-            "ANEXO IV- RELATÓRIO SEMESTRAL DE FREQUÊNCIA E AVALIAÇÃO – 2023",
-            styles.header_text_style,
-        )
-
-        header_content.append(report_title)
-        header_content.append(Spacer(1, 12))
-
-        return header_content
+        return [
+            setup_static_header(
+                "semester-report-header",
+                "ANEXO IV- RELATÓRIO SEMESTRAL DE FREQUÊNCIA E AVALIAÇÃO – 2023",
+                12,
+                12,
+            )
+        ]
 
     def setup_report_table(self):
         """
@@ -279,16 +275,4 @@ class SemesterReport:
         Sets up the signature section of the report.
 
         """
-        signature_data = [
-            [
-                Paragraph("__________________________", styles.signature_content_style),
-                Paragraph("__________________________", styles.signature_content_style),
-            ],
-            [
-                Paragraph("Voluntário(a)", styles.signature_content_style),
-                Paragraph("Professor(a) Responsável", styles.signature_content_style),
-            ],
-        ]
-
-        signature_table = Table(signature_data, colWidths=["50%", "50%"])
-        self.content.append(signature_table)
+        self.content += setup_signature_section()
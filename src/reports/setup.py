@@ -2,53 +2,175 @@
 setup
 =======================
 
-This module provides functions for setting up the report module 
+This module provides functions for setting up the report module
 and registering the required fonts for PDF reports.
 
+The setup runs once, when the first report class is accessed, instead of
+when the reports package is imported. The fonts aren't part of it: each report
+registers the fonts it uses when it is generated, with register_fonts.
+
+Parsing a TTF file is slow, so the parsed font metrics are cached on disk in
+FONT_CACHE_DIR_PATH. The cache of a font is only used if the font file and the
+reportlab version are the same as when it was written, so later process starts
+and the pool workers skip the parsing.
+
 Functions:
-    - setup_reports_module(): Set up the report module and register fonts for PDF reports.
-    - _register_fonts(): Register specific fonts using the pdfmetrics module.
+    - setup_reports_module(): Set up the report module.
+    - register_fonts(*font_names): Register the fonts, if they aren't registered yet.
+    - _load_font(font_name): Load a font from the cache, or parse and cache it.
+
+Variables:
+    - FONT_FILES (dict[str, str]): The TTF file of each font, by font name.
+    - FONT_CACHE_DIR_PATH (str): The directory of the cached font metrics.
 
 """
+import locale
+import os
+import pickle
+import threading
+from weakref import WeakKeyDictionary
+
+import reportlab
 from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
+from reportlab.pdfbase.ttfonts import TTFont, TTFontFace
 
 import settings
+from utils import timed
 
 logger = settings.logging.getLogger(__name__)
 
+FONT_FILES = {
+    "Calibri": "./assets/fonts/calibri/calibri-regular.ttf",
+    "Calibri-Bold": "./assets/fonts/calibri/calibri-bold.ttf",
+    "Calibri-Italic": "./assets/fonts/calibri/calibri-italic.ttf",
+    "Calibri-Bold-Italic": "./assets/fonts/calibri/calibri-bold-italic.ttf",
+    "Segoe": "./assets/fonts/segoe/segoe-ui-emoji.ttf",
+}
+FONT_CACHE_DIR_PATH = "assets/data/font_cache"
+
+_SETUP_LOCK = threading.Lock()
+_SETUP_DONE = threading.Event()
+_FONTS_LOCK = threading.Lock()
+
 
 def setup_reports_module():
     """
-    Set up the report module and register fonts for PDF reports.
+    Set up the report module.
 
-    This function initiates the setup of the report module by registering
-    the required fonts using the pdfmetrics module.
-    It calls the _register_fonts() function internally to register specific fonts.
+    This function sets the locale used for the month names in the reports.
+    Calling it again does nothing.
     """
-    logger.info("starting the setup of the reports module")
-    _register_fonts()
-    logger.info("report module setup done")
+    with _SETUP_LOCK:
+        if _SETUP_DONE.is_set():
+            return
 
+        logger.info("starting the setup of the reports module")
+        locale.setlocale(locale.LC_TIME, "pt_BR.UTF-8")
+        _SETUP_DONE.set()
+        logger.info("report module setup done")
 
-def _register_fonts():
+
+def register_fonts(*font_names: str):
     """
-    Register specific fonts using the pdfmetrics module.
+    Register the fonts using the pdfmetrics module, if they aren't registered yet.
+
+    :param font_names: The names of the fonts, keys of FONT_FILES.
+    :type font_names: str
+    """
+    with _FONTS_LOCK:
+        registered = set(pdfmetrics.getRegisteredFontNames())
+        for font_name in font_names:
+            if font_name not in registered:
+                with timed(f"{font_name} font registration"):
+                    pdfmetrics.registerFont(_load_font(font_name))
+
+
+def _cache_key(font_path: str) -> tuple:
+    """
+    The key that tells if a cached font is still valid
+
+    :param font_path: The path of the TTF file.
+    :type font_path: str
+    :return: The reportlab version, and the size and modification time of the file.
+    :rtype: tuple
+    """
+    stat = os.stat(font_path)
+    return (reportlab.Version, stat.st_size, stat.st_mtime_ns)
+
 
-    This function registers the Calibri font and its variations by specifying
-    the font name and the corresponding font file path.
+def _load_font(font_name: str) -> TTFont:
     """
-    pdfmetrics.registerFont(
-        TTFont("Calibri", "./assets/fonts/calibri/calibri-regular.ttf")
-    )
-    pdfmetrics.registerFont(
-        TTFont("Calibri-Bold", "./assets/fonts/calibri/calibri-bold.ttf")
-    )
-    pdfmetrics.registerFont(
-        TTFont("Calibri-Italic", "./assets/fonts/calibri/calibri-italic.ttf")
-    )
-    pdfmetrics.registerFont(
-        TTFont("Calibri-Bold-Italic", "./assets/fonts/calibri/calibri-bold-italic.ttf")
-    )
-    pdfmetrics.registerFont(TTFont("Segoe", "./assets/fonts/segoe/segoe-ui-emoji.ttf"))
-    logger.info("register fonts executed")
+    Load a font from the cache, or parse its TTF file and cache it.
+
+    The font's per-document state and the face's scale function can't be pickled,
+    so they are left out of the cache and created again when it's loaded.
+
+    :param font_name: The name of the font, a key of FONT_FILES.
+    :type font_name: str
+    :return: The loaded font.
+    :rtype: TTFont
+    """
+    font_path = FONT_FILES[font_name]
+    cache_path = os.path.join(FONT_CACHE_DIR_PATH, f"{font_name}.pickle")
+    key = _cache_key(font_path)
+
+    try:
+        with open(cache_path, "rb") as file:
+            cached_key, font_state, face_state = pickle.load(file)
+        if cached_key == key:
+            return _restore_font(font_state, face_state)
+    except (OSError, EOFError, pickle.UnpicklingError, ValueError, AttributeError):
+        pass
+
+    font = TTFont(font_name, font_path)
+    font_state = {
+        name: value
+        for name, value in vars(font).items()
+        if name not in ("face", "state")
+    }
+    face_state = {
+        name: value for name, value in vars(font.face).items() if not callable(value)
+    }
+    face_state["_has_pdf_scale"] = hasattr(font.face, "_pdfScale")
+
+    try:
+        os.makedirs(FONT_CACHE_DIR_PATH, exist_ok=True)
+        temp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(temp_path, "wb") as file:
+            pickle.dump((key, font_state, face_state), file, pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, cache_path)
+    except OSError as error:
+        logger.warning("Could not cache the %s font: %s", font_name, error)
+
+    return font
+
+
+def _restore_font(font_state: dict, face_state: dict) -> TTFont:
+    """
+    Create a font from its cached state, without parsing its TTF file.
+
+    :param font_state: The attributes of the font, except its face and state.
+    :type font_state: dict
+    :param face_state: The attributes of the font's face, except functions.
+    :type face_state: dict
+    :return: The restored font.
+    :rtype: TTFont
+    """
+    has_pdf_scale = face_state.pop("_has_pdf_scale")
+
+    face = TTFontFace.__new__(TTFontFace)
+    face.__dict__.update(face_state)
+    if has_pdf_scale:
+        units_per_em = face.unitsPerEm
+        if units_per_em == 1000:
+            face._pdfScale = lambda x: x  # pylint: disable=protected-access
+        else:
+            multiplier = 1000 / units_per_em
+            # pylint: disable-next=protected-access
+            face._pdfScale = lambda x: x * multiplier
+
+    font = TTFont.__new__(TTFont)
+    font.__dict__.update(font_state)
+    font.face = face
+    font.state = WeakKeyDictionary()
+    return font
@@ -6,18 +6,17 @@ file with the termination statement and his form.
 
 """
 
-import locale
 from dataclasses import dataclass
 from datetime import datetime
 from io import BytesIO
 
 from reportlab.lib.pagesizes import A4
-from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer
+from reportlab.platypus import Paragraph, SimpleDocTemplate
 
 from . import styles
-from .commons import setup_header, setup_signature_section
-
-locale.setlocale(locale.LC_TIME, "pt_BR.UTF-8")
+from .cache import cached_render
+from .commons import setup_signature_section, setup_static_header
+from .setup import register_fonts
 
 MONTHS = [
     "janeiro",
@@ -83,12 +82,15 @@ class TerminationStatement:
         self.content = []
         self.data = data
 
+    @cached_render
     def generate(self):
         """
         Generates the termination statement.
 
         Returns the bytes of the generated termination statement
         """
+        register_fonts("Calibri", "Calibri-Bold")
+
         student_name = self.data.student_name
         student_code = self.data.student_code
         project_name = self.data.project_name
@@ -107,6 +109,7 @@ class TerminationStatement:
             topMargin=57,
             bottomMargin=57,
             pageCompression=True,
+            invariant=True,
         )
 
         self.content += self.create_header()
@@ -125,20 +128,14 @@ class TerminationStatement:
         :return: list of all header contents
         :rtype: list
         """
-        header_content = []
-        header_spacer = Spacer(1, 10)
-        header_content += setup_header()
-        header_content.append(header_spacer)
-
-        report_title = Paragraph(
-            "ANEXO VII - TERMO DE ENCERRAMENTO DE PARTICIPAÇÃO EM PROJETO DE ENSINO",
-            style=styles.header_text_style,
-        )
-
-        header_content.append(report_title)
-        header_content.append(header_spacer)
-
-        return header_content
+        return [
+            setup_static_header(
+                "termination-statement-header",
+                "ANEXO VII - TERMO DE ENCERRAMENTO DE PARTICIPAÇÃO EM PROJETO DE ENSINO",
+                10,
+                10,
+            )
+        ]
 
     def create_date_text(self):
         """
@@ -19,6 +19,7 @@ from .coordinator_service import (
 from .log_service import (
     IdDoesNotExist,
     IncorrectDateFilter,
+    InvalidExportFormat,
     InvalidReportSize,
     LogService,
     NoStartDate,
@@ -42,7 +43,22 @@ from .project_service import (
     ProjectAlreadyExists,
     ProjectService,
 )
+from .reload_service import ReloadResult, ReloadService
+from .report_scheduler import (
+    JobStats,
+    Priority,
+    ReportJob,
+    ReportScheduler,
+    report_scheduler,
+)
 from .report_service import ReportService
+from .service_executor import CallStats, ServiceExecutor, service_executor
+from .snapshot_service import (
+    SnapshotService,
+    load_snapshot,
+    restore_attendance_state,
+    restore_rows,
+)
 from .termination_service import (
     CoordinatorNotFound,
     InvalidDayForMonth,
@@ -12,13 +12,22 @@ Classes:
     - TimeOutOfRange(Exception): Custom exception for times outside of the IFSP's buiseness hours   
     - EntryTimeAfterExitTime(Exception): Custom exception for when the entry time is after
     the exit time
+    - InvalidAttendanceBatch(Exception): Custom exception for a batch of attendances with
+    invalid lines
+    - NoAttendancesInMonth(Exception): Custom exception for when no member of a project has
+    attendances in the requested month
+
+Functions:
+    - render_attendance_sheet(data: AttendanceSheetData) -> bytes: Renders an attendance sheet,
+    in the current process or in a worker process
 """
 
 import uuid
-from datetime import datetime, time
+from collections.abc import Callable
+from datetime import date, datetime, time
 
-from data import Attendance, AttendanceData
-from reports import AttendanceSheet, AttendanceSheetData
+import reports
+from data import Attendance, AttendanceData, Member
 
 
 class InvalidDate(Exception):
@@ -51,15 +60,48 @@ class EntryTimeAfterExitTime(Exception):
     """
 
 
+class InvalidAttendanceBatch(Exception):
+    """
+    Custom exception for a batch of attendances with invalid lines. The message lists
+    the error of each line
+    """
+
+
+class NoAttendancesInMonth(Exception):
+    """
+    Custom exception for when no member of a project has attendances in the requested month
+    """
+
+
 class AttendanceService:
     """
     Service class for managing attendance data.
 
     Methods:
-        - __init__(): Initialize the AttendanceService object.
-        - find_attends_by_member_and_project(self, member_id: str, proj_id: str) ->
-        Method that gets all attendances related to a specific member and project for the current
-        month
+        - __init__(
+            self, attend_data: AttendanceData | None = None,
+            months: dict[tuple[int, int], list[Attendance]] | None = None,
+            state: dict | None = None,
+        ): Initialize the AttendanceService object.
+        - snapshot_state(self) -> dict:
+        The database, the index and the monthly totals, to be saved in a snapshot
+        - replace_state(self, state: dict) -> None:
+        Replaces the database, the index and the monthly totals in place
+        - recent_months() -> list[tuple[int, int]]:
+        The previous and the current month, the ones loaded at startup
+        - ensure_month_loaded(
+            self, year: int, month: int, attendances: list[Attendance] | None = None
+        ) -> None:
+        Loads the attendances of a month into the database, if they are not loaded yet
+        - get_monthly_minutes(
+            self, member_id: str, proj_id: str, year: int | None = None, month: int | None = None
+        ) -> int:
+        Gets the total time of a member's attendances in a project in a month, in O(1)
+        - find_attends_by_member_and_project(
+            self, member_id: str, proj_id: str, year: int | None = None, month: int | None = None
+        ) -> list[Attendance]:
+        Method that gets all attendances related to a specific member and project for a month,
+        the current one by default
         - _validate_day(self, test_day: str) -> datetime:
         Verifies if the day passed by the user is valid.
         - _validate_time(self, weekday: int, param_time: str) -> time:
@@ -72,50 +114,229 @@ class AttendanceService:
             self, day: str, entry_time: str, exit_time: str, user_id: str, proj_id: str
         ) -> None:
         Validates the day, entry time and exit time sent by the user and creates a new attendance.
-        - get_all_students_id(self) -> set[str]:
-        Iterates over the database and gets all students_id without repetition
+        - create_attendances(self, entries: str, user_id: str, proj_id: str) -> int:
+        Validates several attendances, one per line, and saves all of them in a single write
+        - get_all_students_id(self, year: int | None = None, month: int | None = None) -> set[str]:
+        Iterates over the database and gets all students_id without repetition, optionally
+        only the ones with attendances in a month
+        - create_sheet_data(
+            self, student_name: str, student_registration: str,
+            project_name: str, attendances: list[Attendance],
+            year: int | None = None, month: int | None = None,
+        ) -> AttendanceSheetData:
+        Gathers the data of a month's Attendance sheet for a student, without rendering it
         - create_sheet(
             self, student_name: str, student_registration: str,
             project_name: str, attendances: list[Attendance],
+            year: int | None = None, month: int | None = None,
         ) -> bytes:
-        Create the current month's Attendance sheet for a student
+        Create a month's Attendance sheet for a student, the current month by default
+        - create_project_bundle(
+            self, project_id: str, project_name: str, members: list[Member],
+            year: int | None = None, month: int | None = None,
+        ) -> AttendanceBundle:
+        Gathers the sheets of every member of a project in a month into a single PDF
 
 
 
     Attributes:
-        - database: List to store attendance data.
+        - database: List to store attendance data of the loaded months.
+        - index: The position in the database of each attendance, grouped by
+        (member_id, project_id, year, month) and keyed by date, so an attendance is found in
+        O(1) and a month of a student in a project in the number of its attendances.
+        - monthly_minutes: The total time, in minutes, of the attendances of each
+        (member_id, project_id, year, month), updated on every write.
+        - loaded_months: The (year, month) of the months loaded into the database.
+        - on_month_loaded: Called with the (year, month) of a month right before it is
+        loaded, or None. The reload service uses it to record the month file's fingerprint.
     """
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        attend_data: AttendanceData | None = None,
+        months: dict[tuple[int, int], list[Attendance]] | None = None,
+        state: dict | None = None,
+    ) -> None:
         """
         Initialize the AttendanceService object.
 
-        Sets up the initial state by creating an empty `database` list to store attendance data.
+        Loads the attendances of the current and the previous month, the only
+        ones the bot usually works with. Older months are loaded on demand by
+        `ensure_month_loaded`.
+
+        :param attend_data: The AttendanceData used for storage, a new one if None
+        :type attend_data: AttendanceData | None
+        :param months: The attendances already loaded, by (year, month). The recent
+            months missing from it are read from attend_data
+        :type months: dict[tuple[int, int], list[Attendance]] | None
+        :param state: The state restored from a snapshot, as returned by snapshot_state
+        :type state: dict | None
+        """
+        if attend_data is None:
+            attend_data = AttendanceData()
+        self.attend_data = attend_data
+        self.database: list[Attendance] = []
+        self.index: dict[tuple[str, str, int, int], dict[date, int]] = {}
+        self.monthly_minutes: dict[tuple[str, str, int, int], int] = {}
+        self.loaded_months: set[tuple[int, int]] = set()
+        self.on_month_loaded: Callable[[int, int], None] | None = None
+
+        if state is not None:
+            self.database = state["database"]
+            self.index = state["index"]
+            self.monthly_minutes = state["monthly_minutes"]
+            self.loaded_months = state["loaded_months"]
+
+        months = months or {}
+        for year, month in self.recent_months():
+            self.ensure_month_loaded(year, month, months.get((year, month)))
+
+    def snapshot_state(self) -> dict:
+        """
+        The database, the index and the monthly totals, to be saved in a snapshot
+
+        :return: The state of the service, restored by passing it to __init__
+        :rtype: dict
+        """
+        return {
+            "database": self.database,
+            "index": self.index,
+            "monthly_minutes": self.monthly_minutes,
+            "loaded_months": self.loaded_months,
+        }
+
+    def replace_state(self, state: dict) -> None:
+        """
+        Replaces the database, the index and the monthly totals in place, so any
+        reference to them stays valid
+
+        :param state: The new state, as returned by snapshot_state
+        :type state: dict
+        """
+        self.database[:] = state["database"]
+        self.index.clear()
+        self.index.update(state["index"])
+        self.monthly_minutes.clear()
+        self.monthly_minutes.update(state["monthly_minutes"])
+        self.loaded_months.clear()
+        self.loaded_months.update(state["loaded_months"])
+
+    @staticmethod
+    def recent_months() -> list[tuple[int, int]]:
+        """
+        The previous and the current month, the ones loaded at startup
+
+        :return: The (year, month) of the previous and the current month
+        :rtype: list[tuple[int, int]]
+        """
+        today = datetime.now()
+        if today.month == 1:
+            return [(today.year - 1, 12), (today.year, today.month)]
+        return [(today.year, today.month - 1), (today.year, today.month)]
+
+    def ensure_month_loaded(
+        self, year: int, month: int, attendances: list[Attendance] | None = None
+    ) -> None:
+        """
+        Loads the attendances of a month into the database, if they are not loaded yet
+
+        :param year: The year of the month
+        :type year: int
+        :param month: The month, from 1 to 12
+        :type month: int
+        :param attendances: The attendances of the month already loaded, read from the
+            month's file if None
+        :type attendances: list[Attendance] | None
+        """
+        if (year, month) in self.loaded_months:
+            return
+        if self.on_month_loaded is not None:
+            self.on_month_loaded(year, month)
+        if attendances is None:
+            attendances = self.attend_data.load_month(year, month)
+        for attendance in attendances:
+            self._upsert(attendance)
+        self.loaded_months.add((year, month))
+
+    def _upsert(self, attendance: Attendance) -> None:
+        """
+        Adds an attendance to the database and the index, replacing the attendance
+        of the same member and project on the same date, if there is one
+
+        :param attendance: The attendance to be added
+        :type attendance: Attendance
+        """
+        day = attendance.day
+        month_key = (attendance.member_id, attendance.project_id, day.year, day.month)
+        minutes = self.monthly_minutes.get(month_key, 0) + attendance.minutes
+
+        index = self._get_date_already_saved(attendance)
+        if index is None:
+            self.index.setdefault(month_key, {})[day.date()] = len(self.database)
+            self.database.append(attendance)
+        else:
+            minutes -= self.database[index].minutes
+            self.database[index] = attendance
+
+        self.monthly_minutes[month_key] = minutes
+
+    def get_monthly_minutes(
+        self,
+        member_id: str,
+        proj_id: str,
+        year: int | None = None,
+        month: int | None = None,
+    ) -> int:
         """
-        self.attend_data = AttendanceData()
-        self.database = self.attend_data.load_attend()
+        Gets the total time of a member's attendances in a project in a month, the current
+        one by default. The totals are kept up to date on every write, so this is O(1)
+
+        :param member_id: The member uuid of a student
+        :type member_id: str
+        :param proj_id: The project uuid
+        :type proj_id: str
+        :param year: The year of the month, the current year by default
+        :type year: int | None
+        :param month: The month, from 1 to 12, the current month by default
+        :type month: int | None
+        :return: The total time, in minutes
+        :rtype: int
+        """
+        today = datetime.now()
+        year = today.year if year is None else year
+        month = today.month if month is None else month
+        self.ensure_month_loaded(year, month)
+        return self.monthly_minutes.get((member_id, proj_id, year, month), 0)
 
     def find_attends_by_member_and_project(
-        self, member_id: str, proj_id: str
+        self,
+        member_id: str,
+        proj_id: str,
+        year: int | None = None,
+        month: int | None = None,
     ) -> list[Attendance]:
         """
-        Method that gets all attendances related to a specific member and project for the current
-        month
+        Method that gets all attendances related to a specific member and project for a month.
+        If no month is given, the current month is used
 
         :param member_id: The member uuid of a student
         :type member_id: str
-        :param member_id: The project uuid
-        :type member_id: str
+        :param proj_id: The project uuid
+        :type proj_id: str
+        :param year: The year of the month, the current year by default
+        :type year: int | None
+        :param month: The month, from 1 to 12, the current month by default
+        :type month: int | None
         :return: A list of all Attendances associated with the member and the project
         :rtype: list[Attendance]
         """
-        student_attendances: list[Attendance] = []
-        for attendance in self.database:
-            if member_id == attendance.member_id:
-                if proj_id == attendance.project_id:
-                    if attendance.day.month == datetime.now().month:
-                        student_attendances.append(attendance)
-        return student_attendances
+        today = datetime.now()
+        year = today.year if year is None else year
+        month = today.month if month is None else month
+        self.ensure_month_loaded(year, month)
+
+        positions = self.index.get((member_id, proj_id, year, month), {})
+        return [self.database[position] for position in positions.values()]
 
     def _validate_day(self, test_day: str) -> datetime:
         """
@@ -129,15 +350,17 @@ class AttendanceService:
         """
         curr_day = datetime.now()
         try:
-            date = datetime(year=curr_day.year, month=curr_day.month, day=int(test_day))
+            valid_date = datetime(
+                year=curr_day.year, month=curr_day.month, day=int(test_day)
+            )
         except ValueError as exc:
             raise InvalidDate(
                 "A data passada não é válida (precisa ser um número entre os dias do mês)."
             ) from exc
 
-        if date.weekday() == 6:  # The campus is closed at sundays
+        if valid_date.weekday() == 6:  # The campus is closed at sundays
             raise DayOutOfRange("O campus não está aberto de domingo.")
-        return date
+        return valid_date
 
     def _validate_time(self, weekday: int, param_time: str) -> time:
         """
@@ -191,20 +414,20 @@ class AttendanceService:
     def _get_date_already_saved(self, new_attendance: Attendance) -> int | None:
         """
         Verifies if an attendance is already saved in the database
-        If the function finds an already saved attendance with the same student_id and date,
-        returns the index of the saved attendance
+        If the function finds an already saved attendance with the same student_id, project_id
+        and date, returns the index of the saved attendance
 
         :param new_attendance: The attendance to be verified
         :type new_attendance: Attendance
         :return: The index of the already saved attendance
         :rtype: int
         """
-        for index, attendance in enumerate(self.database):
-            if attendance.member_id == new_attendance.member_id:
-                if attendance.day.day == new_attendance.day.day:
-                    return index
-
-        return None
+        day = new_attendance.day
+        positions = self.index.get(
+            (new_attendance.member_id, new_attendance.project_id, day.year, day.month),
+            {},
+        )
+        return positions.get(day.date())
 
     # pylint: disable-next=too-many-arguments
     def create_attendance(
@@ -222,9 +445,24 @@ class AttendanceService:
         :type exit_time: str
         """
 
+        new_attend = self._build_attendance(
+            day, entry_time, exit_time, user_id, proj_id
+        )
+        self._upsert(new_attend)
+        self.attend_data.save_attend(new_attend)
+
+    # pylint: disable-next=too-many-arguments
+    def _build_attendance(
+        self, day: str, entry_time: str, exit_time: str, user_id: str, proj_id: str
+    ) -> Attendance:
+        """
+        Validates the day, entry time and exit time sent by the user and builds the attendance,
+        without saving it. If the user didn't sent a date, selects the current date
+
+        :return: The validated attendance
+        :rtype: Attendance
+        """
         test_day = day.strip()
-        test_entry_time = entry_time
-        test_exit_time = exit_time
 
         if test_day == "":
             test_day = datetime.now()
@@ -239,7 +477,7 @@ class AttendanceService:
         )
         self._is_entry_before(entry_time=test_entry_time, exit_time=test_exit_time)
 
-        new_attend = Attendance(
+        return Attendance(
             attendance_id=str(uuid.uuid4()),
             member_id=user_id,
             project_id=proj_id,
@@ -248,57 +486,269 @@ class AttendanceService:
             exit_time=test_exit_time,
         )
 
-        index = self._get_date_already_saved(new_attend)
-        if index is None:
-            self.database.append(new_attend)
-        else:
-            self.database[index] = new_attend
-        self.attend_data.save_attend(new_attend)
-
-    def get_all_students_id(self) -> set[str]:
+    def create_attendances(self, entries: str, user_id: str, proj_id: str) -> int:
+        """
+        Validates several attendances, one per line in the format "day entry_time exit_time"
+        (ex: "5 08:00 12:00"), and saves all of them in a single write. If any line is
+        invalid, nothing is saved
+
+        :param entries: The lines sent by the user
+        :type entries: str
+        :param user_id: The member uuid of the student
+        :type user_id: str
+        :param proj_id: The project uuid
+        :type proj_id: str
+        :return: The number of saved attendances
+        :rtype: int
+        """
+        new_attends: list[Attendance] = []
+        errors: list[str] = []
+        days: set[str] = set()
+
+        for line_number, line in enumerate(entries.splitlines(), start=1):
+            fields = line.replace(",", " ").replace(";", " ").split()
+            if not fields:
+                continue
+            if len(fields) != 3:
+                errors.append(
+                    f"Linha {line_number}: use o formato DIA HH:MM HH:MM (ex: 5 08:00 12:00)"
+                )
+                continue
+            if fields[0].lstrip("0") in days:
+                errors.append(f"Linha {line_number}: o dia {fields[0]} está repetido")
+                continue
+            days.add(fields[0].lstrip("0"))
+
+            try:
+                new_attends.append(
+                    self._build_attendance(
+                        fields[0], fields[1], fields[2], user_id, proj_id
+                    )
+                )
+            except (
+                InvalidDate,
+                InvalidTime,
+                DayOutOfRange,
+                TimeOutOfRange,
+                EntryTimeAfterExitTime,
+            ) as exception:
+                errors.append(f"Linha {line_number}: {exception}")
+
+        if errors:
+            raise InvalidAttendanceBatch("\n".join(errors))
+        if not new_attends:
+            raise InvalidAttendanceBatch("Nenhuma presença foi informada.")
+
+        for new_attend in new_attends:
+            self._upsert(new_attend)
+        self.attend_data.save_attends(new_attends)
+        return len(new_attends)
+
+    def get_all_students_id(
+        self, year: int | None = None, month: int | None = None
+    ) -> set[str]:
         """
-        Iterates over the database and gets all students_id without repetition
+        Iterates over the database and gets all students_id without repetition.
+        If a month is given, only the students with attendances in that month are returned
 
+        :param year: The year of the month
+        :type year: int | None
+        :param month: The month, from 1 to 12
+        :type month: int | None
         :return: A set with all student_ids
         :rtype: set[str]
         """
+        if year is not None and month is not None:
+            self.ensure_month_loaded(year, month)
+            return {
+                member_id
+                for member_id, _, index_year, index_month in self.index
+                if (index_year, index_month) == (year, month)
+            }
+
         all_students = set()
         for attendance in self.database:
             all_students.add(attendance.member_id)
 
         return all_students
 
+    # pylint: disable-next=too-many-arguments
+    def create_sheet_data(
+        self,
+        student_name: str,
+        student_registration: str,
+        project_name: str,
+        attendances: list[Attendance],
+        year: int | None = None,
+        month: int | None = None,
+    ) -> "reports.AttendanceSheetData":
+        """
+        Gathers the data of a month's Attendance sheet for a student, the current month by default,
+        without rendering it
+
+        :param student_name: The name of the student
+        :type student_name: str
+        :param student_registration: The registration of the student
+        :type student_registration: str
+        :param project_name: The attendance sheet's project name
+        :type project_name: str
+        :param attendances: The attendances of the student in the project
+        :type attendances: list[Attendance]
+        :param year: The year of the sheet's month, the current year by default
+        :type year: int | None
+        :param month: The sheet's month, from 1 to 12, the current month by default
+        :type month: int | None
+        :return: The data of the sheet
+        :rtype: AttendanceSheetData
+        """
+
+        today = datetime.now()
+        year = today.year if year is None else year
+        month = today.month if month is None else month
+
+        current_month_attends = []
+        for attendance in attendances:
+            if (attendance.day.year, attendance.day.month) == (year, month):
+                current_month_attends.append(attendance)
+
+        # Only the day is kept, so the same sheet requested twice in a day has
+        # the same data and is served from the report cache. Sheets of past
+        # months are dated on the first day of their month
+        sheet_date = today.replace(hour=0, minute=0, second=0, microsecond=0)
+        if (year, month) != (today.year, today.month):
+            sheet_date = datetime(year=year, month=month, day=1)
+
+        # The total is only known when the attendances are exactly the ones in the
+        # database; a filtered or edited list is summed by the sheet
+        total_minutes = None
+        if current_month_attends:
+            first = current_month_attends[0]
+            month_key = (first.member_id, first.project_id, year, month)
+            saved = {
+                id(self.database[position])
+                for position in self.index.get(month_key, {}).values()
+            }
+            if len(saved) == len(current_month_attends) and saved == {
+                id(attendance) for attendance in current_month_attends
+            }:
+                total_minutes = self.monthly_minutes.get(month_key)
+
+        return reports.AttendanceSheetData(
+            student_name=student_name,
+            student_registration=student_registration,
+            current_date=sheet_date,
+            project_name=project_name,
+            attendances=current_month_attends,
+            total_minutes=total_minutes,
+        )
+
+    # pylint: disable-next=too-many-arguments
     def create_sheet(
         self,
         student_name: str,
         student_registration: str,
         project_name: str,
         attendances: list[Attendance],
+        year: int | None = None,
+        month: int | None = None,
     ) -> bytes:
         """
-        Create the current month's Attendance sheet for a student
+        Create a month's Attendance sheet for a student, the current month by default
 
-        :param student_id: The student id
-        :type student_id: str
         :param student_name: The name of the student
         :type student_name: str
+        :param student_registration: The registration of the student
+        :type student_registration: str
         :param project_name: The attendance sheet's project name
         :type project_name: str
+        :param attendances: The attendances of the student in the project
+        :type attendances: list[Attendance]
+        :param year: The year of the sheet's month, the current year by default
+        :type year: int | None
+        :param month: The sheet's month, from 1 to 12, the current month by default
+        :type month: int | None
         :return: The bytes of the created sheet
         :rtype: bytes
         """
+        return render_attendance_sheet(
+            self.create_sheet_data(
+                student_name,
+                student_registration,
+                project_name,
+                attendances,
+                year,
+                month,
+            )
+        )
 
-        current_month_attends = []
-        for attendance in attendances:
-            if attendance.day.month == datetime.now().month:
-                current_month_attends.append(attendance)
+    # pylint: disable-next=too-many-arguments
+    def create_project_bundle(
+        self,
+        project_id: str,
+        project_name: str,
+        members: list[Member],
+        year: int | None = None,
+        month: int | None = None,
+    ) -> "reports.AttendanceBundle":
+        """
+        Gathers the attendance sheets of every member of a project in a month, the current
+        one by default, into a single attendance bundle. Members without attendances are
+        left out
+
+        :param project_id: The project uuid
+        :type project_id: str
+        :param project_name: The name of the project
+        :type project_name: str
+        :param members: The members of the project
+        :type members: list[Member]
+        :param year: The year of the month, the current year by default
+        :type year: int | None
+        :param month: The month, from 1 to 12, the current month by default
+        :type month: int | None
+        :return: The attendance bundle, ready to be generated
+        :rtype: AttendanceBundle
+        """
+        today = datetime.now()
+        year = today.year if year is None else year
+        month = today.month if month is None else month
+
+        sheets = []
+        for member in sorted(members, key=lambda member: member.name):
+            attendances = self.find_attends_by_member_and_project(
+                member.member_id, project_id, year, month
+            )
+            if attendances:
+                sheets.append(
+                    self.create_sheet_data(
+                        member.name,
+                        member.registration,
+                        project_name,
+                        attendances,
+                        year,
+                        month,
+                    )
+                )
+
+        if not sheets:
+            raise NoAttendancesInMonth(
+                f"Nenhum membro do projeto tem presenças em {month:02d}/{year}."
+            )
 
-        return AttendanceSheet(
-            AttendanceSheetData(
-                student_name=student_name,
-                student_registration=student_registration,
-                current_date=datetime.now(),
-                project_name=project_name,
-                attendances=current_month_attends,
+        return reports.AttendanceBundle(
+            reports.AttendanceBundleData(
+                project_name=project_name, year=year, month=month, sheets=sheets
             )
-        ).generate()
+        )
+
+
+def render_attendance_sheet(data: "reports.AttendanceSheetData") -> bytes:
+    """
+    Renders an attendance sheet. It is a module level function so it can be
+    sent to a worker process
+
+    :param data: The data of the sheet
+    :type data: AttendanceSheetData
+    :return: The bytes of the rendered sheet
+    :rtype: bytes
+    """
+    return reports.AttendanceSheet(data).generate()
@@ -26,14 +26,21 @@ class CoordinatorService:
     A service for managing coordinators.
     """
 
-    def __init__(self, coordinator_data: CoordinatorData):
+    def __init__(
+        self,
+        coordinator_data: CoordinatorData,
+        database: list[Coordinator] | None = None,
+    ):
         """
         Initialize the CoordinatorService.
 
         :param coordinator_data: The CoordinatorData object used for data storage.
+        :param database: The coordinators already loaded, read from coordinator_data if None.
         """
         self.coordinator_data = coordinator_data
-        self.database = self.coordinator_data.load_coordinators()
+        if database is None:
+            database = self.coordinator_data.load_coordinators()
+        self.database = database
 
     def find_coordinator_by_type(self, attr_type, value):
         """
@@ -4,9 +4,9 @@ Services for log command.
 import zoneinfo
 from datetime import datetime
 
+import reports
 import settings
 from data import Log, LogData, MemberData, ParticipationData
-from reports import LogReport, LogReportData
 
 from .member_service import MemberService
 from .participation_service import ParticipationService
@@ -14,6 +14,15 @@ from .project_service import ProjectService
 
 logger = settings.logging.getLogger(__name__)
 
+# Discord's upload limit for the files sent by the bot
+MAX_REPORT_SIZE = 26214400
+
+# Reports estimated above the limit by more than this factor are rejected
+# before rendering; the ones in between are rendered and measured. The estimate
+# is a lower bound, the margin covers the renders it still overshoots, such as
+# other fonts or reportlab versions.
+ESTIMATE_REJECTION_MARGIN = 1.25
+
 
 class IncorrectDateFilter(Exception):
     """Exception raised for incorrect date filters."""
@@ -35,6 +44,10 @@ class InvalidReportSize(Exception):
     """Exception raised for an invalid report size."""
 
 
+class InvalidExportFormat(Exception):
+    """Exception raised for an unsupported log export format."""
+
+
 class LogService:
     """
     Service class for log command.
@@ -166,24 +179,61 @@ class LogService:
         except AttributeError:
             return
 
-    def check_size_log_report(self, report: LogReport) -> bool:
+    def check_estimated_size(
+        self, report: "reports.LogReport | reports.LogExport"
+    ) -> bool:
         """
-        Check the size of a log report.
+        Check the estimated size of a log report, before rendering it.
+
+        Only PDF reports have an estimate, so the requests that are bound to
+        exceed the limit fail before being queued for rendering. The exact size
+        is checked by render_log_report.
 
         Args:
-            report (LogReport): The log report to check.
+            report (LogReport | LogExport): The log report to check.
 
         Raises:
-            InvalidReportSize: If the report size is invalid.
+            InvalidReportSize: If the report is estimated above the limit.
 
         Returns:
-            bool: True if the report size is valid, False otherwise.
+            bool: True if the report may fit the limit.
         """
-        if report.generate() is None or len(report.generate()) > 26214400:
+        if isinstance(report, reports.LogReport):
+            estimated_size = report.estimate_size()
+            if estimated_size > MAX_REPORT_SIZE * ESTIMATE_REJECTION_MARGIN:
+                logger.info(
+                    "Log report rejected before rendering, estimated at %d bytes",
+                    estimated_size,
+                )
+                raise InvalidReportSize(
+                    "Arquivo muito grande para o Discord. Utilize filtros."
+                )
+        return True
+
+    def render_log_report(
+        self, report: "reports.LogReport | reports.LogExport"
+    ) -> bytes:
+        """
+        Render a log report and check its size.
+
+        It is the render submitted to the report scheduler, so the report is
+        only rendered when its turn comes.
+
+        Args:
+            report (LogReport | LogExport): The log report to render.
+
+        Raises:
+            InvalidReportSize: If the rendered report is above the limit.
+
+        Returns:
+            bytes: The rendered report.
+        """
+        content = report.generate()
+        if content is None or len(content) > MAX_REPORT_SIZE:
             raise InvalidReportSize(
                 "Arquivo muito grande para o Discord. Utilize filtros."
             )
-        return True
+        return content
 
     def get_project_server_id(self, server_id: int) -> str | None:
         """
@@ -202,14 +252,15 @@ class LogService:
             return project.project_id
         return None
 
-    # pylint: disable=inconsistent-return-statements
+    # pylint: disable=too-many-arguments
     def generate_log_report(
         self,
         server_id: int,
         discord_id: int = None,
         start_date: str = None,
         end_date: str = None,
-    ) -> LogReport:
+        export_format: str = "pdf",
+    ) -> "reports.LogReport | reports.LogExport":
         """
         Generate a log report.
 
@@ -218,14 +269,22 @@ class LogService:
             discord_id (str): The ID of the student to filter the report, or None for all students.
             start_date (str): The start date of the report filter, or None for no start date.
             end_date (str): The end date of the report filter, or None for no end date.
+            export_format (str): "pdf" for the PDF report, or "csv"/"ndjson" for a
+            gzip-compressed export of the matching rows.
 
         Returns:
-            LogReport: The generated log report.
+            LogReport | LogExport: The log report or export, not rendered yet:
+            render it with render_log_report.
 
         Raises:
             IdDoesNotExist: If the provided student ID does not exist.
             NoStartDate: If no start date is provided when an end date is.
+            InvalidExportFormat: If the export format is not supported.
+            InvalidReportSize: If the PDF report is estimated above the limit.
         """
+        if export_format != "pdf" and export_format not in reports.EXPORT_FORMATS:
+            raise InvalidExportFormat("Formato de exportação inválido")
+
         if discord_id is not None:
             if (
                 self.member_service.find_member_by_type("discord_id", discord_id)
@@ -234,64 +293,41 @@ class LogService:
                 raise IdDoesNotExist("ID não corresponde a nenhum estudante")
 
         if start_date is None and end_date is None:
-            if discord_id is not None:
-                data = LogReportData(
-                    members=self.members_data.load_members(),
-                    participations=self.participations_data.load_participations(),
-                    logs=self.log_data.load_logs(),
-                    project_id=self.get_project_server_id(server_id),
-                    value=3,
-                    start_date=None,
-                    end_date=None,
-                    discord_id=discord_id,
-                )
-            else:
-                data = LogReportData(
-                    members=self.members_data.load_members(),
-                    participations=self.participations_data.load_participations(),
-                    logs=self.log_data.load_logs(),
-                    project_id=self.get_project_server_id(server_id),
-                    value=1,
-                    start_date=None,
-                    end_date=None,
-                    discord_id=None,
-                )
+            value = 3 if discord_id is not None else 1
 
         elif end_date is not None and start_date is None:
             raise NoStartDate("É preciso de uma data inicial")
 
-        elif start_date is not None:
+        else:
             if end_date is None:
                 end_date = self.get_event_date()
 
             self.filter_date_validation(start_date)
             self.filter_date_validation(end_date)
 
-            if discord_id is not None:
-                data = LogReportData(
-                    members=self.members_data.load_members(),
-                    participations=self.participations_data.load_participations(),
-                    logs=self.log_data.load_logs(),
-                    project_id=self.get_project_server_id(server_id),
-                    value=4,
-                    start_date=self.datetime_format(start_date),
-                    end_date=self.datetime_format(end_date),
-                    discord_id=discord_id,
-                )
-
-            else:
-                data = LogReportData(
-                    members=self.members_data.load_members(),
-                    participations=self.participations_data.load_participations(),
-                    logs=self.log_data.load_logs(),
-                    project_id=self.get_project_server_id(server_id),
-                    value=2,
-                    start_date=self.datetime_format(start_date),
-                    end_date=self.datetime_format(end_date),
-                    discord_id=None,
-                )
+            value = 4 if discord_id is not None else 2
+            start_date = self.datetime_format(start_date)
+            end_date = self.datetime_format(end_date)
+
+        data = reports.LogReportData(
+            members=self.members_data.load_members(),
+            participations=self.participations_data.load_participations(),
+            logs=(
+                self.log_data.load_logs()
+                if export_format == "pdf"
+                else self.log_data.iter_logs()
+            ),
+            project_id=self.get_project_server_id(server_id),
+            value=value,
+            start_date=start_date,
+            end_date=end_date,
+            discord_id=discord_id,
+        )
 
-        report = LogReport(data)
+        if export_format == "pdf":
+            report = reports.LogReport(data)
+        else:
+            report = reports.LogExport(data, export_format)
 
-        if self.check_size_log_report(report):
-            return report
+        self.check_estimated_size(report)
+        return report
@@ -43,13 +43,18 @@ class MemberService:
     Args:
         member_data (MemberData): An instance of MemberData class for accessing member data.
 
+        database (list[Member] | None): The members already loaded, read from member_data
+    if None.
+
     Attributes:
         member_data (MemberData): An instance of MemberData class for accessing member data.
     """
 
-    def __init__(self, member_data: MemberData):
+    def __init__(self, member_data: MemberData, database: list[Member] | None = None):
         self.member_data = member_data
-        self.database = self.member_data.load_members()
+        if database is None:
+            database = self.member_data.load_members()
+        self.database = database
 
     def find_member_by_type(self, attr_type, value):
         """
@@ -27,8 +27,8 @@ Methods:
 
 from datetime import datetime
 
+import reports
 from data import CoordinatorData, Member, ParticipationData, Project
-from reports import MonthlyReport, MonthlyReportData
 
 from .coordinator_service import CoordinatorService
 from .participation_service import ParticipationService
@@ -257,7 +257,7 @@ class MonthlyReportService:
             bytes: The semester report in bytes format.
         """
 
-        data = MonthlyReportData(
+        data = reports.MonthlyReportData(
             project_title=project_title,
             project_manager=project_manager,
             student_name=student_name,
@@ -266,7 +266,7 @@ class MonthlyReportService:
             results=results,
         )
 
-        report = MonthlyReport(data)
+        report = reports.MonthlyReport(data)
 
         return report.generate()
 
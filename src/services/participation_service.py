@@ -53,6 +53,8 @@ class ParticipationService:
         member_data (MemberData): An instance of MemberData class for accessing member data.
         project_service (ProjectService): An instance of ProjectService for acessing project data.
         member_service (MemberService): An instance of MemberService for acessing member data.
+        database (list[Participation] | None): The participations already loaded, read from
+    participation_data if None.
     Attributes:
         participation_data (ParticipationData): An instance of ParticipationData class for
     accessing participation data.
@@ -61,12 +63,14 @@ class ParticipationService:
         member_service (MemberService): An instance of MemberService for acessing member data.
     """
 
+    # pylint: disable=too-many-arguments
     def __init__(
         self,
         participation_data: ParticipationData,
         member_data: MemberData,
         project_service: ProjectService,
         member_service: MemberService,
+        database: list[Participation] | None = None,
     ) -> None:
         """ """
         self.member_data = member_data
@@ -75,7 +79,9 @@ class ParticipationService:
         self.member_service = member_service
         self.project_service = project_service
 
-        self.database = self.participation_data.load_participations()
+        if database is None:
+            database = self.participation_data.load_participations()
+        self.database = database
         self.members = self.member_service.database
         self.projects = self.project_service.database
 
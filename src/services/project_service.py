@@ -71,17 +71,22 @@ class ProjectService:
         self,
         project_data: ProjectData,
         coordinator_service: CoordinatorService,
+        database: list[Project] | None = None,
     ):
         """
         Initializes the ProjectService instance.
 
         Args:
             project_data (ProjectData): The project data object for managing project data.
+            database (list[Project] | None): The projects already loaded, read from
+            project_data if None.
         """
         self.project_data = project_data
         self.coordinator_service = coordinator_service
 
-        self.database = self.project_data.load_projects()
+        if database is None:
+            database = self.project_data.load_projects()
+        self.database = database
         self.coordinators = self.coordinator_service.database
 
     def find_project_by_type(self, attr_type, value):
@@ -0,0 +1,313 @@
+"""
+reload_service
+==============
+
+This module reloads the data files that were edited by hand while the bot is
+running, so the bot doesn't need a restart to see the changes.
+
+The changed files are parsed in worker threads. The parsed rows are swapped
+into the services' databases in place (``database[:] = rows``), in the event
+loop's thread, holding the services' write lock and without awaiting in
+between, so the lists other services alias stay valid and no command sees a
+half reloaded database. If a file changes while it is parsed, for example
+because a command appended a row to it, it is parsed again before the swap.
+
+Classes:
+    - ReloadResult: The files reloaded and the ones that failed.
+    - ReloadService: Reloads the changed data files into the services.
+
+Variables:
+    - MAX_PARSE_ATTEMPTS (int): How many times a file that keeps changing is parsed.
+"""
+
+import asyncio
+import os
+from collections.abc import Callable
+from dataclasses import dataclass, field
+
+import settings
+
+from .attendance_service import AttendanceService
+from .coordinator_service import CoordinatorService
+from .member_service import MemberService
+from .participation_service import ParticipationService
+from .project_service import ProjectService
+from .service_executor import service_executor
+
+logger = settings.logging.getLogger(__name__)
+
+MAX_PARSE_ATTEMPTS = 3
+
+
+def _fingerprint(file_path: str) -> tuple[int, int] | None:
+    """
+    The size and modification time of a file, which change when it is written
+
+    :param file_path: The path of the file.
+    :type file_path: str
+    :return: The size and the modification time in nanoseconds, None if the file
+        doesn't exist.
+    :rtype: tuple[int, int] | None
+    """
+    try:
+        stat = os.stat(file_path)
+    except FileNotFoundError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+
+@dataclass
+class ReloadResult:
+    """
+    The files reloaded and the ones that failed
+
+    Attributes:
+        reloaded (dict[str, int]): The number of rows of each reloaded file.
+        failed (dict[str, str]): The error of each file that couldn't be reloaded.
+    """
+
+    reloaded: dict[str, int] = field(default_factory=dict)
+    failed: dict[str, str] = field(default_factory=dict)
+
+
+class ReloadService:
+    """
+    Reloads the changed data files into the services
+
+    Methods:
+        - changed_files(self) -> list[str]: The data files changed since the last load.
+        - reload(self) -> ReloadResult: Reloads the changed files.
+
+    Attributes:
+        - sources (dict): The file path, load function and service of each CSV file.
+        - attendance_service (AttendanceService): The service of the attendance months.
+        - fingerprints (dict): The fingerprint of each file when it was last loaded.
+        - lock (asyncio.Lock): Lock that allows one reload at a time.
+    """
+
+    # pylint: disable=too-many-arguments
+    def __init__(
+        self,
+        coordinator_service: CoordinatorService,
+        project_service: ProjectService,
+        member_service: MemberService,
+        participation_service: ParticipationService,
+        attendance_service: AttendanceService,
+    ) -> None:
+        coordinator_data = coordinator_service.coordinator_data
+        project_data = project_service.project_data
+        member_data = member_service.member_data
+        participation_data = participation_service.participation_data
+
+        self.sources: dict[str, tuple[str, Callable[[], list], object]] = {
+            "coordinators": (
+                coordinator_data.coordinators_file_path,
+                coordinator_data.load_coordinators,
+                coordinator_service,
+            ),
+            "projects": (
+                project_data.projects_file_path,
+                project_data.load_projects,
+                project_service,
+            ),
+            "members": (
+                member_data.members_file_path,
+                member_data.load_members,
+                member_service,
+            ),
+            "participations": (
+                participation_data.participations_file_path,
+                participation_data.load_participations,
+                participation_service,
+            ),
+        }
+        self.attendance_service = attendance_service
+        self.fingerprints = {
+            name: _fingerprint(file_path)
+            for name, (file_path, _, _) in self.sources.items()
+        }
+        self.fingerprints.update(self._attendance_fingerprints())
+        attendance_service.on_month_loaded = self._record_month
+        self.lock = asyncio.Lock()
+
+    @staticmethod
+    def _month_name(year: int, month: int) -> str:
+        """
+        The name of the file of an attendance month, as "attendances YYYY-MM"
+        """
+        return f"attendances {year}-{month:02d}"
+
+    def _record_month(self, year: int, month: int) -> None:
+        """
+        Records the fingerprint of an attendance month's file right before the month
+        is loaded, so an edit made after it is seen by the next check
+
+        :param year: The year of the month.
+        :type year: int
+        :param month: The month, from 1 to 12.
+        :type month: int
+        """
+        self.fingerprints[self._month_name(year, month)] = _fingerprint(
+            self.attendance_service.attend_data.month_file_path(year, month)
+        )
+
+    def _attendance_fingerprints(self) -> dict[str, tuple[int, int] | None]:
+        """
+        The fingerprints of the files of the attendance months loaded
+
+        :return: The fingerprint of each month file, by "attendances YYYY-MM".
+        :rtype: dict[str, tuple[int, int] | None]
+        """
+        attend_data = self.attendance_service.attend_data
+        return {
+            self._month_name(year, month): _fingerprint(
+                attend_data.month_file_path(year, month)
+            )
+            for year, month in self.attendance_service.loaded_months
+        }
+
+    def changed_files(self) -> list[str]:
+        """
+        The data files changed since they were last loaded
+
+        The attendance months loaded lazily have their fingerprint recorded when
+        they are loaded, by _record_month. It must be called holding the write
+        lock, so no month is loaded meanwhile.
+
+        :return: The names of the changed files.
+        :rtype: list[str]
+        """
+        changed = [
+            name
+            for name, (file_path, _, _) in self.sources.items()
+            if _fingerprint(file_path) != self.fingerprints.get(name)
+        ]
+        changed += [
+            name
+            for name, fingerprint in self._attendance_fingerprints().items()
+            if fingerprint != self.fingerprints.get(name)
+        ]
+        return changed
+
+    async def reload(self) -> ReloadResult:
+        """
+        Reloads the changed files, parsing them in worker threads
+
+        :return: The files reloaded and the ones that failed.
+        :rtype: ReloadResult
+        """
+        async with self.lock:
+            result = ReloadResult()
+            async with service_executor.writing():
+                changed = self.changed_files()
+            if not changed:
+                return result
+
+            logger.info("Reloading %s", ", ".join(changed))
+            reloads = [
+                self._reload_file(name, result)
+                for name in changed
+                if name in self.sources
+            ]
+            if any(name.startswith("attendances") for name in changed):
+                reloads.append(self._reload_attendances(result))
+            await asyncio.gather(*reloads)
+            return result
+
+    async def _parse(
+        self,
+        file_paths: list[str],
+        parse: Callable[[], object],
+        swap: Callable[[object, list], None],
+    ) -> None:
+        """
+        Parses files in a worker thread, again if they change meanwhile, and swaps
+        the result in holding the write lock
+
+        :param file_paths: The paths of the files parsed.
+        :type file_paths: list[str]
+        :param parse: The function that parses the files.
+        :type parse: Callable[[], object]
+        :param swap: The function that swaps the parsed data into the service, given
+            the data and the fingerprints of the files it came from.
+        :type swap: Callable[[object, list], None]
+        :raises RuntimeError: If the files change during every attempt.
+        """
+        for _ in range(MAX_PARSE_ATTEMPTS):
+            before = [_fingerprint(file_path) for file_path in file_paths]
+            parsed = await service_executor.run(parse)
+            async with service_executor.writing():
+                if [_fingerprint(file_path) for file_path in file_paths] == before:
+                    swap(parsed, before)
+                    return
+        raise RuntimeError("o arquivo mudou durante todas as tentativas de leitura")
+
+    async def _reload_file(self, name: str, result: ReloadResult) -> None:
+        """
+        Reloads a CSV file and swaps its rows into the service's database
+
+        :param name: The name of the file.
+        :type name: str
+        :param result: The result where the outcome is recorded.
+        :type result: ReloadResult
+        """
+        file_path, load, service = self.sources[name]
+
+        def swap(rows: list, fingerprints: list) -> None:
+            service.database[:] = rows
+            self.fingerprints[name] = fingerprints[0]
+            result.reloaded[name] = len(rows)
+            logger.info("Reloaded %s: %d rows", name, len(rows))
+
+        try:
+            await self._parse([file_path], load, swap)
+        # pylint: disable-next=broad-exception-caught
+        except Exception as error:
+            logger.error("Could not reload %s: %s", name, error)
+            result.failed[name] = str(error)
+
+    async def _reload_attendances(self, result: ReloadResult) -> None:
+        """
+        Rebuilds the attendance months loaded, with their index and monthly totals,
+        and swaps them into the attendance service
+
+        :param result: The result where the outcome is recorded.
+        :type result: ReloadResult
+        """
+        months = sorted(self.attendance_service.loaded_months)
+        attend_data = self.attendance_service.attend_data
+        file_paths = [
+            attend_data.month_file_path(year, month) for year, month in months
+        ]
+
+        def rebuild() -> dict:
+            service = AttendanceService(attend_data)
+            for year, month in months:
+                service.ensure_month_loaded(year, month)
+            return service.snapshot_state()
+
+        def swap(state: dict, fingerprints: list) -> None:
+            # The months loaded while the files were parsed are added to the rebuilt
+            # state, so they aren't dropped from the service
+            loaded_meanwhile = sorted(
+                self.attendance_service.loaded_months.difference(months)
+            )
+            if loaded_meanwhile:
+                service = AttendanceService(attend_data, state=state)
+                service.on_month_loaded = self._record_month
+                for year, month in loaded_meanwhile:
+                    service.ensure_month_loaded(year, month)
+                state = service.snapshot_state()
+
+            self.attendance_service.replace_state(state)
+            for (year, month), fingerprint in zip(months, fingerprints):
+                self.fingerprints[self._month_name(year, month)] = fingerprint
+            result.reloaded["attendances"] = len(state["database"])
+            logger.info("Reloaded the attendances: %d rows", len(state["database"]))
+
+        try:
+            await self._parse(file_paths, rebuild, swap)
+        # pylint: disable-next=broad-exception-caught
+        except Exception as error:
+            logger.error("Could not reload the attendances: %s", error)
+            result.failed["attendances"] = str(error)
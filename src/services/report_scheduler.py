@@ -0,0 +1,298 @@
+"""
+report_scheduler
+================
+
+This module schedules the rendering of the reports the users request, so the
+bursts at the end of the semester don't take every thread of the service
+executor, and a server requesting many reports doesn't hold the others back.
+
+At most ``max_concurrency`` reports render at the same time. The waiting jobs
+are queued by priority, and small reports, such as the report forms, run ahead
+of large ones, such as the log exports and the attendance bundles. Inside a
+priority, the servers take turns: each server has its own queue, and the next
+job comes from the server after the one that ran last. A large job that waited
+longer than PROMOTE_AFTER_SECONDS runs ahead of the small ones, so a steady
+stream of small reports doesn't starve it.
+
+Classes:
+    - Priority: The priority of a report job.
+    - ReportJob: A report waiting to be rendered, or rendering.
+    - JobStats: The wait times of the jobs of a priority.
+    - ReportScheduler: Renders the reports with bounded concurrency, fairness and
+    priorities.
+
+Variables:
+    - REPORT_WORKERS (int): How many reports render at the same time.
+    - PROMOTE_AFTER_SECONDS (float): How long a large job waits before it runs ahead
+    of the small ones.
+    - report_scheduler (ReportScheduler): The scheduler shared by the cogs.
+"""
+
+import asyncio
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from enum import IntEnum
+from functools import partial
+from itertools import count
+from time import perf_counter
+
+import settings
+
+from .service_executor import service_executor
+
+logger = settings.logging.getLogger(__name__)
+
+REPORT_WORKERS = 2
+PROMOTE_AFTER_SECONDS = 60.0
+
+
+class Priority(IntEnum):
+    """
+    The priority of a report job, lower values run first
+    """
+
+    SMALL = 0
+    LARGE = 1
+
+
+@dataclass(eq=False)
+class ReportJob:
+    """
+    A report waiting to be rendered, or rendering
+
+    Awaiting the job returns the rendered report.
+
+    Attributes:
+        job_id (int): The number of the job, in the order it was submitted.
+        guild_id (int | None): The server that requested the report.
+        priority (Priority): The priority of the job.
+        render (partial): The call that renders the report.
+        future (asyncio.Future): The future that receives the rendered report.
+        submitted_at (float): When the job was submitted, from perf_counter.
+        started_at (float | None): When the job started rendering, if it did.
+    """
+
+    job_id: int
+    guild_id: int | None
+    priority: Priority
+    render: partial
+    future: asyncio.Future
+    submitted_at: float = field(default_factory=perf_counter)
+    started_at: float | None = None
+
+    def __await__(self):
+        return self.future.__await__()
+
+    @property
+    def name(self) -> str:
+        """
+        The name of the render function, for the logs
+        """
+        return getattr(self.render.func, "__qualname__", repr(self.render.func))
+
+
+@dataclass
+class JobStats:
+    """
+    The wait times of the jobs of a priority
+
+    Attributes:
+        started (int): How many jobs started rendering.
+        total_wait (float): The time, in seconds, the started jobs waited in the queue.
+        max_wait (float): The time, in seconds, of the longest wait.
+    """
+
+    started: int = 0
+    total_wait: float = 0.0
+    max_wait: float = 0.0
+
+    @property
+    def average_wait(self) -> float:
+        """
+        The average time, in seconds, the started jobs waited in the queue
+        """
+        return self.total_wait / self.started if self.started else 0.0
+
+
+class ReportScheduler:
+    """
+    Renders the reports with bounded concurrency, fair queuing per server and
+    priorities
+
+    Methods:
+        - submit(self, guild_id, render, *args, priority=Priority.SMALL, **kwargs)
+        -> ReportJob: Queues a report.
+        - queue_length(self, priority=None) -> int: How many jobs are waiting.
+        - oldest_wait(self) -> float: How long the oldest waiting job has waited.
+
+    Attributes:
+        - max_concurrency (int): How many reports render at the same time.
+        - running (int): How many reports are rendering.
+        - stats (dict[Priority, JobStats]): The wait times of the jobs, by priority.
+    """
+
+    def __init__(self, max_concurrency: int = REPORT_WORKERS) -> None:
+        self.max_concurrency = max_concurrency
+        self.running = 0
+        self.stats = {priority: JobStats() for priority in Priority}
+        self._queues: dict[Priority, dict[int | None, deque[ReportJob]]] = {
+            priority: {} for priority in Priority
+        }
+        self._job_ids = count(1)
+        self._tasks: set[asyncio.Task] = set()
+
+    def submit(
+        self,
+        guild_id: int | None,
+        render: Callable,
+        *args,
+        priority: Priority = Priority.SMALL,
+        **kwargs,
+    ) -> ReportJob:
+        """
+        Queues a report, which starts rendering as soon as it is its turn
+
+        It must be called from the event loop.
+
+        :param guild_id: The server that requested the report.
+        :type guild_id: int | None
+        :param render: The function that renders the report.
+        :type render: Callable
+        :param priority: The priority of the job.
+        :type priority: Priority
+        :return: The job, which returns the rendered report when awaited.
+        :rtype: ReportJob
+        """
+        job = ReportJob(
+            job_id=next(self._job_ids),
+            guild_id=guild_id,
+            priority=priority,
+            render=partial(render, *args, **kwargs),
+            future=asyncio.get_running_loop().create_future(),
+        )
+        self._queues[priority].setdefault(guild_id, deque()).append(job)
+        logger.debug(
+            "Report job %d (%s) of server %s queued, %d waiting",
+            job.job_id,
+            job.name,
+            guild_id,
+            self.queue_length(),
+        )
+        self._dispatch()
+        return job
+
+    def queue_length(self, priority: Priority | None = None) -> int:
+        """
+        How many jobs are waiting to render
+
+        :param priority: Only count the jobs of this priority, if given.
+        :type priority: Priority | None
+        :return: The number of waiting jobs.
+        :rtype: int
+        """
+        priorities = Priority if priority is None else [priority]
+        return sum(
+            len(jobs) for queued in priorities for jobs in self._queues[queued].values()
+        )
+
+    def oldest_wait(self) -> float:
+        """
+        How long the oldest waiting job has waited
+
+        :return: The wait, in seconds, 0 if no job is waiting.
+        :rtype: float
+        """
+        heads = [
+            jobs[0].submitted_at
+            for queues in self._queues.values()
+            for jobs in queues.values()
+        ]
+        return perf_counter() - min(heads) if heads else 0.0
+
+    def _next_job(self) -> ReportJob | None:
+        """
+        Takes the next job out of the queues
+
+        The guild queues of a priority are kept in the order their turns come, so
+        the next job is the head of the first queue, and the guild goes to the end.
+
+        :return: The next job, or None if no job is waiting.
+        :rtype: ReportJob | None
+        """
+        order = list(Priority)
+        large = self._queues[Priority.LARGE]
+        if large and any(
+            perf_counter() - jobs[0].submitted_at >= PROMOTE_AFTER_SECONDS
+            for jobs in large.values()
+        ):
+            order.reverse()
+
+        for priority in order:
+            queues = self._queues[priority]
+            if not queues:
+                continue
+            guild_id = next(iter(queues))
+            jobs = queues.pop(guild_id)
+            job = jobs.popleft()
+            if jobs:
+                queues[guild_id] = jobs
+            return job
+        return None
+
+    def _dispatch(self) -> None:
+        """
+        Starts the waiting jobs while there are free slots
+        """
+        while self.running < self.max_concurrency:
+            job = self._next_job()
+            if job is None:
+                return
+            if job.future.cancelled():
+                continue
+
+            job.started_at = perf_counter()
+            wait = job.started_at - job.submitted_at
+            stats = self.stats[job.priority]
+            stats.started += 1
+            stats.total_wait += wait
+            stats.max_wait = max(stats.max_wait, wait)
+            logger.info(
+                "Report job %d (%s) of server %s started after waiting %.3fs, "
+                + "%d waiting",
+                job.job_id,
+                job.name,
+                job.guild_id,
+                wait,
+                self.queue_length(),
+            )
+
+            self.running += 1
+            task = asyncio.create_task(self._run(job))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, job: ReportJob) -> None:
+        """
+        Renders a job in the service executor and frees its slot
+
+        :param job: The job to render.
+        :type job: ReportJob
+        """
+        try:
+            result = await service_executor.run(
+                job.render.func, *job.render.args, **job.render.keywords
+            )
+        # pylint: disable-next=broad-exception-caught
+        except Exception as error:
+            if not job.future.done():
+                job.future.set_exception(error)
+        else:
+            if not job.future.done():
+                job.future.set_result(result)
+        finally:
+            self.running -= 1
+            self._dispatch()
+
+
+report_scheduler = ReportScheduler()
@@ -27,8 +27,8 @@ Methods:
 
 from datetime import datetime
 
+import reports
 from data import CoordinatorData, Member, ParticipationData, Project
-from reports import SemesterReport, SemesterReportData
 
 from .coordinator_service import CoordinatorService
 from .participation_service import ParticipationService
@@ -264,7 +264,7 @@ class ReportService:
             bytes: The semester report in bytes format.
         """
 
-        data = SemesterReportData(
+        data = reports.SemesterReportData(
             project_title=project_title,
             project_manager=project_manager,
             student_name=student_name,
@@ -273,7 +273,7 @@ class ReportService:
             results=results,
         )
 
-        report = SemesterReport(data)
+        report = reports.SemesterReport(data)
 
         return report.generate()
 
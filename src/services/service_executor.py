@@ -0,0 +1,195 @@
+"""
+service_executor
+================
+
+This module provides an async facade over the services' blocking methods, so
+the command handlers don't block the gateway while the services read and write
+the data files or render reports.
+
+The calls run in a bounded thread pool. Calls that write the data files, or
+change the services' databases, run with ``write``, which holds an asyncio lock
+while the call waits and runs, so no thread is blocked waiting for it. Writes
+never overlap, and the snapshot and the reload of the data files, which also use
+``write`` and ``writing``, never see a write half done. The time each call waited for a thread
+and took to run is logged and kept in ``stats``.
+
+Classes:
+    - CallStats: The timing of the calls to a service method.
+    - ServiceExecutor: Runs blocking service calls in a bounded thread pool.
+
+Variables:
+    - SERVICE_WORKERS (int): The number of threads of the pool.
+    - SLOW_CALL_SECONDS (float): Calls slower than this are logged as warnings.
+    - service_executor (ServiceExecutor): The executor shared by the cogs.
+"""
+
+import asyncio
+import contextlib
+import threading
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from time import perf_counter
+from typing import Any
+
+import settings
+
+logger = settings.logging.getLogger(__name__)
+
+SERVICE_WORKERS = 4
+SLOW_CALL_SECONDS = 1.0
+
+
+@dataclass
+class CallStats:
+    """
+    The timing of the calls to a service method
+
+    Attributes:
+        calls (int): How many times the method was called.
+        total_wait (float): The time, in seconds, the calls waited for a thread.
+        total_run (float): The time, in seconds, the calls took to run.
+        max_run (float): The time, in seconds, of the slowest call.
+    """
+
+    calls: int = 0
+    total_wait: float = 0.0
+    total_run: float = 0.0
+    max_run: float = 0.0
+
+
+class ServiceExecutor:
+    """
+    Runs blocking service calls in a bounded thread pool
+
+    Methods:
+        - run(self, func, *args, **kwargs): Runs a call that doesn't write the data.
+        - write(self, func, *args, **kwargs): Runs a call that writes the data, one at
+        a time.
+        - writing(self): Holds the write lock while the event loop changes the data.
+
+    Attributes:
+        - max_workers (int): The number of threads of the pool.
+        - stats (dict[str, CallStats]): The timing of the calls, by method name.
+    """
+
+    def __init__(self, max_workers: int = SERVICE_WORKERS) -> None:
+        self.max_workers = max_workers
+        self.stats: dict[str, CallStats] = {}
+        self._executor: ThreadPoolExecutor | None = None
+        self._write_lock = asyncio.Lock()
+        self._stats_lock = threading.Lock()
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        """
+        The thread pool, created on the first call
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="service"
+            )
+        return self._executor
+
+    async def run(self, func: Callable, *args, **kwargs) -> Any:
+        """
+        Runs a call that doesn't write the data in the thread pool
+
+        The call runs alongside the writes and the other reads, so it must not
+        change the services' state at all, not even their caches or the lazily
+        loaded attendance months: those changes go through write. Reads that walk
+        data the writes change in place, such as the attendance index, also go
+        through write, or hold writing, so a write doesn't change it meanwhile.
+
+        :param func: The service method to call.
+        :type func: Callable
+        :return: The value returned by the call.
+        :raises Exception: Any exception raised by the call.
+        """
+        return await self._submit(func, args, kwargs, lock=None)
+
+    async def write(self, func: Callable, *args, **kwargs) -> Any:
+        """
+        Runs a call that writes the data in the thread pool, holding the write lock
+
+        :param func: The service method to call.
+        :type func: Callable
+        :return: The value returned by the call.
+        :raises Exception: Any exception raised by the call.
+        """
+        return await self._submit(func, args, kwargs, lock=self._write_lock)
+
+    @contextlib.asynccontextmanager
+    async def writing(self):
+        """
+        Holds the write lock, so the event loop can change the services' data
+        without a write running in the thread pool meanwhile
+        """
+        async with self._write_lock:
+            yield
+
+    async def _submit(
+        self,
+        func: Callable,
+        args: tuple,
+        kwargs: dict,
+        lock: asyncio.Lock | None,
+    ) -> Any:
+        """
+        Submits a call to the thread pool and waits for it
+
+        :param func: The service method to call.
+        :type func: Callable
+        :param args: The positional arguments of the call.
+        :type args: tuple
+        :param kwargs: The keyword arguments of the call.
+        :type kwargs: dict
+        :param lock: The lock held while the call waits and runs, if any.
+        :type lock: asyncio.Lock | None
+        :return: The value returned by the call.
+        """
+        name = getattr(func, "__qualname__", repr(func))
+        submitted = perf_counter()
+        timing = {}
+
+        def call():
+            started = perf_counter()
+            timing["wait"] = started - submitted
+            try:
+                return func(*args, **kwargs)
+            finally:
+                timing["run"] = perf_counter() - started
+
+        loop = asyncio.get_running_loop()
+        try:
+            async with lock or contextlib.nullcontext():
+                return await loop.run_in_executor(self.executor, call)
+        finally:
+            if timing:
+                self._record(name, timing["wait"], timing.get("run", 0.0))
+
+    def _record(self, name: str, wait: float, run: float) -> None:
+        """
+        Records and logs the timing of a call
+
+        :param name: The name of the service method.
+        :type name: str
+        :param wait: The time, in seconds, the call waited for a thread.
+        :type wait: float
+        :param run: The time, in seconds, the call took to run.
+        :type run: float
+        """
+        with self._stats_lock:
+            stats = self.stats.setdefault(name, CallStats())
+            stats.calls += 1
+            stats.total_wait += wait
+            stats.total_run += run
+            stats.max_run = max(stats.max_run, run)
+
+        if run >= SLOW_CALL_SECONDS:
+            logger.warning("%s took %.3fs (waited %.3fs)", name, run, wait)
+        else:
+            logger.debug("%s took %.3fs (waited %.3fs)", name, run, wait)
+
+
+service_executor = ServiceExecutor()
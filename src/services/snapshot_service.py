@@ -0,0 +1,269 @@
+"""
+snapshot_service
+================
+
+This module saves the in-memory state of the services in a compact binary
+snapshot, and restores it at startup, so the bot doesn't parse every CSV file
+again when it restarts.
+
+The snapshot is a zlib compressed pickle with the rows of the members,
+projects, coordinators and participations, and the attendances of the loaded
+months together with their index and monthly totals. For each file it also keeps
+the file's size and the CRC-32 of its content when the snapshot was taken.
+
+At startup, a CSV file whose first bytes still match the snapshot only has the
+rows appended after the snapshot parsed. A file that was rewritten, or an
+attendance month that changed, is loaded from the file as usual.
+
+Classes:
+    - SnapshotService: Takes snapshots of the services' state.
+
+Functions:
+    - load_snapshot(file_path: str = SNAPSHOT_FILE_PATH) -> dict | None: Reads a snapshot.
+    - restore_rows(snapshot, name, file_path, load) -> list: The rows of a CSV file,
+    replayed from the snapshot.
+    - restore_attendance_state(snapshot, attend_data) -> dict | None: The state of the
+    attendance service, if no month file changed.
+
+Variables:
+    - SNAPSHOT_FILE_PATH (str): The path of the snapshot file.
+    - SNAPSHOT_VERSION (int): The version of the snapshot format.
+"""
+
+import os
+import pickle
+import zlib
+from collections.abc import Callable
+from datetime import datetime
+
+import settings
+from data import AttendanceData
+
+from .attendance_service import AttendanceService
+from .coordinator_service import CoordinatorService
+from .member_service import MemberService
+from .participation_service import ParticipationService
+from .project_service import ProjectService
+
+logger = settings.logging.getLogger(__name__)
+
+SNAPSHOT_FILE_PATH = "assets/data/state.snapshot"
+SNAPSHOT_VERSION = 1
+
+_MAGIC = b"IFSP-SNAPSHOT"
+
+
+def _file_fingerprint(file_path: str, size: int | None = None) -> tuple[int, int]:
+    """
+    The size of a file and the CRC-32 of its first bytes
+
+    :param file_path: The path of the file.
+    :type file_path: str
+    :param size: How many bytes to check, the whole file if None.
+    :type size: int | None
+    :return: The number of bytes checked and their CRC-32, (-1, 0) if the file is
+        missing or shorter than size.
+    :rtype: tuple[int, int]
+    """
+    try:
+        with open(file_path, "rb") as file:
+            content = file.read() if size is None else file.read(size)
+    except FileNotFoundError:
+        return -1, 0
+    if size is not None and len(content) < size:
+        return -1, 0
+    return len(content), zlib.crc32(content)
+
+
+class SnapshotService:
+    """
+    Takes snapshots of the services' state
+
+    Methods:
+        - capture(self) -> bytes: Serializes the state of the services.
+        - write(self, payload: bytes) -> int: Compresses and saves a captured state.
+
+    Attributes:
+        - services (dict): The services whose database is saved, by name.
+        - attendance_service (AttendanceService): The service whose attendances, index
+        and monthly totals are saved.
+        - file_path (str): The path of the snapshot file.
+    """
+
+    # pylint: disable=too-many-arguments
+    def __init__(
+        self,
+        coordinator_service: CoordinatorService,
+        project_service: ProjectService,
+        member_service: MemberService,
+        participation_service: ParticipationService,
+        attendance_service: AttendanceService,
+        file_path: str = SNAPSHOT_FILE_PATH,
+    ) -> None:
+        self.services = {
+            "coordinators": (
+                coordinator_service,
+                coordinator_service.coordinator_data.coordinators_file_path,
+            ),
+            "projects": (
+                project_service,
+                project_service.project_data.projects_file_path,
+            ),
+            "members": (member_service, member_service.member_data.members_file_path),
+            "participations": (
+                participation_service,
+                participation_service.participation_data.participations_file_path,
+            ),
+        }
+        self.attendance_service = attendance_service
+        self.file_path = file_path
+
+    def capture(self) -> bytes:
+        """
+        Serializes the state of the services, with the fingerprint of each file.
+
+        It must run while no write is changing the services' data and files, with
+        ServiceExecutor.write, so the rows always match the fingerprints.
+
+        :return: The pickled state.
+        :rtype: bytes
+        """
+        files = {}
+        for name, (service, file_path) in self.services.items():
+            size, crc = _file_fingerprint(file_path)
+            files[name] = {"size": size, "crc": crc, "rows": service.database}
+
+        attend_data = self.attendance_service.attend_data
+        months = {
+            (year, month): _file_fingerprint(attend_data.month_file_path(year, month))
+            for year, month in self.attendance_service.loaded_months
+        }
+
+        state = {
+            "version": SNAPSHOT_VERSION,
+            "taken_at": datetime.now(),
+            "files": files,
+            "attendances": {
+                "months": months,
+                "state": self.attendance_service.snapshot_state(),
+            },
+        }
+        return pickle.dumps(state, pickle.HIGHEST_PROTOCOL)
+
+    def write(self, payload: bytes) -> int:
+        """
+        Compresses a captured state and saves it, replacing the snapshot atomically.
+
+        It doesn't touch the services, so it can run in a worker thread.
+
+        :param payload: The state returned by capture.
+        :type payload: bytes
+        :return: The size of the snapshot file, in bytes.
+        :rtype: int
+        """
+        content = _MAGIC + zlib.compress(payload, 6)
+        temp_path = f"{self.file_path}.tmp"
+        with open(temp_path, "wb") as file:
+            file.write(content)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_path, self.file_path)
+        return len(content)
+
+
+def load_snapshot(file_path: str = SNAPSHOT_FILE_PATH) -> dict | None:
+    """
+    Reads a snapshot saved by SnapshotService
+
+    :param file_path: The path of the snapshot file.
+    :type file_path: str
+    :return: The snapshot, or None if there is none or it can't be read.
+    :rtype: dict | None
+    """
+    try:
+        with open(file_path, "rb") as file:
+            content = file.read()
+    except FileNotFoundError:
+        return None
+
+    try:
+        if not content.startswith(_MAGIC):
+            raise ValueError("not a snapshot file")
+        snapshot = pickle.loads(zlib.decompress(content[len(_MAGIC) :]))
+        if snapshot.get("version") != SNAPSHOT_VERSION:
+            raise ValueError(f"snapshot version {snapshot.get('version')}")
+    # pylint: disable-next=broad-exception-caught
+    except Exception as error:
+        logger.warning("Ignoring the snapshot %s: %s", file_path, error)
+        return None
+
+    logger.info("Loaded the snapshot taken at %s", snapshot["taken_at"])
+    return snapshot
+
+
+def restore_rows(
+    snapshot: dict | None,
+    name: str,
+    file_path: str,
+    load: Callable[[int], list],
+) -> list:
+    """
+    The rows of a CSV file: the snapshot's rows and the rows appended after it.
+
+    If the file doesn't start with the bytes it had when the snapshot was taken,
+    the whole file is loaded.
+
+    :param snapshot: The snapshot returned by load_snapshot, or None.
+    :type snapshot: dict | None
+    :param name: The name of the file in the snapshot.
+    :type name: str
+    :param file_path: The path of the CSV file.
+    :type file_path: str
+    :param load: The function that parses the file from a byte offset on.
+    :type load: Callable[[int], list]
+    :return: The rows of the file.
+    :rtype: list
+    """
+    saved = snapshot["files"].get(name) if snapshot else None
+    if saved is None or saved["size"] < 0:
+        return load(0)
+
+    if _file_fingerprint(file_path, saved["size"]) != (saved["size"], saved["crc"]):
+        logger.info("%s changed since the snapshot, loading the whole file", name)
+        return load(0)
+
+    appended = load(saved["size"])
+    logger.info(
+        "Restored %s from the snapshot, %d rows appended since", name, len(appended)
+    )
+    return saved["rows"] + appended
+
+
+def restore_attendance_state(
+    snapshot: dict | None, attend_data: AttendanceData
+) -> dict | None:
+    """
+    The state of the attendance service, if no month file changed since the snapshot
+
+    :param snapshot: The snapshot returned by load_snapshot, or None.
+    :type snapshot: dict | None
+    :param attend_data: The AttendanceData that stores the month files.
+    :type attend_data: AttendanceData
+    :return: The state to pass to AttendanceService, or None if it must be loaded
+        from the files.
+    :rtype: dict | None
+    """
+    if snapshot is None:
+        return None
+
+    attendances = snapshot["attendances"]
+    for (year, month), fingerprint in attendances["months"].items():
+        month_file_path = attend_data.month_file_path(year, month)
+        if _file_fingerprint(month_file_path) != fingerprint:
+            logger.info(
+                "Attendances of %d-%02d changed since the snapshot", year, month
+            )
+            return None
+
+    logger.info("Restored the attendances from the snapshot")
+    return attendances["state"]
@@ -8,7 +8,7 @@ Module responsible for handling termination statement generation, overwriting pa
 import csv
 from datetime import datetime
 
-from reports import TerminationStatement, TerminationStatementData
+import reports
 
 from .coordinator_service import CoordinatorService
 from .member_service import MemberService
@@ -350,6 +350,13 @@ class TerminationStatementService:
                     ) as file:
                         writer = csv.writer(file)
                         writer.writerows(modified_lines)
+
+                    # keeps the participations in memory the same as the file
+                    self.participation_service.database[
+                        :
+                    ] = (
+                        self.participation_service.participation_data.load_participations()
+                    )
                     break
                 i += 1
 
@@ -375,7 +382,7 @@ class TerminationStatementService:
             generate() of TerminationStatement
         """
 
-        data = TerminationStatementData(
+        data = reports.TerminationStatementData(
             student_name=member.name,
             student_code=member.registration,
             project_name=project.project_title,
@@ -384,6 +391,6 @@ class TerminationStatementService:
             termination_reason=termination_reason,
         )
 
-        termination_statement = TerminationStatement(data)
+        termination_statement = reports.TerminationStatement(data)
 
         return termination_statement.generate()
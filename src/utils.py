@@ -2,15 +2,24 @@
 utils
 =====
 
-Utility functions for PDF operations.
+Utility functions for PDF operations and startup timing.
 
-This module provides utility functions for working with PDF documents.
+This module provides utility functions for working with PDF documents and for
+measuring how long each phase of the bot's startup takes.
 
 Functions:
     - save_pdf_bytes(pdf_bytes, file_path): Save the PDF bytes to a file on disk.
+    - timed(phase): Context manager that logs how long a phase took.
 
 """
 
+from contextlib import contextmanager
+from time import perf_counter
+
+import settings
+
+logger = settings.logging.getLogger(__name__)
+
 
 def save_pdf_bytes(pdf_bytes, file_path):
     """
@@ -24,3 +33,18 @@ def save_pdf_bytes(pdf_bytes, file_path):
     """
     with open(file_path, "wb") as file:
         file.write(pdf_bytes)
+
+
+@contextmanager
+def timed(phase):
+    """
+    Log how long the code inside the ``with`` block took.
+
+    :param phase: Name of the phase, used in the log message.
+    :type phase: str
+    """
+    start = perf_counter()
+    try:
+        yield
+    finally:
+        logger.info("%s took %.3fs", phase, perf_counter() - start)
@@ -0,0 +1,13 @@
+"""
+Test configuration: the bot runs from the repository root with ``src`` on the
+path, so the tests do the same.
+"""
+
+import os
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+sys.path.insert(0, os.path.join(ROOT_DIR, "src"))
+os.environ.setdefault("ADMIN_DISCORD_ID", "0")
+os.chdir(ROOT_DIR)
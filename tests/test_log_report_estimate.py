@@ -0,0 +1,74 @@
+"""
+Checks that the estimated size of the log reports doesn't overshoot the
+rendered size by more than the margin used to reject them before rendering.
+"""
+
+import random
+
+import pytest
+
+import reports
+from data import Log, Member, Participation
+from services.log_service import ESTIMATE_REJECTION_MARGIN
+
+WORDS = (
+    "hoje terminei a revisão do código e subi as alterações no repositório "
+    "amanhã vamos testar o modelo com os novos dados da coleta da semana"
+).split()
+SYLLABLES = ["ba", "de", "qui", "lo", "ma", "ne", "ra", "to", "vi", "ção", "ões"]
+
+
+def _text(rng: random.Random, kind: str, characters: int) -> str:
+    words = []
+    while len(" ".join(words)) < characters:
+        if kind == "random":
+            words.append("".join(rng.choices(SYLLABLES, k=rng.randint(1, 4))))
+        else:
+            words.append(rng.choice(WORDS))
+    return " ".join(words)[:characters]
+
+
+def _report(kind: str, rows: int, characters: int) -> reports.LogReport:
+    rng = random.Random(rows)
+    repeated = _text(rng, kind, characters)
+    logs = [
+        Log(
+            "project",
+            "SP0000001",
+            1,
+            "01/03/2026 10:00",
+            repeated if kind == "repeated" else _text(rng, kind, characters),
+        )
+        for _ in range(rows)
+    ]
+    data = reports.LogReportData(
+        members=[Member("member", "SP0000001", 1, "Ana Souza", "ana@ifsp.edu.br")],
+        participations=[Participation("p", "SP0000001", "project", None, None)],
+        logs=logs,
+        project_id="project",
+        value=1,
+        start_date=None,
+        end_date=None,
+        discord_id=None,
+    )
+    return reports.LogReport(data)
+
+
+@pytest.mark.parametrize(
+    ("kind", "rows", "characters"),
+    [
+        ("repeated", 200, 100),
+        ("repeated", 5000, 300),
+        ("repeated", 10000, 60),
+        ("repeated", 3000, 500),
+        ("chat", 3000, 300),
+        ("random", 1000, 500),
+    ],
+)
+def test_estimate_within_margin(kind: str, rows: int, characters: int):
+    report = _report(kind, rows, characters)
+
+    estimated = report.estimate_size()
+    rendered = len(report.generate())
+
+    assert estimated / rendered <= ESTIMATE_REJECTION_MARGIN